@@ -1,28 +1,95 @@
-from education_chatbot.chatbotui import ChatbotUI
-from education_chatbot.database_manager import DatabaseManager
-from education_chatbot.inference_engine import Chatbot
-from education_chatbot.knowledge_base import KnowledgeBase
-from education_chatbot.ml_model import MLModel
-from education_chatbot.nlp_processor import NLPProcessor
-import tkinter as tk
-import os
-
-if __name__ == "__main__":
-    try:
-        # Initialize components
-        db_manager = DatabaseManager()
-        knowledge_base = KnowledgeBase(db_manager)
-        nlp_processor = NLPProcessor(db_manager)
-
-        ml_model = MLModel()
-
-        # Create chatbot instance
-        chatbot = Chatbot(knowledge_base, nlp_processor, ml_model)
-
-        # Create and run UI
-        root = tk.Tk()
-        ui = ChatbotUI(root, chatbot, nlp_processor, ml_model)
-        ui.start_chat()
-
-    except Exception as e:
-        print(f"Application error: {e}")
+import time
+
+# Taken before any other import so the startup check covers import time too
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import os
+import threading
+import tkinter as tk
+
+from chatbotui import ChatbotUI
+from database_manager import DatabaseManager
+from inference_engine import Chatbot
+from knowledge_base import KnowledgeBase
+from metrics import Metrics
+from ml_model import MLModel, training_data
+from nlp_processor import NLPProcessor
+from response_cache import ResponseCache
+from response_index import ResponseIndex
+
+# Seconds from process start until the first answer can be given
+STARTUP_BUDGET = float(os.environ.get("CHATBOT_STARTUP_BUDGET", "2.0"))
+
+
+def build_components(request_log=None):
+    """Create the chatbot components; importing the modules above does no work"""
+    db_manager = DatabaseManager()
+    # Dynamic answers are served from memory; the table is loaded and polled in the background
+    knowledge_base = KnowledgeBase(db_manager, ResponseIndex(db_manager).start())
+    nlp_processor = NLPProcessor(db_manager)
+
+    # Maps the saved model if there is one, otherwise trains on the built-in pairs
+    ml_model = MLModel(training_data=training_data)
+
+    metrics = Metrics(request_log) if request_log else None
+    chatbot = Chatbot(knowledge_base, nlp_processor, ml_model, response_cache=ResponseCache(), metrics=metrics)
+    return chatbot, nlp_processor, ml_model
+
+
+def check_startup(query, budget):
+    """Answer one query headlessly and report the time to first response"""
+    chatbot, nlp_processor, ml_model = build_components()
+    ready = time.perf_counter()
+
+    # Same tiers as ChatbotUI.process_query: ML model first, then static intents
+    parsed = chatbot.parse(query)
+    response = ml_model.respond(parsed)
+    if not response:
+        response = chatbot.knowledge_base.get_static_response(chatbot.classify(parsed))
+    answered = time.perf_counter()
+    ml_model.close()
+
+    elapsed = answered - PROCESS_STARTED
+    print(f"Components ready: {ready - PROCESS_STARTED:.3f}s")
+    print(f"First response:   {elapsed:.3f}s (budget {budget:.3f}s) -> {response!r}")
+    return elapsed <= budget
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Education Counseling Chatbot")
+    parser.add_argument("--check-startup", action="store_true",
+                        help="measure time to first response without the UI; exit 1 if over budget")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET,
+                        help="time to first response budget in seconds (default: $CHATBOT_STARTUP_BUDGET or 2.0)")
+    parser.add_argument("--query", default="hi", help="query used by --check-startup")
+    parser.add_argument("--request-log", help="append per-stage timings of every query to this file as JSON lines")
+    parser.add_argument("--transcript-log", default="chat_transcript.log",
+                        help="append every chat message to this file (default: chat_transcript.log; '' disables)")
+    parser.add_argument("--max-messages", type=int, default=200, help="messages kept on screen")
+    args = parser.parse_args()
+
+    if args.check_startup:
+        raise SystemExit(0 if check_startup(args.query, args.budget) else 1)
+
+    try:
+        chatbot, nlp_processor, ml_model = build_components(args.request_log)
+
+        # NLTK is only needed by the intent tier; import it off the UI thread
+        threading.Thread(target=nlp_processor.warm_up, daemon=True).start()
+
+        # Create and run UI
+        root = tk.Tk()
+        ui = ChatbotUI(root, chatbot, nlp_processor, ml_model, max_messages=args.max_messages,
+                       transcript_log=args.transcript_log or None)
+        ui.start_chat()
+        ml_model.close()
+        if chatbot.metrics is not None:
+            chatbot.metrics.close()
+
+    except Exception as e:
+        print(f"Application error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Deterministic synthetic Q&A corpora for the benchmarks, from the built-in pairs up to 1M."""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_model import training_data
+
+OPENERS = ["what is", "what are", "how do I find", "how can I check", "where can I see", "when is", "can I change",
+           "do you publish", "is there", "who handles", "tell me about", "how much is", "which office handles", "where do I find"]
+TOPICS = ["admission", "application", "tuition", "scholarship", "housing", "library", "exam", "transcript",
+          "internship", "career fair", "enrollment", "orientation", "parking", "visa", "counseling", "refund",
+          "graduation", "timetable", "laboratory", "cafeteria", "sports", "research", "exchange", "alumni",
+          "payment plan", "financial aid", "student card", "wifi", "elective", "thesis"]
+DETAILS = ["deadline", "fee", "requirements", "office hours", "contact", "policy", "form", "schedule",
+           "process", "location", "portal", "eligibility", "support", "rules", "options", "dates"]
+SUBJECTS = ["computer science", "nursing", "business", "law", "engineering", "biology", "psychology",
+            "architecture", "economics", "music", "education", "chemistry", "history", "data science",
+            "mathematics", "design", "medicine", "physics", "philosophy", "journalism"]
+LEVELS = ["undergraduate", "postgraduate", "international", "part-time", "online", "first year", "final year",
+          "exchange", "mature", "transfer"]
+# Other words for each detail, used by generate_paraphrases
+SYNONYMS = {
+    "deadline": ["due date", "cutoff", "closing date"], "fee": ["cost", "price", "charge"],
+    "requirements": ["criteria", "prerequisites", "conditions"], "office hours": ["opening times", "hours"],
+    "contact": ["email address", "phone number"], "policy": ["regulations", "guidelines"],
+    "form": ["paperwork", "application sheet"], "schedule": ["calendar", "agenda"],
+    "process": ["procedure", "steps"], "location": ["address", "building"], "portal": ["website", "web page"],
+    "eligibility": ["qualification", "entitlement"], "support": ["help", "assistance"],
+    "rules": ["regulations", "code"], "options": ["choices", "alternatives"], "dates": ["calendar", "timeline"]
+}
+ANSWER_STARTS = ["You can find", "Please contact", "The", "Students should check", "Our team publishes",
+                 "Information about", "Visit the student portal for", "Each semester we update"]
+
+
+def generate_pairs(count, seed=0):
+    """
+    count (question, response) pairs: the built-in pairs first, then
+    synthetic ones with unique questions. The same count and seed always
+    give the same list, so results of separate runs are comparable.
+    """
+    pairs = list(training_data[:count])
+    seen = {question for question, _ in pairs}
+    rng = random.Random(seed)
+    while len(pairs) < count:
+        topic, detail = rng.choice(TOPICS), rng.choice(DETAILS)
+        question = f"{rng.choice(OPENERS)} the {topic} {detail} for {rng.choice(LEVELS)} {rng.choice(SUBJECTS)} students"
+        if rng.random() < 0.5:
+            question += f" in {rng.randint(2000, 2039)}"
+        if question in seen:
+            continue
+        seen.add(question)
+        response = (f"{rng.choice(ANSWER_STARTS)} the {topic} {detail} on page {rng.randint(1, 999)} "
+                    f"of the {rng.choice(SUBJECTS)} handbook.")
+        pairs.append((question, response))
+    return pairs
+
+
+def generate_paraphrases(count, seed=0, phrasings=2):
+    """
+    A corpus where every answer is asked for in several wordings, plus one
+    held-out wording per answer: (pairs, queries, expected), with expected[i]
+    the answer queries[i] asks for. Held-out wordings name the detail with a
+    synonym not used for that answer in the corpus (every detail has at least
+    phrasings + 1 names for the default), so they share fewer terms with the
+    stored questions.
+    """
+    rng = random.Random(seed)
+    pairs, queries, expected = [], [], []
+    seen = set()
+    while len(expected) < count:
+        topic, detail = rng.choice(TOPICS), rng.choice(DETAILS)
+        level, subject = rng.choice(LEVELS), rng.choice(SUBJECTS)
+        if (topic, detail, level, subject) in seen:
+            continue
+        seen.add((topic, detail, level, subject))
+        response = (f"{rng.choice(ANSWER_STARTS)} the {topic} {detail} on page {rng.randint(1, 999)} "
+                    f"of the {subject} handbook for {level} students.")
+        words = [detail] + SYNONYMS[detail]
+        rng.shuffle(words)
+        held_out = words[min(phrasings, len(words) - 1)]
+        for word in words[:phrasings]:
+            pairs.append((f"{rng.choice(OPENERS)} the {topic} {word} for {level} {subject} students", response))
+        queries.append(f"{rng.choice(OPENERS)} the {topic} {held_out} for {level} {subject} students")
+        expected.append(response)
+    return pairs, queries, expected
+
+
+def generate_queries(pairs, count, seed=1):
+    """
+    User traffic against a corpus: a third stored questions with random
+    casing and punctuation (exact tier), a third with words dropped or
+    swapped (similarity tier) and a third unseen text (model and fallback).
+    """
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        words = rng.choice(pairs)[0].split()
+        kind = i % 3
+        if kind == 1 and len(words) > 2:
+            del words[rng.randrange(len(words))]
+            words[rng.randrange(len(words))] = rng.choice(TOPICS + DETAILS)
+        elif kind == 2:
+            words = rng.sample(OPENERS, 1) + rng.sample(DETAILS, 2) + ["near", rng.choice(["me", "campus", "town"])]
+        if rng.random() < 0.3:
+            words[0] = words[0].capitalize()
+        queries.append(" ".join(words) + rng.choice(["", "?", "!", "..."]))
+    return queries
@@ -0,0 +1,80 @@
+"""
+Near-duplicate detection cost: the indexed self-join of dedup against scoring every pair.
+
+    python benchmarks/dedup_bench.py --sizes 5000 20000 80000 --learn 1000
+
+For each corpus size the questions are joined with dedup.similar_rows and,
+up to --brute-max questions, with a chunked product of the matrix against
+itself; both must find the same pairs. --learn pairs are then learned into a
+model with one MLModel.update_many call and, separately, one update_model
+call at a time, to compare the time and the pairs kept.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_pairs, generate_paraphrases
+from dedup import similar_rows, tfidf_rows
+from ml_model import MLModel
+
+
+def brute_force_pairs(question_matrix, threshold, chunk_size=256):
+    """Number of row pairs above threshold, scoring every row against every row"""
+    count = 0
+    for start in range(0, question_matrix.shape[0], chunk_size):
+        scores = (question_matrix[start:start + chunk_size] @ question_matrix.T).tocoo()
+        count += int(((scores.data > threshold) & (scores.col < scores.row + start)).sum())
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5000, 20000, 80000])
+    parser.add_argument("--brute-max", type=int, default=20000)
+    parser.add_argument("--learn", type=int, default=1000)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        pairs, _, _ = generate_paraphrases(size // 2, args.seed)
+        question_matrix = tfidf_rows([q for q, _ in pairs])
+        start = time.perf_counter()
+        earlier, _, _ = similar_rows(question_matrix, args.threshold)
+        line = f"{len(pairs):>8} questions: indexed join {time.perf_counter() - start:7.2f}s ({len(earlier)} pairs)"
+        if len(pairs) <= args.brute_max:
+            start = time.perf_counter()
+            count = brute_force_pairs(question_matrix, args.threshold)
+            line += f"  every pair {time.perf_counter() - start:7.2f}s ({count} pairs)"
+        print(line)
+
+    if args.learn:
+        base = generate_pairs(2000, args.seed)
+        batch, _, _ = generate_paraphrases(args.learn // 2, args.seed + 1)
+        with tempfile.TemporaryDirectory() as workdir:
+            batched = MLModel(training_data=base, model_filename=os.path.join(workdir, "many.cbm"),
+                              snapshot_delay=3600.0)
+            single = MLModel(training_data=base, model_filename=os.path.join(workdir, "single.cbm"),
+                             snapshot_delay=3600.0)
+            start = time.perf_counter()
+            conflicts = []
+            added = batched.update_many(batch, conflicts=conflicts)
+            many_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            for question, response in batch:
+                single.update_model(question, response)
+            single_seconds = time.perf_counter() - start
+            differing = set(q for q, _ in batched.training_data) ^ set(q for q, _ in single.training_data)
+            print(f"learn {len(batch)} pairs: update_many {many_seconds:.2f}s ({added} kept, {len(conflicts)} "
+                  f"conflicting clusters)  update_model {single_seconds:.2f}s "
+                  f"({len(single.training_data) - len(base)} kept)  questions differing {len(differing)}")
+            batched.close()
+            single.close()
+
+
+if __name__ == "__main__":
+    main()
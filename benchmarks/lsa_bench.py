@@ -0,0 +1,87 @@
+"""
+Match quality, latency and memory of the dense LSA tier (lsa_index) against TF-IDF alone.
+
+    python benchmarks/lsa_bench.py --answers 20000 --dimensions 32 64 128
+
+The corpus asks for every answer in two wordings; each query asks for one of
+them in a third wording (a synonym for the detail), see
+corpus.generate_paraphrases. For TF-IDF alone and for every projection size,
+float32 and int8, it reports how many queries the model answers correctly,
+wrongly or not at all, and the time and memory of the dense index itself.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_paraphrases
+from lsa_index import DenseIndex, LsaProjection
+from ml_model import MLModel
+from parsed_query import ParsedQuery
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def answer_quality(snapshot, queries, expected):
+    correct = wrong = 0
+    for query, answer in zip(queries, expected):
+        response = snapshot.respond(ParsedQuery(query, ml_model=snapshot))
+        if response == answer:
+            correct += 1
+        elif response is not None:
+            wrong += 1
+    return correct, wrong, len(queries) - correct - wrong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--threshold", type=float, default=0.85, help="dense cosine a match has to beat")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pairs, queries, expected = generate_paraphrases(args.answers, args.seed)
+    queries, expected = queries[:args.queries], expected[:args.queries]
+    with tempfile.TemporaryDirectory() as workdir:
+        ml_model = MLModel(training_data=pairs, model_filename=os.path.join(workdir, "lsa.cbm"), snapshot_delay=3600.0)
+        snapshot = ml_model.snapshot
+        vectors = [snapshot.vectorize(ml_model.clean_text(query)) for query in queries]
+        matrix = snapshot.question_matrix
+        sparse_mib = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 2 ** 20
+        print(f"corpus:        {len(pairs)} pairs, {args.answers} answers, {len(queries)} held-out wordings")
+        correct, wrong, unanswered = answer_quality(snapshot, queries, expected)
+        print(f"tf-idf only:   correct {correct:5}  wrong {wrong:5}  unanswered {unanswered:5}  "
+              f"(question matrix {sparse_mib:.1f} MiB)")
+
+        responses = [response for _, response in snapshot.training_data]
+        for dimensions in args.dimensions:
+            start = time.perf_counter()
+            projection, explained = LsaProjection.fit(snapshot.question_matrix, responses, snapshot.vectorizer,
+                                                      dimensions, args.seed, args.threshold)
+            fit_seconds = time.perf_counter() - start
+            for quantize in (False, True):
+                index = DenseIndex.build(snapshot.question_matrix, projection=projection, quantize=quantize)
+                latencies = []
+                for vector in vectors:
+                    start = time.perf_counter()
+                    index.best_matches(vector)
+                    latencies.append(time.perf_counter() - start)
+                latencies.sort()
+                correct, wrong, unanswered = answer_quality(snapshot.replace(embedding=index), queries, expected)
+                print(f"lsa {dimensions:>4} {'int8' if quantize else 'f32 '}: correct {correct:5}  wrong {wrong:5}  "
+                      f"unanswered {unanswered:5}  p50 {percentile(latencies, 0.5) * 1e6:7.0f}us  "
+                      f"p99 {percentile(latencies, 0.99) * 1e6:7.0f}us  index {index.nbytes() / 2 ** 20:.1f} MiB  "
+                      f"projection {projection.components.nbytes / 2 ** 20:.1f} MiB  "
+                      f"(fit {fit_seconds:.1f}s, {explained:.0%} variance)")
+        ml_model.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Per-query cost of NLPProcessor.preprocess: NLTK path versus the fast path."""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_model import training_data
+from nlp_processor import NLPProcessor
+
+
+def make_queries(count, seed=0):
+    """Repetitive traffic: stored questions with random casing and punctuation"""
+    rng = random.Random(seed)
+    questions = [q for q, _ in training_data] + ["hi", "hello!", "how are you?", "thanks", "I cannot apply, help"]
+    queries = []
+    for _ in range(count):
+        words = rng.choice(questions).split()
+        if rng.random() < 0.3:
+            words[0] = words[0].capitalize()
+        queries.append(" ".join(words) + rng.choice(["", "?", "!", "..."]))
+    return queries
+
+
+def measure(processor, queries, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            processor.preprocess(query)
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    queries = make_queries(args.queries)
+    nltk_path = NLPProcessor(fast=False)
+    fast_path = NLPProcessor(fast=True)
+
+    mismatches = sum(nltk_path.preprocess(q) != fast_path.preprocess(q) for q in queries)
+    cold = NLPProcessor(fast=True)
+    start = time.perf_counter()
+    for query in queries:
+        cold.preprocess(query)
+    cold_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+    nltk_us = measure(nltk_path, queries, args.repeat)
+    fast_us = measure(fast_path, queries, args.repeat)
+    print(f"queries:          {len(queries)} ({mismatches} token mismatches)")
+    print(f"nltk path:        {nltk_us:8.2f} us/query")
+    print(f"fast path (cold): {cold_us:8.2f} us/query")
+    print(f"fast path (warm): {fast_us:8.2f} us/query ({nltk_us / fast_us:.1f}x)")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Similarity-tier latency and recall of retrieval.InvertedIndex against a full scan.
+
+    python benchmarks/retrieval_bench.py --pairs 200000 --max-postings 0 5000 1000 200
+
+For every --max-postings setting (0 keeps whole posting lists) the index is
+built over the same question matrix and each query's best match above the
+similarity threshold is compared with the exact answer. Recall is the share
+of queries the full scan answers that the index answers with the same question.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_pairs, generate_queries
+from ml_model import MLModel
+from retrieval import InvertedIndex
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def best_row(snapshot, vector):
+    """Exact best match the way ModelSnapshot.match_questions finds it, as (row, score) or None"""
+    scores = (snapshot.question_matrix @ vector.astype(snapshot.question_matrix.dtype).T).toarray().ravel()
+    row = int(scores.argmax()) if len(scores) else 0
+    if len(scores) and scores[row] > snapshot.similarity_threshold:
+        return row, float(scores[row])
+    return None
+
+
+def time_queries(search, vectors):
+    results = []
+    latencies = []
+    for vector in vectors:
+        start = time.perf_counter()
+        results.append(search(vector))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return results, percentile(latencies, 0.5) * 1e6, percentile(latencies, 0.99) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--max-postings", type=int, nargs="+", default=[0, 5000, 1000, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pairs = generate_pairs(args.pairs, args.seed)
+    queries = generate_queries(pairs, args.queries, args.seed + 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        ml_model = MLModel(training_data=pairs, model_filename=os.path.join(workdir, "retrieval.cbm"),
+                           snapshot_delay=3600.0)
+        print(f"corpus:     {args.pairs} pairs, trained in {time.perf_counter() - start:.1f}s")
+        snapshot = ml_model.snapshot
+        threshold = snapshot.similarity_threshold
+        vectors = [snapshot.vectorize(ml_model.clean_text(query)) for query in queries]
+
+        exact, p50, p99 = time_queries(lambda vector: best_row(snapshot, vector), vectors)
+        answered = sum(1 for match in exact if match is not None)
+        print(f"full scan:  p50 {p50:9.1f}us  p99 {p99:9.1f}us  ({answered} of {len(queries)} queries matched)")
+
+        for max_postings in args.max_postings:
+            start = time.perf_counter()
+            index = InvertedIndex.build(snapshot.question_matrix, max_postings=max_postings or None)
+            build_seconds = time.perf_counter() - start
+            found, p50, p99 = time_queries(lambda vector: index.best_match(vector, threshold), vectors)
+            same = sum(1 for a, b in zip(exact, found) if a is not None and b is not None and a[0] == b[0])
+            extra = sum(1 for a, b in zip(exact, found) if a is None and b is not None)
+            postings_mib = (index.postings.data.nbytes + index.postings.indices.nbytes) / 2 ** 20
+            print(f"index {max_postings or 'all':>5}: p50 {p50:9.1f}us  p99 {p99:9.1f}us  "
+                  f"recall {same / max(answered, 1):.4f}  false matches {extra}  "
+                  f"build {build_seconds:.1f}s  postings {postings_mib:.1f}MiB")
+        ml_model.close()
+
+
+if __name__ == "__main__":
+    main()
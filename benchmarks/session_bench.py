@@ -0,0 +1,59 @@
+"""Memory per session and lookup cost of MemorySessionStore at web scale (default 100k sessions)."""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_pairs
+from session_store import MemorySessionStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100000)
+    parser.add_argument("--learning", type=float, default=0.2,
+                        help="fraction of sessions waiting to be taught (they hold a question)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    questions = [question for question, _ in generate_pairs(1000)]
+    store = MemorySessionStore(max_sessions=args.sessions)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    ids = []
+    for _ in range(args.sessions):
+        session = store.create()
+        if rng.random() < args.learning:
+            session.awaiting_learning = True
+            session.last_question = rng.choice(questions) + "?"  # A new string, as from a request body
+        ids.append(session.session_id)
+    create_us = (time.perf_counter() - start) / args.sessions * 1e6
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    ids_bytes = sum(sys.getsizeof(session_id) for session_id in ids)  # The ids are shared with the list
+
+    rng.shuffle(ids)
+    start = time.perf_counter()
+    for session_id in ids:
+        store.save(store.get(session_id))
+    lookup_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+    ids_list_bytes = sys.getsizeof(ids)
+    per_session = (used - ids_list_bytes) / args.sessions
+    print(f"sessions:          {len(store)} ({args.learning:.0%} awaiting a lesson)")
+    print(f"memory:            {used / 2 ** 20:.1f} MiB, {per_session:.0f} bytes/session "
+          f"(of which {ids_bytes / args.sessions:.0f} the id)")
+    print(f"create:            {create_us:.2f} us/session (under tracemalloc)")
+    print(f"get + save:        {lookup_us:.2f} us/turn")
+    redis_value = 1 + sum(len(q) for q in questions) / len(questions)
+    print(f"redis value:       about {args.learning * redis_value + 1:.0f} bytes/session plus the key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Latency and memory of the hot paths on synthetic corpora of any size.
+
+    python benchmarks/suite.py --corpus 50 10000 100000 --output run.json
+    python benchmarks/suite.py --corpus 50 10000 100000 --baseline run.json
+
+Every case reports per-call latency percentiles; unless --no-memory is given
+a second pass under tracemalloc reports the peak memory allocated during a
+call and the blocks still held after it. With --baseline, p50 latencies are
+compared with a saved run and the exit status is 1 if any case got slower
+than the tolerance allows.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Unix only; peak RSS is not reported elsewhere
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import generate_pairs, generate_queries
+from inference_engine import Chatbot
+from knowledge_base import KnowledgeBase
+from ml_model import MLModel
+from nlp_processor import NLPProcessor
+
+CASES = ["preprocess", "classify_intent", "find_similar_question", "get_response", "rank", "process_query", "update_model"]
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def time_calls(call, inputs, warmup):
+    for value in inputs[:warmup]:
+        call(value)
+    gc.collect()
+    timings = []
+    clock = time.perf_counter_ns
+    for value in inputs:
+        start = clock()
+        call(value)
+        timings.append(clock() - start)
+    timings.sort()
+    total = sum(timings)
+    return {
+        "calls": len(timings),
+        "mean_us": total / len(timings) / 1e3,
+        "p50_us": percentile(timings, 0.50) / 1e3,
+        "p90_us": percentile(timings, 0.90) / 1e3,
+        "p99_us": percentile(timings, 0.99) / 1e3,
+        "max_us": timings[-1] / 1e3,
+        "calls_per_s": len(timings) / (total / 1e9) if total else 0.0,
+    }
+
+
+def trace_calls(call, inputs):
+    """Peak bytes allocated during a call and blocks retained after it, averaged over inputs"""
+    gc.collect()
+    tracemalloc.start()
+    peak_total = 0
+    peak_max = 0
+    blocks_before = sys.getallocatedblocks()
+    for value in inputs:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        call(value)
+        peak = tracemalloc.get_traced_memory()[1] - before
+        peak_total += peak
+        peak_max = max(peak_max, peak)
+    tracemalloc.stop()
+    gc.collect()
+    return {
+        "alloc_peak_kib": peak_total / len(inputs) / 1024,
+        "alloc_peak_max_kib": peak_max / 1024,
+        "retained_blocks_per_call": (sys.getallocatedblocks() - blocks_before) / len(inputs),
+    }
+
+
+def build_cases(ml_model, nlp_processor, queries, new_pairs):
+    chatbot = Chatbot(KnowledgeBase(), nlp_processor, ml_model)
+    processed = [nlp_processor.preprocess(query) for query in queries]
+    cleaned = [ml_model.clean_text(query) for query in queries]
+    return {
+        "preprocess": (nlp_processor.preprocess, queries),
+        "classify_intent": (nlp_processor.classify_intent, processed),
+        "find_similar_question": (ml_model.find_similar_question, cleaned),
+        "get_response": (ml_model.get_response, queries),
+        "rank": (lambda query: ml_model.rank(ml_model.parse(query)), queries),
+        "process_query": (chatbot.process_query, queries),
+        # Learns a new pair per call, so it runs last and never repeats an input
+        "update_model": (lambda pair: ml_model.update_model(*pair), new_pairs),
+    }
+
+
+def run_corpus(size, args, workdir):
+    pairs = generate_pairs(size + 2 * args.queries, args.seed)
+    corpus, new_pairs = pairs[:size], pairs[size:]
+    queries = generate_queries(corpus, args.queries, args.seed + 1)
+
+    start = time.perf_counter()
+    ml_model = MLModel(training_data=corpus, model_filename=os.path.join(workdir, f"bench_{size}.cbm"),
+                       snapshot_delay=3600.0)
+    build_seconds = time.perf_counter() - start
+    nlp_processor = NLPProcessor()
+    nlp_processor.warm_up()
+
+    results = {"pairs": size, "build_s": build_seconds, "cases": {}}
+    cases = build_cases(ml_model, nlp_processor, queries, new_pairs)
+    try:
+        for name in CASES:
+            if name not in args.cases:
+                continue
+            call, inputs = cases[name]
+            if name == "update_model":
+                timed, traced = inputs[:args.queries], inputs[args.queries:]
+                stats = time_calls(call, timed, 0)
+            else:
+                timed = traced = inputs
+                stats = time_calls(call, timed, args.warmup)
+            if not args.no_memory:
+                stats.update(trace_calls(call, traced[:args.memory_calls]))
+            results["cases"][name] = stats
+            print(f"{size:>8} {name:<22} p50 {stats['p50_us']:9.1f}us  p90 {stats['p90_us']:9.1f}us  "
+                  f"p99 {stats['p99_us']:9.1f}us" +
+                  ("" if args.no_memory else f"  alloc {stats['alloc_peak_kib']:8.1f}KiB"))
+    finally:
+        ml_model.close()
+    # ru_maxrss never goes down, so with several corpora this is the peak so far
+    if resource is not None:
+        results["peak_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print p50 changes against a baseline run; returns the list of regressions"""
+    regressions = []
+    for size, run in results["corpora"].items():
+        base_run = baseline.get("corpora", {}).get(size)
+        if not base_run:
+            continue
+        for name, stats in run["cases"].items():
+            base = base_run["cases"].get(name)
+            if not base or not base["p50_us"]:
+                continue
+            ratio = stats["p50_us"] / base["p50_us"]
+            flag = "REGRESSION" if ratio > 1 + tolerance else ""
+            print(f"{size:>8} {name:<22} p50 {base['p50_us']:9.1f}us -> {stats['p50_us']:9.1f}us ({ratio:5.2f}x) {flag}")
+            if flag:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=int, nargs="+", default=[50, 10000],
+                        help="corpus sizes in pairs (the first 50 are the built-in pairs; up to 1000000)")
+    parser.add_argument("--queries", type=int, default=2000, help="calls per case")
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--memory-calls", type=int, default=500, help="calls traced for memory per case")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed p50 slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "queries": args.queries,
+            "seed": args.seed,
+        },
+        "corpora": {},
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.corpus:
+            results["corpora"][str(size)] = run_corpus(size, args, workdir)
+    if resource is not None:
+        results["meta"]["peak_rss_kib"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than the baseline by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Offline training time: train.py's chunked process pool against MLModel's in-memory fit.
+
+    python benchmarks/train_bench.py --pairs 200000 --workers 1 2 4 8
+
+The corpus is written to a JSONL file first; both ways of training read it
+from there. Answers of the two models are compared on sampled queries.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bulk_io import read_pairs, write_pairs
+from corpus import generate_pairs, generate_queries
+from ml_model import MLModel
+from train import train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pairs", type=int, default=200000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--incremental", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pairs = generate_pairs(args.pairs, args.seed)
+    queries = generate_queries(pairs, 1000, args.seed + 1)
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus = os.path.join(workdir, "corpus.jsonl")
+        write_pairs(iter(pairs), corpus)
+        del pairs
+
+        start = time.perf_counter()
+        ml_model = MLModel(training_data=list(read_pairs(corpus)), model_filename=os.path.join(workdir, "ref.cbm"),
+                           incremental=args.incremental, snapshot_delay=3600.0)
+        print(f"in memory:  {time.perf_counter() - start:6.1f}s")
+        expected = ml_model.get_responses(queries)
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            snapshot, stats = train(corpus, incremental=args.incremental, workers=workers,
+                                    chunk_size=args.chunk_size)
+            seconds = time.perf_counter() - start
+            same = sum(1 for a, b in zip(expected, snapshot.get_responses(queries)) if a == b)
+            print(f"{workers:>2} workers: {seconds:6.1f}s  ({stats['terms']} terms, {stats['answers']} answers, "
+                  f"{same} of {len(queries)} answers as in memory)")
+        ml_model.close()
+
+
+if __name__ == "__main__":
+    main()
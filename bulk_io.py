@@ -0,0 +1,222 @@
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from itertools import islice
+
+FORMATS = ("csv", "jsonl")
+_IDENTIFIER = re.compile(r'^\w+$')
+
+
+def check_table(table):
+    if not _IDENTIFIER.match(table):
+        raise ValueError(f"Invalid table name: {table!r}")
+    return table
+
+
+def detect_format(path, fmt=None):
+    """Use the given format, or guess it from the file extension"""
+    if fmt:
+        return fmt
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    if extension in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if extension in ("csv", "tsv", "txt"):
+        return "csv"
+    raise ValueError(f"Cannot tell the format of {path}; pass csv or jsonl explicitly")
+
+
+def read_pairs(path, fmt=None, stats=None):
+    """
+    Stream (question, response) pairs from a CSV or JSONL file.
+
+    CSV rows are question,response (an optional header row is skipped); JSONL
+    lines are objects with "question" and "response" keys. Malformed rows are
+    skipped and counted in stats["skipped"].
+    """
+    fmt = detect_format(path, fmt)
+    stats = stats if stats is not None else {}
+    stats.setdefault("read", 0)
+    stats.setdefault("skipped", 0)
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            rows = csv.reader(f)
+        else:
+            rows = _jsonl_rows(f)
+        for line_number, row in enumerate(rows, 1):
+            if row is None or len(row) < 2 or not isinstance(row[0], str) or not isinstance(row[1], str):
+                stats["skipped"] += 1
+                continue
+            question, response = row[0].strip(), row[1].strip()
+            if line_number == 1 and fmt == "csv" and (question.lower(), response.lower()) == ("question", "response"):
+                continue
+            if not question or not response:
+                stats["skipped"] += 1
+                continue
+            stats["read"] += 1
+            yield question, response
+
+
+def _jsonl_rows(f):
+    for line in f:
+        if not line.strip():
+            yield None
+            continue
+        try:
+            record = json.loads(line)
+            yield record.get("question"), record.get("response")
+        except (ValueError, AttributeError):
+            yield None
+
+
+def write_pairs(pairs, path, fmt=None):
+    """Stream pairs to a CSV or JSONL file; returns the number written"""
+    fmt = detect_format(path, fmt)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(["question", "response"])
+            for question, response in pairs:
+                writer.writerow([question, response])
+                count += 1
+        else:
+            for question, response in pairs:
+                f.write(json.dumps({"question": question, "response": response}, ensure_ascii=False) + "\n")
+                count += 1
+    return count
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_pairs(path, db_manager=None, ml_model=None, fmt=None, batch_size=1000, table="chatbot_responses",
+                 conflicts=None, model_batch_size=50000):
+    """
+    Load a CSV/JSONL file into the responses table and/or the ML model.
+
+    The file is streamed, so memory stays bounded whatever its size: rows go
+    to the database in executemany batches of batch_size, and to the model in
+    training steps of model_batch_size pairs (MLModel.update_many), with one
+    snapshot written at the end. conflicts, if a list, receives the clusters
+    of near-identical new questions with different answers that update_many
+    finds.
+    """
+    stats = {"inserted": 0, "failed_batches": 0, "learned": 0}
+    pairs_for_model = []
+    sql = f"INSERT INTO {check_table(table)} (question, response) VALUES (%s, %s)"
+
+    for batch in batched(read_pairs(path, fmt, stats), batch_size):
+        if db_manager is not None:
+            if db_manager.update_many(sql, batch):
+                stats["inserted"] += len(batch)
+            else:
+                stats["failed_batches"] += 1
+        if ml_model is not None:
+            pairs_for_model.extend(batch)
+            if len(pairs_for_model) >= model_batch_size:
+                stats["learned"] += ml_model.update_many(pairs_for_model, conflicts=conflicts,
+                                                         save=False)
+                pairs_for_model = []
+
+    if pairs_for_model:
+        stats["learned"] += ml_model.update_many(pairs_for_model, conflicts=conflicts, save=False)
+    if stats["learned"]:
+        ml_model.save_model()
+    return stats
+
+
+def iter_db_pairs(db_manager, table="chatbot_responses", batch_size=1000):
+    """Stream (question, response) rows from the responses table with fetchmany"""
+    with db_manager.cursor() as cursor:
+        cursor.execute(f"SELECT question, response FROM {check_table(table)}")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for question, response in rows:
+                yield question, response
+
+
+def export_pairs(path, db_manager=None, ml_model=None, fmt=None, table="chatbot_responses"):
+    """Stream the responses table (if db_manager is given) or the model's pairs to a file"""
+    if db_manager is not None:
+        return write_pairs(iter_db_pairs(db_manager, table), path, fmt)
+    return write_pairs(iter(ml_model.training_data), path, fmt)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import/export of question-response pairs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="load pairs into the database and the model")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--no-db", action="store_true", help="only train the model")
+    import_parser.add_argument("--no-model", action="store_true", help="only write the database")
+    import_parser.add_argument("--batch-size", type=int, default=1000)
+    import_parser.add_argument("--conflicts", help="write near-identical new questions with different answers "
+                                                   "here (JSON lines)")
+
+    export_parser = subparsers.add_parser("export", help="write pairs to a file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--source", choices=("model", "db"), default="model")
+
+    for sub in (import_parser, export_parser):
+        sub.add_argument("--format", choices=FORMATS, help="default: from the file extension")
+        sub.add_argument("--model-file", default="chatbot_model.cbm",
+                         help="model artifact; stop servers using it before importing, then restart them")
+        sub.add_argument("--table", default="chatbot_responses")
+    args = parser.parse_args()
+
+    db_manager = None
+    ml_model = None
+    needs_db = (args.command == "import" and not args.no_db) or (args.command == "export" and args.source == "db")
+    needs_model = (args.command == "import" and not args.no_model) or (args.command == "export" and args.source == "model")
+    if needs_db:
+        from database_manager import DatabaseManager
+        db_manager = DatabaseManager()
+    if needs_model:
+        from ml_model import MLModel, training_data
+        if args.command == "export" and not os.path.exists(args.model_file):
+            print(f"{args.model_file} not found")
+            sys.exit(1)
+        # A saved model is opened in the learning mode it was trained in
+        ml_model = MLModel(training_data=training_data if args.command == "import" else None,
+                           model_filename=args.model_file)
+
+    try:
+        if args.command == "import":
+            conflicts = [] if args.conflicts else None
+            stats = import_pairs(args.path, db_manager, ml_model, args.format, args.batch_size, args.table,
+                                 conflicts)
+            print(f"Read {stats['read']} pairs (skipped {stats['skipped']}), inserted {stats['inserted']} "
+                  f"({stats['failed_batches']} failed batches), learned {stats['learned']}")
+            if conflicts is not None:
+                with open(args.conflicts, "w", encoding="utf-8") as f:
+                    for cluster in conflicts:
+                        f.write(json.dumps(cluster.as_dict(), ensure_ascii=False) + "\n")
+                print(f"{len(conflicts)} clusters of near-identical questions with different answers "
+                      f"-> {args.conflicts}")
+            if stats["failed_batches"]:
+                sys.exit(1)
+        else:
+            count = export_pairs(args.path, db_manager, ml_model, args.format, args.table)
+            print(f"Exported {count} pairs to {args.path}")
+    finally:
+        if ml_model is not None:
+            ml_model.close()
+        if db_manager is not None:
+            db_manager.close()
+
+
+if __name__ == "__main__":
+    main()
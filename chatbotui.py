@@ -1,130 +1,187 @@
-import tkinter as tk
-from tkinter import scrolledtext
-import os
-
-
-class ChatbotUI:
-    def __init__(self, master, chatbot, nlp_processor, ml_model=None):
-        self.master = master
-        self.chatbot = chatbot
-        self.nlp_processor = nlp_processor
-        self.ml_model = ml_model
-        self.awaiting_learning = False
-        self.last_question = ""
-        self.setup_ui()
-
-    def setup_ui(self):
-        """Initialize the user interface components"""
-        self.master.title("Education Counseling Chatbot")
-
-        # Chat display area
-        self.chat_area = scrolledtext.ScrolledText(
-            self.master,
-            wrap=tk.WORD,
-            width=60,
-            height=15,
-            font=("Arial", 12),
-            state=tk.DISABLED
-        )
-        self.chat_area.grid(row=0, column=0, columnspan=2, padx=10, pady=10)
-
-        # User input entry
-        self.entry_box = tk.Entry(
-            self.master,
-            width=50,
-            font=("Times New Roman", 12)
-        )
-        self.entry_box.grid(row=1, column=0, padx=10, pady=10)
-        self.entry_box.bind("<Return>", self.on_enter_pressed)
-
-        # Send button
-        self.send_button = tk.Button(
-            self.master,
-            text="Send",
-            command=self.send_message,
-            font=("Arial", 12),
-            background="#4CAF50",  # Green color
-            foreground="white"
-        )
-        self.send_button.grid(row=1, column=1, padx=10, pady=10)
-
-        # Configure text tags
-        self.chat_area.tag_configure("user",
-                                     font=("Arial", 12, "bold"),
-                                     foreground="#333333")
-        self.chat_area.tag_configure("bot",
-                                     font=("Arial", 12),
-                                     foreground="#0066CC")
-        self.chat_area.tag_configure("right", justify=tk.RIGHT)
-        self.chat_area.tag_configure("left", justify=tk.LEFT)
-
-    def send_message(self, event=None):
-        """Handle sending of messages"""
-        user_input = self.entry_box.get().strip()
-        if not user_input:
-            return
-
-        self.display_message(user_input, "User", "right")
-        self.entry_box.delete(0, tk.END)
-
-        response = self.process_query(user_input)
-        self.display_message(response, "Bot", "left")
-
-    def on_enter_pressed(self, event):
-        """Handle Enter key press"""
-        self.send_message()
-
-    def display_message(self, message, sender, alignment):
-        """Display a message in the chat area"""
-        self.chat_area.config(state=tk.NORMAL)
-
-        # Use different tags for user and bot messages
-        tag = "user" if sender == "User" else "bot"
-        self.chat_area.insert(tk.END, f"{sender}: ", tag)
-        self.chat_area.insert(tk.END, f"{message}\n\n", tag)
-
-        # Apply alignment
-        tag_range = ("end-3l linestart", "end-2l lineend")
-        self.chat_area.tag_add(alignment, *tag_range)
-
-        self.chat_area.config(state=tk.DISABLED)
-        self.chat_area.yview(tk.END)
-
-    def process_query(self, user_input):
-        user_input = user_input.strip()
-        if not user_input:
-            return "Please type something..."
-
-        # Handle learning mode
-        if self.awaiting_learning:
-            if user_input and self.ml_model:
-                success = self.ml_model.update_model(self.last_question, user_input)
-                self.awaiting_learning = False
-                return "Thanks, I've learned from that!" if success else "I couldn't learn that response."
-            self.awaiting_learning = False
-            return "Please provide a valid response to learn."
-
-        # 1. Try ML model response
-        if self.ml_model:
-            try:
-                ml_response = self.ml_model.get_response(user_input)
-                if ml_response:
-                    return ml_response
-            except Exception as e:
-                print(f"Error getting ML response: {e}")
-
-        # 2. Try static responses
-        processed = self.nlp_processor.preprocess(user_input)
-        intent = self.nlp_processor.classify_intent(processed)
-        static_response = self.chatbot.knowledge_base.get_static_response(intent)
-        if static_response:
-            return static_response
-
-        # 3. Ask to teach
-        self.awaiting_learning = True
-        self.last_question = user_input
-        return "I don't know how to answer that. What should I say?"
-
-    def start_chat(self):
-        """Start the chat interface"""
-        self.master.mainloop()
\ No newline at end of file
+import tkinter as tk
+from tkinter import scrolledtext
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from session_store import Session
+
+POLL_INTERVAL_MS = 50
+
+
+class ChatbotUI:
+    """
+    Tk chat window. Queries and learning run on one background worker, in
+    the order they were sent, and answers come back through a queue that the
+    Tk loop polls with after(), so a slow database call or a retrain never
+    freezes the window. Only the last max_messages stay on screen; every
+    message is also appended to transcript_log, if given.
+    """
+
+    def __init__(self, master, chatbot, nlp_processor, ml_model=None, max_messages=200, transcript_log=None):
+        self.master = master
+        self.chatbot = chatbot
+        self.nlp_processor = nlp_processor
+        self.ml_model = ml_model
+        self.session = Session("ui")  # Learning dialog state; only touched by the worker thread
+        self.max_messages = max_messages
+        self.message_lines = deque()  # Text lines taken by each message on screen, oldest first
+        self.transcript = open(transcript_log, "a", encoding="utf-8", buffering=1) if transcript_log else None
+        self.requests = queue.Queue()
+        self.responses = queue.Queue()
+        self.pending = 0
+        self.closed = False
+        self.setup_ui()
+        self.worker = threading.Thread(target=self.run_worker, name="chat-ui-worker", daemon=True)
+        self.worker.start()
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
+        self.master.after(POLL_INTERVAL_MS, self.poll_responses)
+
+    def setup_ui(self):
+        """Initialize the user interface components"""
+        self.master.title("Education Counseling Chatbot")
+
+        # Chat display area
+        self.chat_area = scrolledtext.ScrolledText(
+            self.master,
+            wrap=tk.WORD,
+            width=60,
+            height=15,
+            font=("Arial", 12),
+            state=tk.DISABLED
+        )
+        self.chat_area.grid(row=0, column=0, columnspan=2, padx=10, pady=10)
+
+        # User input entry
+        self.entry_box = tk.Entry(
+            self.master,
+            width=50,
+            font=("Times New Roman", 12)
+        )
+        self.entry_box.grid(row=1, column=0, padx=10, pady=10)
+        self.entry_box.bind("<Return>", self.on_enter_pressed)
+
+        # Send button
+        self.send_button = tk.Button(
+            self.master,
+            text="Send",
+            command=self.send_message,
+            font=("Arial", 12),
+            background="#4CAF50",  # Green color
+            foreground="white"
+        )
+        self.send_button.grid(row=1, column=1, padx=10, pady=10)
+
+        # "Thinking" indicator, shown while answers are pending
+        self.status_label = tk.Label(self.master, text="", font=("Arial", 10, "italic"), foreground="#888888")
+        self.status_label.grid(row=2, column=0, columnspan=2, sticky=tk.W, padx=10)
+
+        # Configure text tags
+        self.chat_area.tag_configure("user",
+                                     font=("Arial", 12, "bold"),
+                                     foreground="#333333")
+        self.chat_area.tag_configure("bot",
+                                     font=("Arial", 12),
+                                     foreground="#0066CC")
+        self.chat_area.tag_configure("right", justify=tk.RIGHT)
+        self.chat_area.tag_configure("left", justify=tk.LEFT)
+
+    def send_message(self, event=None):
+        """Handle sending of messages"""
+        user_input = self.entry_box.get().strip()
+        if not user_input:
+            return
+
+        self.display_message(user_input, "User", "right")
+        self.entry_box.delete(0, tk.END)
+
+        # Answered on the worker; poll_responses displays the reply
+        self.pending += 1
+        self.status_label.config(text="Bot is thinking...")
+        self.requests.put(user_input)
+
+    def run_worker(self):
+        """Answer queued messages one at a time, in order, off the Tk thread"""
+        while True:
+            user_input = self.requests.get()
+            if user_input is None:
+                return
+            try:
+                response = self.process_query(user_input)
+            except Exception as e:
+                print(f"Error processing query: {e}")
+                response = "Sorry, something went wrong. Please try again."
+            self.responses.put(response)
+
+    def poll_responses(self):
+        """Show answers the worker has finished; runs on the Tk loop every POLL_INTERVAL_MS"""
+        if self.closed:
+            return
+        while True:
+            try:
+                response = self.responses.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            self.display_message(response, "Bot", "left")
+        if not self.pending:
+            self.status_label.config(text="")
+        self.master.after(POLL_INTERVAL_MS, self.poll_responses)
+
+    def on_enter_pressed(self, event):
+        """Handle Enter key press"""
+        self.send_message()
+
+    def display_message(self, message, sender, alignment):
+        """Display a message in the chat area"""
+        self.chat_area.config(state=tk.NORMAL)
+
+        # Use different tags for user and bot messages
+        tag = "user" if sender == "User" else "bot"
+        self.chat_area.insert(tk.END, f"{sender}: ", tag)
+        self.chat_area.insert(tk.END, f"{message}\n\n", tag)
+
+        # Apply alignment
+        tag_range = ("end-3l linestart", "end-2l lineend")
+        self.chat_area.tag_add(alignment, *tag_range)
+
+        # Keep the widget small: drop the oldest messages past max_messages
+        self.message_lines.append(message.count("\n") + 2)
+        while len(self.message_lines) > self.max_messages:
+            lines = self.message_lines.popleft()
+            self.chat_area.delete("1.0", f"{lines + 1}.0")
+
+        self.chat_area.config(state=tk.DISABLED)
+        self.chat_area.yview(tk.END)
+
+        if self.transcript is not None:
+            try:
+                self.transcript.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {sender}: {message}\n")
+            except (OSError, ValueError) as e:
+                print(f"Transcript error: {e}")
+
+    def process_query(self, user_input):
+        return self.chatbot.converse(self.session, user_input, self.ml_model, kind="ui")
+
+    def start_chat(self):
+        """Start the chat interface"""
+        self.master.mainloop()
+
+    def close(self, timeout=10.0):
+        """Let the worker finish its current message (e.g. a model update), then close the window"""
+        if self.closed:
+            return
+        self.closed = True
+        while True:  # Messages not started yet are dropped
+            try:
+                self.requests.get_nowait()
+            except queue.Empty:
+                break
+        self.requests.put(None)
+        self.worker.join(timeout)
+        if self.transcript is not None:
+            self.transcript.close()
+            self.transcript = None
+        self.master.destroy()
\ No newline at end of file
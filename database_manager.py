@@ -1,40 +1,297 @@
-import mysql.connector
-
-class DatabaseManager:
-    def __init__(self, host="localhost", user="root", password="", database="chatbot_db"):
-        self.host = host
-        self.user = user
-        self.password = password
-        self.database = database
-        self.connection = self.connect_to_db()
-
-    def connect_to_db(self):
-        try:
-            conn = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            return conn
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            return None
-
-    def query_db(self, sql_query, params=None):
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql_query, params)
-            result = cursor.fetchone()
-            return result[0] if result else None
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
-            return None
-
-    def update_db(self, sql_update, params=None):
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(sql_update, params)
-            self.connection.commit()
-        except mysql.connector.Error as err:
-            print(f"Error: {err}")
+import itertools
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool timeout"""
+
+
+class MySQLBackend:
+    """Connections to a MySQL server through mysql.connector"""
+
+    # Client errors for a connection lost to the server: CR_SERVER_GONE_ERROR,
+    # CR_SERVER_LOST and CR_SERVER_LOST_EXTENDED
+    DISCONNECT_ERRORS = (2006, 2013, 2055)
+
+    def __init__(self, host="localhost", user="root", password="", database="chatbot_db", connect_timeout=5):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.connect_timeout = connect_timeout
+
+    @property
+    def Error(self):
+        import mysql.connector
+        return mysql.connector.Error
+
+    def connect(self):
+        import mysql.connector
+        return mysql.connector.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            connection_timeout=self.connect_timeout
+        )
+
+    def is_alive(self, conn):
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except self.Error:
+            return False
+
+    def is_disconnect(self, err):
+        """Whether an error means the connection is gone (as opposed to a bad query, a deadlock, ...)"""
+        return getattr(err, "errno", None) in self.DISCONNECT_ERRORS
+
+    def prepare(self, sql):
+        return sql
+
+
+class SQLiteBackend:
+    """Embedded SQLite stand-in for local runs and tests; accepts the same %s-style SQL"""
+
+    Error = sqlite3.Error
+    _memory_ids = itertools.count()
+
+    def __init__(self, path=":memory:"):
+        # A plain ":memory:" database would be private to each connection, so
+        # pooled connections share one named in-memory database instead (named
+        # by a counter: an id() can be reused while the old database is open)
+        if path == ":memory:":
+            path = f"file:chatbot_db_{next(self._memory_ids)}?mode=memory&cache=shared"
+        elif not path.startswith("file:"):
+            path = f"file:{path}"
+        self.path = path
+        self._keepalive = sqlite3.connect(path, uri=True, check_same_thread=False)
+
+    def connect(self):
+        return sqlite3.connect(self.path, uri=True, check_same_thread=False, timeout=10)
+
+    def is_alive(self, conn):
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def is_disconnect(self, err):
+        # Only "Cannot operate on a closed database."; other ProgrammingErrors
+        # are bad bindings or cursor misuse, which a retry would only repeat
+        return isinstance(err, sqlite3.ProgrammingError) and "closed database" in str(err)
+
+    def prepare(self, sql):
+        return sql.replace("%s", "?")
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most max_size connections.
+
+    Connections are opened on demand; an idle connection is pinged before
+    reuse if it has not been used for health_check_interval seconds, and
+    replaced if it is dead. After a failed connect, new connects are not
+    attempted again for retry_interval seconds so callers fail fast while
+    the server is down.
+    """
+
+    def __init__(self, backend, max_size=5, timeout=10.0, health_check_interval=30.0, retry_interval=5.0):
+        self.backend = backend
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.retry_interval = retry_interval
+        self.condition = threading.Condition()
+        self.idle = []  # (connection, last used)
+        self.size = 0  # Open connections, idle or checked out
+        self.down_until = 0.0
+        self.closed = False
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise PoolTimeout("Connection pool is closed")
+                if self.idle:
+                    conn, last_used = self.idle.pop()
+                    break
+                if self.size < self.max_size:
+                    self.size += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s")
+                self.condition.wait(remaining)
+
+        # Connect and ping outside the lock so slow servers don't block other threads
+        try:
+            if conn is not None and time.monotonic() - last_used > self.health_check_interval:
+                if not self.backend.is_alive(conn):
+                    self._close(conn)
+                    conn = None
+            if conn is None:
+                conn = self._connect()
+        except BaseException:
+            self._discard()
+            raise
+        return conn
+
+    def _connect(self):
+        if time.monotonic() < self.down_until:
+            raise self.backend.Error("Database unavailable; waiting before reconnecting")
+        try:
+            return self.backend.connect()
+        except self.backend.Error:
+            self.down_until = time.monotonic() + self.retry_interval
+            raise
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _discard(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def release(self, conn, broken=False):
+        """Return a connection to the pool; broken connections are closed instead"""
+        if broken or self.closed:
+            self._close(conn)
+            self._discard()
+            return
+        with self.condition:
+            self.idle.append((conn, time.monotonic()))
+            self.condition.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except self.backend.Error as err:
+            broken = self.backend.is_disconnect(err)
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.condition.notify_all()
+        for conn, _ in idle:
+            self._close(conn)
+
+
+class DatabaseManager:
+    def __init__(self, host="localhost", user="root", password="", database="chatbot_db", backend=None,
+                 pool_size=5, pool_timeout=10.0):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.backend = backend or MySQLBackend(host, user, password, database)
+        self.pool = ConnectionPool(self.backend, max_size=pool_size, timeout=pool_timeout)
+
+    @contextmanager
+    def cursor(self, commit=False):
+        """Pooled cursor that is always closed; commits on success when asked, rolls back on error"""
+        with self.pool.connection() as conn:
+            with self._cursor(conn, commit) as cursor:
+                yield cursor
+
+    @contextmanager
+    def _cursor(self, conn, commit, state=None):
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            if commit:
+                if state is not None:
+                    state["committing"] = True
+                conn.commit()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            cursor.close()
+
+    def execute(self, sql, params=None, commit=False, fetch=None):
+        """
+        Run one statement, retrying once on a fresh connection if the old one
+        was dropped. A write is only retried if the connection was lost before
+        its COMMIT was sent: an uncommitted transaction dies with the
+        connection, but a lost COMMIT may have been applied.
+        """
+        sql = self.backend.prepare(sql)
+        for attempt in range(2):
+            state = {"connected": False, "committing": False}
+            try:
+                with self.pool.connection() as conn:
+                    state["connected"] = True
+                    with self._cursor(conn, commit, state) as cursor:
+                        if params is None:
+                            cursor.execute(sql)
+                        else:
+                            cursor.execute(sql, params)
+                        return fetch(cursor) if fetch else None
+            except self.backend.Error as err:
+                # Only a pooled connection that went away is retried, not a failed connect
+                if attempt or not state["connected"] or state["committing"] or not self.backend.is_disconnect(err):
+                    raise
+
+    def query_db(self, sql_query, params=None):
+        try:
+            result = self.execute(sql_query, params, fetch=lambda cursor: cursor.fetchone())
+            return result[0] if result else None
+        except (self.backend.Error, PoolTimeout) as err:
+            print(f"Error: {err}")
+            return None
+
+    def query_all(self, sql_query, params=None):
+        """Like query_db, but return every row (or None on error)"""
+        try:
+            return self.execute(sql_query, params, fetch=lambda cursor: cursor.fetchall())
+        except (self.backend.Error, PoolTimeout) as err:
+            print(f"Error: {err}")
+            return None
+
+    def update_db(self, sql_update, params=None):
+        try:
+            self.execute(sql_update, params, commit=True)
+        except (self.backend.Error, PoolTimeout) as err:
+            print(f"Error: {err}")
+
+    def update_many(self, sql_update, rows):
+        """Run one statement for a batch of rows with executemany in a single transaction; returns success"""
+        try:
+            with self.cursor(commit=True) as cursor:
+                cursor.executemany(self.backend.prepare(sql_update), rows)
+            return True
+        except (self.backend.Error, PoolTimeout) as err:
+            print(f"Error: {err}")
+            return False
+
+    def health_check(self):
+        """True if a pooled connection can run a trivial query"""
+        try:
+            return self.execute("SELECT 1", fetch=lambda cursor: cursor.fetchone()) is not None
+        except (self.backend.Error, PoolTimeout):
+            return False
+
+    def close(self):
+        self.pool.close()
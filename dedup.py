@@ -0,0 +1,139 @@
+"""
+Near-duplicate questions in large sets of question-response pairs.
+
+Clean a corpus before importing it, and list the questions that are asked
+almost identically but answered differently:
+
+    python dedup.py pairs.csv --output clean.csv --conflicts conflicts.jsonl
+
+Questions are compared by TF-IDF cosine similarity, like the model's
+similarity tier. Instead of scoring every pair of questions, the questions
+are indexed once (retrieval.InvertedIndex) and joined against that index in
+chunks of rows, so only questions sharing a heavily weighted term are ever
+scored: the cost follows the number of such candidate pairs, which grows
+about linearly with the corpus unless most questions share their words.
+"""
+import argparse
+import json
+import time
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+from online_learning import l2_normalize
+from response_cache import normalize_text
+from retrieval import InvertedIndex
+
+
+class DuplicateCluster:
+    """Rows whose questions are linked by chains of near-duplicates, with their pairs"""
+
+    __slots__ = ("rows", "questions", "responses")
+
+    def __init__(self, rows, questions, responses):
+        self.rows = rows
+        self.questions = questions
+        self.responses = responses
+
+    @property
+    def conflicting(self):
+        """Whether the near-identical questions are answered differently"""
+        return len(set(self.responses)) > 1
+
+    def as_dict(self):
+        return {
+            "rows": [int(row) for row in self.rows],
+            "questions": self.questions,
+            "responses": sorted(set(self.responses))
+        }
+
+
+def similar_rows(question_matrix, threshold, chunk_size=256):
+    """(earlier, later, score) arrays of every pair of rows whose cosine similarity is above threshold"""
+    question_matrix = l2_normalize(sp.csr_matrix(question_matrix, dtype=np.float32))
+    index = InvertedIndex.build(question_matrix)
+    inputs, rows, scores = index.all_matches(question_matrix, threshold, chunk_size)
+    earlier = rows < inputs
+    return rows[earlier], inputs[earlier], scores[earlier]
+
+
+def first_of_each(count, earlier, later, dropped=None):
+    """
+    Which of count rows to keep when they are taken in order and each one is
+    skipped if it is similar to a row already kept, as happens when they are
+    learned one at a time with MLModel.update_model. dropped optionally
+    marks rows skipped up front (e.g. known to the model already).
+    """
+    kept = np.ones(count, dtype=bool) if dropped is None else ~np.asarray(dropped, dtype=bool)
+    order = np.argsort(later, kind='stable')
+    earlier, later = earlier[order], later[order]
+    starts = np.searchsorted(later, np.arange(count + 1))
+    for row in np.unique(later):
+        if kept[row] and kept[earlier[starts[row]:starts[row + 1]]].any():
+            kept[row] = False
+    return kept
+
+
+def clusters(pairs, earlier, later):
+    """DuplicateCluster for each group of two or more rows of pairs linked by (earlier, later) edges"""
+    graph = sp.csr_matrix((np.ones(len(earlier), dtype=np.int8), (earlier, later)), shape=(len(pairs), len(pairs)))
+    _, labels = connected_components(graph, directed=False)
+    order = np.argsort(labels, kind='stable')
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    found = []
+    for rows in np.split(order, bounds):
+        if len(rows) > 1:
+            found.append(DuplicateCluster(rows, [pairs[row][0] for row in rows], [pairs[row][1] for row in rows]))
+    return found
+
+
+def tfidf_rows(questions):
+    """L2-normalized TF-IDF rows of questions, with the analyzer settings the model uses"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(lowercase=True, strip_accents='unicode', stop_words='english', ngram_range=(1, 2))
+    return l2_normalize(sp.csr_matrix(vectorizer.fit_transform(questions), dtype=np.float32))
+
+
+def main():
+    from bulk_io import read_pairs, write_pairs
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="pairs file (CSV or JSONL)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--output", help="write the pairs left after dropping near-duplicates")
+    parser.add_argument("--conflicts", help="write clusters of near-duplicates with different answers (JSON lines)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="cosine similarity a near-duplicate exceeds")
+    parser.add_argument("--chunk-size", type=int, default=256)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    pairs = []
+    seen = set()
+    for question, response in read_pairs(args.path, args.format):
+        question = normalize_text(question)
+        response = response.strip()
+        if question and response and question not in seen:
+            seen.add(question)
+            pairs.append((question, response))
+    if not pairs:
+        print(f"No pairs in {args.path}")
+        return
+
+    earlier, later, _ = similar_rows(tfidf_rows([q for q, _ in pairs]), args.threshold, args.chunk_size)
+    kept = first_of_each(len(pairs), earlier, later)
+    found = clusters(pairs, earlier, later)
+    conflicting = [cluster for cluster in found if cluster.conflicting]
+
+    if args.output:
+        write_pairs((pair for pair, keep in zip(pairs, kept) if keep), args.output, args.format)
+    if args.conflicts:
+        with open(args.conflicts, "w", encoding="utf-8") as f:
+            for cluster in conflicting:
+                f.write(json.dumps(cluster.as_dict(), ensure_ascii=False) + "\n")
+    print(f"{len(pairs)} distinct questions, {int(kept.sum())} left after dropping near-duplicates; "
+          f"{len(found)} clusters, {len(conflicting)} with conflicting answers "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,234 @@
-class Chatbot:
-    def __init__(self, knowledge_base, nlp_processor, ml_model=None):
-        self.knowledge_base = knowledge_base
-        self.nlp_processor = nlp_processor
-        self.ml_model = ml_model  # Optional
-
-    def process_query(self, user_input):
-        cleaned_input = self.nlp_processor.preprocess(user_input)
-        intent = self.nlp_processor.classify_intent(cleaned_input)
-
-        # Check for static responses first
-        response = self.knowledge_base.get_static_response(intent)
-        if response:
-            return response
-
-        # Fetch dynamic data if no static response
-        response = self.knowledge_base.fetch_dynamic_data(intent)
-        if response:
-            return response
-
-        # If ML model is available, use it to generate responses
-        if self.ml_model:
-            return self.ml_model.predict_response(user_input)
-
-        return "I'm sorry, I don't have information on that topic."
-
+from parsed_query import ParsedQuery
+from response_cache import MISSING, normalize_text
+
+FALLBACK_RESPONSE = "I'm sorry, I don't have information on that topic."
+TEACH_PROMPT = "I don't know how to answer that. What should I say?"
+
+
+class Chatbot:
+    def __init__(self, knowledge_base, nlp_processor, ml_model=None, response_cache=None, metrics=None):
+        self.knowledge_base = knowledge_base
+        self.nlp_processor = nlp_processor
+        self.ml_model = ml_model  # Optional
+        self.response_cache = response_cache  # Optional ResponseCache
+        self.metrics = metrics  # Optional Metrics; None disables all instrumentation
+        if metrics is not None:
+            self.register_gauges(metrics)
+
+    def register_gauges(self, metrics):
+        """Model, corpus and cache sizes, read when the metrics are exported"""
+        metrics.gauge("chatbot_model_pairs", "Question-response pairs known to the ML model",
+                      lambda: len(self.ml_model.training_data) if self.ml_model else None)
+        metrics.gauge("chatbot_model_features", "TF-IDF vocabulary size of the ML model",
+                      lambda: len(self.ml_model.snapshot.vectorizer.vocabulary_)
+                      if self.ml_model and self.ml_model.snapshot.vectorizer_fitted else None)
+        metrics.gauge("chatbot_model_version", "Learning steps applied to the ML model",
+                      lambda: self.ml_model.version if self.ml_model else None)
+        metrics.gauge("chatbot_cache_entries", "Entries in the response cache",
+                      lambda: len(self.response_cache.entries) if self.response_cache is not None else None)
+        metrics.gauge("chatbot_response_index_entries", "Rows in the in-memory response index",
+                      lambda: len(self.knowledge_base.response_index.snapshot)
+                      if getattr(self.knowledge_base, "response_index", None) is not None else None)
+
+    def parse(self, user_input):
+        """Parse a message once; classify, ml_response and process_query share the result"""
+        if self.ml_model:
+            # Pinned to the model snapshot current now, even if learning publishes another
+            return self.ml_model.parse(user_input, self.nlp_processor)
+        return ParsedQuery(user_input, self.nlp_processor)
+
+    def classify(self, query, trace=None):
+        """Intent of a ParsedQuery, cached per normalized input (it depends on nothing else)"""
+        key = ("intent", query.normalized)
+        if self.response_cache is not None:
+            intent = self.response_cache.get(key)
+            if intent is not None:
+                if trace is not None:
+                    trace.mark("intent")
+                return intent
+
+        stems = query.stems
+        if trace is not None:
+            trace.mark("preprocess")
+        intent = self.nlp_processor.classify_intent(stems)
+        if trace is not None:
+            trace.mark("intent")
+        if self.response_cache is not None:
+            self.response_cache.put(key, intent)
+        return intent
+
+    def ml_response(self, query, trace=None):
+        """ML model answer for a ParsedQuery or None, cached until the model learns something new"""
+        if not self.ml_model:
+            return None
+        if self.response_cache is None:
+            return self.ml_model.respond(query, trace)
+
+        key = ("ml", query.normalized)
+        version = query.ml_model.version if query.ml_model is not None else self.ml_model.version
+        response = self.response_cache.get(key, version, MISSING)
+        if response is MISSING:
+            response = self.ml_model.respond(query, trace)
+            self.response_cache.put(key, response, version)
+        elif trace is not None:
+            trace.mark("ml_cache")
+            if response:
+                trace.hit("ml_cache")
+        return response
+
+    def process_query(self, user_input):
+        trace = self.metrics.trace("chat") if self.metrics is not None else None
+        query = self.parse(user_input)
+        if trace is not None:
+            trace.mark("parse")
+        intent = self.classify(query, trace)
+
+        # Check for static responses first
+        response = self.knowledge_base.get_static_response(intent)
+        tier = "static"
+        if trace is not None:
+            trace.mark("static")
+
+        # Fetch dynamic data if no static response
+        if not response:
+            response = self.knowledge_base.fetch_dynamic_data(intent)
+            tier = "dynamic"
+            if trace is not None:
+                trace.mark("dynamic")
+
+        # If ML model is available, use it to generate responses (its tiers record their own hits)
+        if not response:
+            response = self.ml_response(query, trace)
+            tier = None
+
+        if not response:
+            response = FALLBACK_RESPONSE
+            tier = "fallback"
+
+        if trace is not None:
+            if tier is not None:
+                trace.hit(tier)
+            trace.finish(intent=intent)
+        return response
+
+    def converse(self, session, user_input, learner=None, kind="dialog"):
+        """
+        One turn of the learning dialog for a session_store.Session: the reply
+        after an "I don't know" is learned as the answer to the question
+        before it. Otherwise the ML model answers first, then static intents,
+        then the user is asked to teach. learner (default: the ML model) is
+        whatever applies update_model, e.g. prefork's LearnerClient.
+        """
+        trace = self.metrics.trace(kind) if self.metrics is not None else None
+        response = self._converse(session, user_input, learner or self.ml_model, trace)
+        if trace is not None:
+            trace.finish()
+        return response
+
+    def _converse(self, session, user_input, learner, trace):
+        user_input = user_input.strip()
+        if not user_input:
+            return "Please type something..."
+
+        # Handle learning mode
+        if session.awaiting_learning:
+            session.awaiting_learning = False
+            if learner:
+                success = learner.update_model(session.last_question, user_input)
+                if trace is not None:
+                    trace.mark("learn")
+                    trace.hit("learned" if success else "learn_failed")
+                return "Thanks, I've learned from that!" if success else "I couldn't learn that response."
+            return "Please provide a valid response to learn."
+
+        query = self.parse(user_input)
+        if trace is not None:
+            trace.mark("parse")
+
+        # 1. Try ML model response (cached until the model learns)
+        if self.ml_model:
+            try:
+                response = self.ml_response(query, trace)
+                if response:
+                    return response
+            except Exception as e:
+                print(f"Error getting ML response: {e}")
+
+        # 2. Try static responses; the intent is cached, the response is picked each time.
+        # The "unknown" replies are skipped here: the dialog asks to be taught instead
+        intent = self.classify(query, trace)
+        response = self.knowledge_base.get_static_response(intent) if intent != "unknown" else None
+        if trace is not None:
+            trace.mark("static")
+        if response:
+            if trace is not None:
+                trace.hit("static")
+            return response
+
+        # 3. Ask to teach
+        if trace is not None:
+            trace.hit("teach")
+        session.awaiting_learning = True
+        session.last_question = user_input
+        return TEACH_PROMPT
+
+    def process_queries(self, user_inputs):
+        """Answer a batch of queries; each answer is the one process_query would give"""
+        trace = self.metrics.trace("batch") if self.metrics is not None else None
+        keys = [normalize_text(text) for text in user_inputs]
+        intents = [None] * len(user_inputs)
+        if self.response_cache is not None:
+            intents = [self.response_cache.get(("intent", key)) for key in keys]
+
+        # Classify the queries the cache could not answer in one batch
+        uncached = [i for i, intent in enumerate(intents) if intent is None]
+        processed = self.nlp_processor.preprocess_many([user_inputs[i] for i in uncached])
+        for i, tokens in zip(uncached, processed):
+            intents[i] = self.nlp_processor.classify_intent(tokens)
+            if self.response_cache is not None:
+                self.response_cache.put(("intent", keys[i]), intents[i])
+        if trace is not None:
+            trace.mark("intent")
+
+        responses = [None] * len(user_inputs)
+
+        # Static responses, drawn in input order like repeated process_query calls
+        for i, intent in enumerate(intents):
+            responses[i] = self.knowledge_base.get_static_response(intent)
+        if trace is not None:
+            trace.mark("static")
+            trace.hit("static", sum(1 for response in responses if response))
+
+        # Dynamic data, looked up once per distinct intent
+        dynamic = {}
+        for i, intent in enumerate(intents):
+            if not responses[i]:
+                if intent not in dynamic:
+                    dynamic[intent] = self.knowledge_base.fetch_dynamic_data(intent)
+                responses[i] = dynamic[intent]
+        if trace is not None:
+            trace.mark("dynamic")
+            trace.hit("dynamic", sum(1 for response in responses if response) - trace.tiers["static"])
+
+        # ML model answers all remaining, uncached queries in one batch
+        remaining = [i for i, response in enumerate(responses) if not response]
+        if self.ml_model and remaining:
+            snapshot = self.ml_model.snapshot  # One model state for the versions and the answers
+            version = snapshot.version
+            if self.response_cache is not None:
+                for i in remaining:
+                    responses[i] = self.response_cache.get(("ml", keys[i]), version, MISSING)
+            uncached = [i for i in remaining if self.response_cache is None or responses[i] is MISSING]
+            answers = snapshot.get_responses([user_inputs[i] for i in uncached])
+            for i, answer in zip(uncached, answers):
+                responses[i] = answer
+                if self.response_cache is not None:
+                    self.response_cache.put(("ml", keys[i]), answer, version)
+
+        if trace is not None:
+            trace.mark("ml")
+            answered = sum(1 for response in responses if response)
+            trace.hit("ml", answered - trace.tiers["static"] - trace.tiers["dynamic"])
+            trace.hit("fallback", len(responses) - answered)
+            trace.finish(queries=len(user_inputs))
+        return [response or FALLBACK_RESPONSE for response in responses]
@@ -0,0 +1,130 @@
+import json
+from collections import deque
+
+# Rules in priority order: the first rule that matches decides the intent.
+# "any" matches if one of its keywords occurs (a keyword with spaces is a
+# phrase of consecutive tokens); "all" matches if every word occurs anywhere.
+# Keywords are compared with stemmed tokens, so they are written as stems.
+DEFAULT_RULES = [
+    {"intent": "greeting", "any": ["hi", "hello", "hey", "greet"]},
+    {"intent": "how_are_you", "all": ["how", "are", "you"]},
+    {"intent": "course_info", "any": ["cours", "program", "subject", "field", "study", "degree"]},
+    {"intent": "admission_info", "any": ["admiss", "appli", "enrol", "register", "apply", "application"]},
+    {"intent": "career_guidance", "any": ["career", "job", "intern", "employ", "work", "placement"]},
+    {"intent": "scholarship_info", "any": ["scholar", "fund", "aid", "grant", "bursari", "scholarship"]},
+    {"intent": "general_info", "any": ["locat", "visit", "contact", "email", "address", "time", "campus"]},
+    {"intent": "greeting", "any": ["hi", "hello", "hey", "greetings"]},
+    {"intent": "goodbye", "any": ["bye", "goodbye", "see you", "later"]},
+    {"intent": "how_are_you", "any": ["how", "are", "you"]},
+    {"intent": "thank_you", "any": ["thank", "thanks"]},
+    {"intent": "sorry", "any": ["sorry", "apologize", "pardon"]},
+    {"intent": "help", "any": ["help", "assist", "support", "need help"]},
+    {"intent": "contact_info", "any": ["contact", "reach", "get in touch", "speak to"]},
+    {"intent": "phone_number", "any": ["phone", "number", "call", "telephone"]},
+    {"intent": "name", "any": ["name", "who are you", "what is your name"]}
+]
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over token sequences; reports every phrase ending at each token"""
+
+    def __init__(self, phrases):
+        # phrases: iterable of (tuple of tokens, value)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for tokens, value in phrases:
+            node = 0
+            for token in tokens:
+                next_node = self.goto[node].get(token)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][token] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                node = next_node
+            self.output[node].append(value)
+
+        # Breadth-first failure links (depth-one states fail to the root);
+        # outputs of the failure state are inherited
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and token not in self.goto[state]:
+                    state = self.fail[state]
+                self.fail[child] = self.goto[state].get(token, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def step(self, state, token):
+        """Advance by one token; returns (new state, values of phrases ending here)"""
+        while state and token not in self.goto[state]:
+            state = self.fail[state]
+        state = self.goto[state].get(token, 0)
+        return state, self.output[state]
+
+
+class IntentMatcher:
+    """
+    Intent rules compiled for a single pass over the tokens.
+
+    Single-word keywords go into a token -> best rule index, phrases into an
+    Aho-Corasick matcher and "all" rules into a token -> (rule, bit) index.
+    The lowest matching rule index wins, the same as checking the rules in
+    order.
+    """
+
+    def __init__(self, rules=None, default="unknown"):
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.default = default
+        self.intents = [rule["intent"] for rule in self.rules]
+        self.word_index = {}  # token -> lowest priority of a single-word keyword
+        self.all_index = {}  # token -> [(priority, bit)]
+        self.all_masks = {}  # priority -> mask with one bit per required word
+        phrases = []
+
+        for priority, rule in enumerate(self.rules):
+            for keyword in rule.get("any", []):
+                tokens = tuple(keyword.split())
+                if len(tokens) == 1:
+                    self.word_index[tokens[0]] = min(self.word_index.get(tokens[0], priority), priority)
+                elif tokens:
+                    phrases.append((tokens, priority))
+            words = list(dict.fromkeys(rule.get("all", [])))
+            if words:
+                self.all_masks[priority] = (1 << len(words)) - 1
+                for bit, word in enumerate(words):
+                    self.all_index.setdefault(word, []).append((priority, 1 << bit))
+        self.phrases = PhraseMatcher(phrases) if phrases else None
+
+    @classmethod
+    def from_file(cls, path, default="unknown"):
+        """Load a JSON list of rules ({"intent": ..., "any": [...]} or {"intent": ..., "all": [...]})"""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), default=default)
+
+    def match(self, tokens):
+        """Intent of a list of stemmed tokens"""
+        best = len(self.rules)
+        state = 0
+        seen = {}
+        for token in tokens:
+            priority = self.word_index.get(token)
+            if priority is not None and priority < best:
+                best = priority
+                if best == 0:
+                    break
+            for priority, bit in self.all_index.get(token, ()):
+                if priority < best:
+                    seen[priority] = seen.get(priority, 0) | bit
+                    if seen[priority] == self.all_masks[priority]:
+                        best = priority
+            if self.phrases is not None:
+                state, ends = self.phrases.step(state, token)
+                for priority in ends:
+                    if priority < best:
+                        best = priority
+        return self.intents[best] if best < len(self.rules) else self.default
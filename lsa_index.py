@@ -0,0 +1,198 @@
+"""
+Dense LSA index: a low-rank projection of the TF-IDF space fitted offline.
+
+Fit a projection for a trained model, then serve with it:
+
+    python lsa_index.py chatbot_model.cbm --dimensions 64 --output chatbot_model.lsa
+    python server.py --lsa chatbot_model.lsa
+
+Every stored question becomes a short dense vector (float32, or int8 with a
+per-row scale), so questions that share no words but occur with the same
+vocabulary (e.g. "fees" and "tuition cost") still land close together. The
+ML model uses it as a tier between TF-IDF similarity and naive Bayes.
+"""
+import argparse
+import hashlib
+import os
+import time
+import numpy as np
+import scipy.sparse as sp
+
+from model_artifact import read_artifact, write_artifact
+from online_learning import l2_normalize
+
+# Rows scored per block when int8 codes are widened to float32 for BLAS
+INT8_BLOCK_ROWS = 65536
+
+
+def vocabulary_digest(vectorizer, n_terms):
+    """Digest of the first n_terms vocabulary columns, to tell whether a projection fits a model"""
+    vocabulary = vectorizer.vocabulary_
+    terms = sorted((column, term) for term, column in vocabulary.items() if column < n_terms)
+    digest = hashlib.blake2b(digest_size=16)
+    for _, term in terms:
+        digest.update(term.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class LsaProjection:
+    """Fitted projection (dimensions x n_features) from TF-IDF rows to unit-length dense vectors"""
+
+    def __init__(self, components, digest, threshold=0.85):
+        self.components = components
+        self.digest = digest
+        self.threshold = threshold  # Dense cosine a match has to beat
+        self.n_features = components.shape[1]
+
+    @classmethod
+    def fit(cls, question_matrix, responses, vectorizer, dimensions=64, seed=0, threshold=0.85):
+        """
+        Truncated SVD of the questions plus one document per distinct answer
+        (the sum of its questions), so words used in different questions for
+        the same answer end up close. Needs sklearn; only used offline.
+        """
+        from sklearn.decomposition import TruncatedSVD
+        _, answer_ids = np.unique(np.asarray(responses, dtype=object), return_inverse=True)
+        membership = sp.csr_matrix(
+            (np.ones(len(answer_ids), dtype=np.float32), (answer_ids, np.arange(len(answer_ids)))),
+            shape=(answer_ids.max() + 1, len(answer_ids))
+        )
+        documents = sp.vstack([question_matrix, l2_normalize(membership @ question_matrix)], format='csr')
+        dimensions = max(1, min(dimensions, min(documents.shape) - 1))
+        svd = TruncatedSVD(n_components=dimensions, random_state=seed)
+        svd.fit(documents)
+        components = np.ascontiguousarray(svd.components_, dtype=np.float32)
+        projection = cls(components, vocabulary_digest(vectorizer, components.shape[1]), threshold)
+        return projection, float(svd.explained_variance_ratio_.sum())
+
+    def save(self, path):
+        write_artifact(path, {"components": self.components}, {"digest": self.digest, "threshold": self.threshold})
+
+    @classmethod
+    def load(cls, path):
+        arrays, meta = read_artifact(path)
+        return cls(arrays["components"], meta["digest"], meta["threshold"])
+
+    def check(self, vectorizer):
+        """Raise ValueError unless the model's vocabulary starts with the columns this was fitted on"""
+        if len(vectorizer.vocabulary_) < self.n_features or \
+                vocabulary_digest(vectorizer, self.n_features) != self.digest:
+            raise ValueError("LSA projection was fitted on a different vocabulary; fit it again for this model")
+
+    def project(self, X):
+        """Unit-length float32 dense rows for TF-IDF rows X (terms added after fitting are ignored)"""
+        X = sp.csr_matrix(X, dtype=np.float32)
+        if X.shape[1] > self.n_features:
+            X = X[:, :self.n_features]
+        elif X.shape[1] < self.n_features:
+            X = sp.csr_matrix((X.data, X.indices, X.indptr), shape=(X.shape[0], self.n_features))
+        dense = np.asarray(X @ self.components.T, dtype=np.float32)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return dense / norms
+
+
+class DenseIndex:
+    """
+    Projected question vectors in one contiguous array, scored with one BLAS product.
+
+    With quantize=True each row is stored as int8 codes plus a float32 scale
+    (4x smaller); blocks of codes are widened to float32 when scored. Rows
+    appended after the index was built are kept in a small float32 tail,
+    merged into the main array once it grows past a sixteenth of it.
+    """
+
+    def __init__(self, projection, vectors, scales=None, tail=None):
+        self.projection = projection
+        self.vectors = vectors  # float32 rows, or int8 codes when scales is given
+        self.scales = scales
+        self.tail = tail if tail is not None else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        self.rows = len(vectors) + len(self.tail)
+
+    @classmethod
+    def build(cls, question_matrix, previous=None, projection=None, quantize=False):
+        """
+        Project every row of a question matrix. previous, if given, is the
+        index of a matrix this one extends by appending rows; only the new
+        rows are projected.
+        """
+        if previous is not None and previous.projection is projection and (previous.scales is not None) == quantize:
+            new = question_matrix.shape[0] - previous.rows
+            if 0 <= new and len(previous.tail) + new <= max(1024, len(previous.vectors) // 16):
+                tail = np.concatenate([previous.tail, projection.project(question_matrix[previous.rows:])])
+                return cls(projection, previous.vectors, previous.scales, tail)
+
+        vectors = projection.project(question_matrix)
+        if not quantize:
+            return cls(projection, vectors)
+        peaks = np.abs(vectors).max(axis=1)
+        peaks[peaks == 0] = 1.0
+        codes = np.rint(vectors * (127.0 / peaks)[:, None]).astype(np.int8)
+        return cls(projection, codes, (peaks / 127.0).astype(np.float32))
+
+    def scores(self, queries):
+        """Cosine scores (rows x len(queries)) of already projected query vectors"""
+        queries = np.asarray(queries, dtype=np.float32).T
+        if self.scales is None:
+            head = self.vectors @ queries
+        else:
+            head = np.empty((len(self.vectors), queries.shape[1]), dtype=np.float32)
+            for start in range(0, len(self.vectors), INT8_BLOCK_ROWS):
+                block = self.vectors[start:start + INT8_BLOCK_ROWS].astype(np.float32)
+                head[start:start + len(block)] = block @ queries
+            head *= self.scales[:, None]
+        if len(self.tail):
+            return np.concatenate([head, self.tail @ queries])
+        return head
+
+    def best_matches(self, X, threshold=None):
+        """For each TF-IDF row of X, the (row, score) of the closest question above the threshold, or None"""
+        threshold = self.projection.threshold if threshold is None else threshold
+        scores = self.scores(self.projection.project(X))
+        matches = []
+        for column in range(scores.shape[1]):
+            best = int(np.argmax(scores[:, column])) if len(scores) else 0
+            if len(scores) and scores[best, column] > threshold:
+                matches.append((best, float(scores[best, column])))
+            else:
+                matches.append(None)
+        return matches
+
+    def nbytes(self):
+        return self.vectors.nbytes + (self.scales.nbytes if self.scales is not None else 0) + self.tail.nbytes
+
+
+def main():
+    from ml_model import MLModel
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("model_file", help="trained model artifact (.cbm)")
+    parser.add_argument("--output", required=True, help="where to write the projection")
+    parser.add_argument("--dimensions", type=int, default=64)
+    parser.add_argument("--threshold", type=float, default=0.85, help="dense cosine a match has to beat")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model_file):
+        print(f"{args.model_file} not found")
+        return
+    # Opened in the mode it was trained in, so it is only read, never retrained
+    ml_model = MLModel(model_filename=args.model_file)
+    try:
+        snapshot = ml_model.snapshot
+        if not snapshot.vectorizer_fitted or snapshot.question_matrix is None:
+            print(f"{args.model_file} holds no trained questions")
+            return
+        start = time.perf_counter()
+        responses = [response for _, response in snapshot.training_data]
+        projection, explained = LsaProjection.fit(snapshot.question_matrix, responses, snapshot.vectorizer,
+                                                  args.dimensions, args.seed, args.threshold)
+        projection.save(args.output)
+        print(f"Fitted {projection.components.shape[0]} dimensions over {projection.n_features} terms "
+              f"({explained:.1%} of the variance) in {time.perf_counter() - start:.1f}s -> {args.output}")
+    finally:
+        ml_model.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds, from the sub-millisecond tiers to a slow database call
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, exported like a Prometheus histogram"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RequestTrace:
+    """
+    Timings of one request. mark(stage) charges the time since the previous
+    mark to stage; hit(tier) records which tier answered. Created by
+    Metrics.trace() only when metrics are enabled, so callers guard every
+    call with `if trace is not None` and pay nothing otherwise.
+    """
+
+    __slots__ = ("metrics", "kind", "started", "last", "stages", "tiers")
+
+    def __init__(self, metrics, kind):
+        self.metrics = metrics
+        self.kind = kind
+        self.started = self.last = time.perf_counter()
+        self.stages = {}
+        self.tiers = {}
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.stages[stage] = self.stages.get(stage, 0.0) + now - self.last
+        self.last = now
+
+    def hit(self, tier, count=1):
+        self.tiers[tier] = self.tiers.get(tier, 0) + count
+
+    def finish(self, **fields):
+        self.metrics.record(self, time.perf_counter() - self.started, fields)
+
+
+class Metrics:
+    """
+    Per-stage latency histograms, per-tier hit counters and gauges for the
+    chatbot pipeline, exported in the Prometheus text format. Each finished
+    request can also be written to request_log as one JSON line.
+    """
+
+    def __init__(self, request_log=None, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.requests = {}  # kind -> Histogram of whole-request latency
+        self.stages = {}  # stage -> Histogram
+        self.tiers = {}  # (kind, tier) -> count
+        self.gauges = {}  # name -> (help, function returning a number or None)
+        self.log = open(request_log, "a", encoding="utf-8", buffering=1) if request_log else None
+
+    def trace(self, kind="chat"):
+        return RequestTrace(self, kind)
+
+    def gauge(self, name, help_text, function):
+        """Register a gauge read by calling function() at export time"""
+        self.gauges[name] = (help_text, function)
+
+    def record(self, trace, elapsed, fields):
+        with self.lock:
+            histogram = self.requests.get(trace.kind)
+            if histogram is None:
+                histogram = self.requests[trace.kind] = Histogram(self.buckets)
+            histogram.observe(elapsed)
+            for stage, seconds in trace.stages.items():
+                histogram = self.stages.get(stage)
+                if histogram is None:
+                    histogram = self.stages[stage] = Histogram(self.buckets)
+                histogram.observe(seconds)
+            for tier, count in trace.tiers.items():
+                self.tiers[(trace.kind, tier)] = self.tiers.get((trace.kind, tier), 0) + count
+
+            if self.log is not None:
+                entry = {
+                    "time": round(time.time(), 3),
+                    "kind": trace.kind,
+                    "total_ms": round(elapsed * 1e3, 3),
+                    "stages_ms": {stage: round(seconds * 1e3, 3) for stage, seconds in trace.stages.items()},
+                    "tiers": trace.tiers,
+                }
+                entry.update(fields)
+                try:
+                    self.log.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except (OSError, ValueError) as e:
+                    print(f"Request log error: {e}")
+
+    def export(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            self._export_histograms(lines, "chatbot_request_seconds", "Whole request latency",
+                                    "kind", self.requests)
+            self._export_histograms(lines, "chatbot_stage_seconds", "Latency of each pipeline stage",
+                                    "stage", self.stages)
+            lines.append("# HELP chatbot_tier_hits_total Requests answered by each tier")
+            lines.append("# TYPE chatbot_tier_hits_total counter")
+            for (kind, tier), count in sorted(self.tiers.items()):
+                lines.append(f'chatbot_tier_hits_total{{kind="{kind}",tier="{tier}"}} {count}')
+
+        for name, (help_text, function) in sorted(self.gauges.items()):
+            try:
+                value = function()
+            except Exception as e:
+                print(f"Gauge {name} error: {e}")
+                continue
+            if value is None:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _export_histograms(self, lines, name, help_text, label, histograms):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{label}="{key}",le="+Inf"}} {histogram.count}')
+            lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum}')
+            lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
+
+    def close(self):
+        with self.lock:
+            if self.log is not None:
+                self.log.close()
+                self.log = None
@@ -1,232 +1,967 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
-import pickle
-import os
-import re
-
-
-class MLModel:
-    def __init__(self, training_data=None, model_filename="chatbot_model.pkl"):
-        self.vectorizer = TfidfVectorizer(
-            lowercase=True,
-            strip_accents='unicode',
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
-        self.model = MultinomialNB()
-        self.model_filename = model_filename
-        self.training_data = []
-        self.trained = False
-        self.similarity_threshold = 0.7
-        self.vectorizer_fitted = False  # Track if vectorizer is fitted
-
-        if os.path.exists(model_filename):
-            self.load_model()
-        elif training_data:
-            self.initial_train(training_data)
-
-    def clean_text(self, text):
-        """Normalize text for consistent matching"""
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s]', '', text)
-        return ' '.join(text.split())
-
-    def initial_train(self, data):
-        """Initial training with complete dataset"""
-        self.training_data = [(self.clean_text(q), a) for q, a in data]
-        questions = [q for q, _ in self.training_data]
-        responses = [r for _, r in self.training_data]
-
-        # Fit the vectorizer and model
-        X = self.vectorizer.fit_transform(questions)
-        self.vectorizer_fitted = True
-        self.model.fit(X, responses)
-        self.trained = True
-        self.save_model()
-
-    def find_similar_question(self, user_input):
-        """Find semantically similar questions using cosine similarity"""
-        if not self.training_data or not self.vectorizer_fitted:
-            return None
-
-        try:
-            questions = [q for q, _ in self.training_data]
-            question_vectors = self.vectorizer.transform(questions)
-            input_vector = self.vectorizer.transform([user_input])
-
-            similarities = cosine_similarity(input_vector, question_vectors)
-            max_index = np.argmax(similarities)
-
-            if similarities[0, max_index] > self.similarity_threshold:
-                return self.training_data[max_index][1]
-        except Exception as e:
-            print(f"Similarity check error: {e}")
-        return None
-
-    def update_model(self, question, response):
-        """Add new training example with semantic checking"""
-        question = self.clean_text(question)
-        response = response.strip()
-
-        if not question or not response:
-            return False
-
-        # Check if similar question exists
-        similar_answer = self.find_similar_question(question)
-        if similar_answer:
-            return True
-
-        # Add new pair and retrain
-        self.training_data.append((question, response))
-        questions = [q for q, _ in self.training_data]
-        responses = [r for _, r in self.training_data]
-
-        # Refit vectorizer if not already fitted
-        if not self.vectorizer_fitted:
-            X = self.vectorizer.fit_transform(questions)
-            self.vectorizer_fitted = True
-        else:
-            X = self.vectorizer.transform(questions)
-
-        self.model.fit(X, responses)
-        self.trained = True
-        self.save_model()
-        return True
-
-    def get_response(self, user_input):
-        """Get response using multiple matching strategies"""
-        user_input = self.clean_text(user_input)
-
-        # 1. Exact match
-        for q, a in self.training_data:
-            if q == user_input:
-                return a
-
-        # 2. Semantic similarity (only if vectorizer is fitted)
-        if self.vectorizer_fitted:
-            similar_answer = self.find_similar_question(user_input)
-            if similar_answer:
-                return similar_answer
-
-        # 3. ML prediction
-        if len(user_input.split()) >= 3 and self.vectorizer_fitted:
-            try:
-                X = self.vectorizer.transform([user_input])
-                pred = self.model.predict(X)[0]
-                proba = self.model.predict_proba(X).max()
-                return pred if proba > 0.7 else None
-            except Exception as e:
-                print(f"Prediction error: {e}")
-
-        return None
-
-    def save_model(self):
-        """Save complete model state"""
-        model_data = {
-            'vocabulary': self.vectorizer.vocabulary_ if self.vectorizer_fitted else None,
-            'model': self.model,
-            'training_data': self.training_data,
-            'fitted': self.vectorizer_fitted
-        }
-        with open(self.model_filename, "wb") as f:
-            pickle.dump(model_data, f)
-
-    def load_model(self):
-        """Load complete model state"""
-        with open(self.model_filename, "rb") as f:
-            data = pickle.load(f)
-            self.vectorizer = TfidfVectorizer(
-                vocabulary=data['vocabulary'],
-                lowercase=True,
-                strip_accents='unicode',
-                stop_words='english',
-                ngram_range=(1, 2)
-            )
-            self.model = data['model']
-            self.training_data = data['training_data']
-            self.vectorizer_fitted = data.get('fitted', False)
-            self.trained = True
-
-
-# Example training data (list of (question, response) tuples)
-training_data = [
-    ("hi", "Hello! How can I help you?"),
-    ("hello", "Hi there! How can I assist you today?"),
-    ("what courses are available", "We offer a variety of programs in IT, Business, and Arts."),
-    ("what programs do you offer", "We offer programs in IT, Business, Arts, and Sciences."),
-    ("how to apply", "You can apply through our website under the admissions section."),
-    ("where can I apply", "You can apply via our online portal. Visit the admissions page."),
-    ("what are the admission requirements", "You need to have a high school diploma and a good academic record."),
-    ("what is the fee for the course",
-     "The fee depends on the program. Please check the course details for more information."),
-    ("how long does the course take", "Most courses are 3 to 4 years long, depending on the program."),
-    ("what is the deadline for applications",
-     "The application deadline is typically in June. Please refer to the admissions page for exact dates."),
-    ("can I apply online", "Yes, applications are fully online through our website."),
-    ("is there an entrance exam", "Some programs may require an entrance exam. Please check the program details."),
-    (
-    "how do I contact support", "You can contact support via email at support@example.com or by calling our helpline."),
-    ("what is the program schedule", "The program schedule is flexible, with both part-time and full-time options."),
-    ("can I get a scholarship",
-     "Yes, scholarships are available based on merit. Please visit the scholarships page for more details."),
-    ("do you offer online courses", "Yes, we offer a range of online courses. Visit our website for more information."),
-    ("how can I get my transcript", "You can request your transcript through the student portal."),
-    ("is there a student discount",
-     "Yes, there are discounts available for students. You can check for discounts on the fee page."),
-    ("what is the job placement rate",
-     "Our job placement rate is very high, with many students securing jobs within six months of graduation."),
-    ("can I defer my admission",
-     "Yes, deferring your admission is possible. Please contact the admissions office for details."),
-    ("do you offer internships",
-     "Yes, we offer internships as part of our programs. Check the internship page for more details."),
-    ("where are you located", "Our campus is located in the city center at 123 Main Street."),
-    ("can I visit the campus", "Yes, we offer campus tours. Please contact the admissions office to schedule a visit."),
-    ("is there a student club", "Yes, we have several student clubs ranging from academic to recreational interests."),
-    ("can I change my major",
-     "Yes, changing your major is possible within the first year. Speak with an academic advisor for guidance."),
-    ("do you offer evening classes",
-     "Yes, we offer evening classes for most programs. Please refer to the course schedule for availability."),
-    ("are there work-study opportunities", "Yes, we offer work-study programs for eligible students."),
-    ("how do I withdraw from a course",
-     "To withdraw from a course, please visit the student portal or contact your academic advisor."),
-    ("what is the grading system", "Our grading system is based on a 4.0 scale. An A is worth 4 points."),
-    ("is there a deadline for dropping a course",
-     "Yes, there is a deadline for course drops. Please refer to the academic calendar for dates."),
-    (
-    "how do I apply for a scholarship", "You can apply for a scholarship through the scholarship page on our website."),
-    ("is there a fee for applying", "No, there is no application fee for most programs."),
-    ("what is the admission process",
-     "The admission process includes submitting an online application, academic transcripts, and meeting program requirements."),
-    ("when will I receive my admission decision",
-     "Admission decisions are typically made within 6-8 weeks after the application deadline."),
-    ("can I apply for multiple programs",
-     "Yes, you can apply for multiple programs, but each program has its own requirements."),
-    ("is there an alumni network",
-     "Yes, we have an alumni network that provides career support and networking opportunities."),
-    ("do you offer part-time programs", "Yes, we offer part-time programs for working professionals."),
-    ("how can I get a student ID",
-     "You will receive a student ID during your orientation session after you're admitted."),
-    ("where can I find course catalogs", "You can find course catalogs on the programs page on our website."),
-    ("can I change my class schedule", "Yes, schedule changes are possible within the first week of classes."),
-    ("do you offer a counseling service",
-     "Yes, we provide student counseling services for academic and personal support."),
-    ("is there a dress code", "There is no strict dress code, but we ask students to dress appropriately for class."),
-    ("what is the campus environment like",
-     "Our campus is very inclusive, with a vibrant student life and beautiful green spaces."),
-    ("can I get a part-time job while studying",
-     "Yes, many students work part-time while studying. Check with the career services office for opportunities."),
-    ("how can I request a letter of recommendation",
-     "You can request a letter of recommendation from your professors or academic advisors."),
-    ("do you offer career counseling", "Yes, our career services offer counseling and job placement assistance."),
-    ("is the campus accessible for disabled students",
-     "Yes, our campus is fully accessible with ramps, elevators, and other facilities for disabled students."),
-    ("do you offer language courses", "Yes, we offer language courses including English, Spanish, and French."),
-    ("how do I check my grades", "You can check your grades on the student portal."),
-    ("how do I reset my password",
-     "You can reset your password by clicking the 'Forgot Password' link on the login page."),
-]
-
-# Initialize and train the model (or load it if it already exists)
-ml_model = MLModel(training_data=training_data)
\ No newline at end of file
+import scipy.sparse as sp
+import numpy as np
+from online_learning import (
+    FrozenTfidfVectorizer, GrowingTfidfVectorizer, IncrementalNB, TextAnalyzer, append_rows, l2_normalize,
+    log_normalize
+)
+from model_journal import ModelJournal, SnapshotWriter
+from dedup import clusters, first_of_each, similar_rows
+from retrieval import InvertedIndex
+from parsed_query import ParsedQuery
+from response_cache import normalize_text
+from model_artifact import (
+    PairTable, StringTable, StringView, artifact_file, csr_arrays, csr_from_arrays, is_artifact, pack_strings,
+    read_artifact, write_artifact
+)
+import threading
+import pickle
+import os
+
+# Naive Bayes answers only when its posterior beats this (and the input has 3+ words)
+PREDICTION_THRESHOLD = 0.7
+
+# Position of each tier in the answering cascade; None ranks candidates no tier accepts
+TIER_ORDER = {"exact": 0, "similarity": 1, "lsa": 2, "nb": 3, None: 4}
+
+
+class Candidate:
+    """
+    One possible answer from MLModel.rank with the confidence of each tier.
+
+    tier is the tier that would answer with it ("exact", "similarity", "lsa",
+    "nb") or None if none would, and score is that tier's confidence.
+    similarity is the best TF-IDF cosine score of a stored question with this
+    answer, lsa the same in the dense LSA space and probability the NB
+    posterior; each is None when the answer was not among that tier's top
+    candidates (or the model has no such tier).
+    """
+
+    __slots__ = ("response", "tier", "score", "similarity", "lsa", "probability")
+
+    def __init__(self, response, tier=None, score=0.0, similarity=None, lsa=None, probability=None):
+        self.response = response
+        self.tier = tier
+        self.score = score
+        self.similarity = similarity
+        self.lsa = lsa
+        self.probability = probability
+
+    def __repr__(self):
+        return f"Candidate({self.response!r}, tier={self.tier!r}, score={self.score:.3f})"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ModelSnapshot:
+    """
+    One immutable state of the model: pairs, featurizer, classifier and question index.
+
+    Readers take MLModel.snapshot once and use only that object, so a query
+    never sees a half-learned model and needs no lock. Learning builds the next
+    snapshot beside it and publishes it with a single attribute assignment;
+    snapshots nobody references any more are freed like any other object.
+    """
+
+    __slots__ = ("training_data", "vectorizer", "model", "question_matrix", "question_counts", "reweighted_at",
+                 "vectorizer_fitted", "version", "similarity_threshold", "retriever", "embedding")
+
+    def __init__(self, training_data=None, vectorizer=None, model=None, question_matrix=None, question_counts=None,
+                 reweighted_at=0, vectorizer_fitted=False, version=0, similarity_threshold=0.7, retriever=None,
+                 embedding=None):
+        self.training_data = training_data if training_data is not None else PairTable()
+        self.vectorizer = vectorizer
+        self.model = model if model is not None else IncrementalNB()
+        self.question_matrix = question_matrix  # L2-normalized TF-IDF rows, one per training question
+        self.question_counts = question_counts  # Raw term counts behind question_matrix (incremental mode)
+        self.reweighted_at = reweighted_at  # Corpus size when question_matrix was last re-weighted
+        self.vectorizer_fitted = vectorizer_fitted
+        self.version = version  # Bumped whenever learned pairs can change an answer
+        self.similarity_threshold = similarity_threshold
+        self.retriever = retriever  # Optional index over question_matrix (e.g. retrieval.InvertedIndex)
+        self.embedding = embedding  # Optional dense index of the same questions (lsa_index.DenseIndex)
+
+    def replace(self, **changes):
+        """A new snapshot with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return ModelSnapshot(**fields)
+
+    def vectorize(self, text):
+        """TF-IDF row (1 x n_features sparse matrix) of already cleaned text"""
+        return self.vectorizer.transform([text])
+
+    def find_similar_question(self, user_input):
+        """Find semantically similar questions using cosine similarity"""
+        if not self.training_data or not self.vectorizer_fitted or self.question_matrix is None:
+            return None
+
+        try:
+            return self.match_questions(self.vectorizer.transform([user_input]))[0]
+        except Exception as e:
+            print(f"Similarity check error: {e}")
+        return None
+
+    def match_questions(self, input_vectors):
+        """Answer of the most similar stored question for each input row, or None below the threshold"""
+        answers = [None] * input_vectors.shape[0]
+        if not self.training_data or self.question_matrix is None:
+            return answers
+
+        if self.retriever is not None:
+            for row in range(input_vectors.shape[0]):
+                match = self.retriever.best_match(input_vectors[row], self.similarity_threshold)
+                if match is not None:
+                    answers[row] = self.training_data[match[0]][1]
+            return answers
+
+        # Rows are unit length, so one sparse product gives the cosine scores of
+        # every input against every question (one column per input)
+        input_vectors = input_vectors.astype(self.question_matrix.dtype)
+        similarities = (self.question_matrix @ input_vectors.T).tocsc()
+        similarities.sort_indices()
+        for column in range(similarities.shape[1]):
+            start, end = similarities.indptr[column], similarities.indptr[column + 1]
+            if start == end:
+                continue
+            # First maximum in question order, the same one np.argmax picks on the dense column
+            best = start + int(np.argmax(similarities.data[start:end]))
+            if similarities.data[best] > self.similarity_threshold:
+                answers[column] = self.training_data[int(similarities.indices[best])][1]
+        return answers
+
+    def respond(self, query, trace=None):
+        """
+        Answer a ParsedQuery parsed against this snapshot, using multiple matching
+        strategies; its TF-IDF vector is computed at most once. A
+        metrics.RequestTrace, if given, gets each tier's time and the tier that answered.
+        """
+        user_input = query.normalized
+
+        # 1. Exact match
+        index = self.training_data.find(user_input)
+        if trace is not None:
+            trace.mark("exact")
+        if index is not None:
+            if trace is not None:
+                trace.hit("exact")
+            return self.training_data[index][1]
+
+        # 2. Semantic similarity (only if vectorizer is fitted)
+        if self.vectorizer_fitted:
+            try:
+                X = query.vector
+                if trace is not None:
+                    trace.mark("vectorize")
+                similar_answer = self.match_questions(X)[0]
+                if trace is not None:
+                    trace.mark("similarity")
+                if similar_answer:
+                    if trace is not None:
+                        trace.hit("similarity")
+                    return similar_answer
+            except Exception as e:
+                print(f"Similarity check error: {e}")
+
+        # 3. Dense LSA similarity, for paraphrases that share few terms
+        if self.embedding is not None and self.vectorizer_fitted:
+            try:
+                match = self.embedding.best_matches(query.vector)[0]
+                if trace is not None:
+                    trace.mark("lsa")
+                if match is not None:
+                    if trace is not None:
+                        trace.hit("lsa")
+                    return self.training_data[match[0]][1]
+            except Exception as e:
+                print(f"LSA match error: {e}")
+
+        # 4. ML prediction
+        if len(user_input.split()) >= 3 and self.vectorizer_fitted:
+            try:
+                preds, probas = self.model.predict_with_proba(query.vector)
+                pred, proba = preds[0], probas[0]
+                if trace is not None:
+                    trace.mark("nb")
+                    if proba > PREDICTION_THRESHOLD:
+                        trace.hit("nb")
+                return pred if proba > PREDICTION_THRESHOLD else None
+            except Exception as e:
+                print(f"Prediction error: {e}")
+
+        return None
+
+    def rank(self, query, k=5):
+        """
+        Up to k candidate answers for a ParsedQuery, best first.
+
+        Every tier scores the query, all from one TF-IDF vector and one NB
+        joint log-likelihood. Answers some tier accepts come first in cascade
+        order, so the first candidate is what respond returns when its tier
+        is not None; the rest follow by their best confidence.
+        """
+        candidates = {}
+
+        # 1. Exact match
+        index = self.training_data.find(query.normalized)
+        if index is not None:
+            response = self.training_data[index][1]
+            candidates[response] = Candidate(response, "exact", 1.0)
+
+        if self.vectorizer_fitted:
+            # 2. Cosine scores against every stored question; ties keep question order
+            if self.training_data and self.question_matrix is not None:
+                try:
+                    # A one-column CSR result holds at most one score per row, rows in order
+                    scores = self.question_matrix @ query.vector.astype(self.question_matrix.dtype).T
+                    questions = np.flatnonzero(np.diff(scores.indptr))
+                    for response, similarity in self.top_answers(scores.data, questions, k).items():
+                        candidates.setdefault(response, Candidate(response)).similarity = similarity
+                except Exception as e:
+                    print(f"Similarity check error: {e}")
+
+            # 3. Dense LSA scores against every stored question
+            if self.embedding is not None and self.training_data:
+                try:
+                    scores = self.embedding.scores(self.embedding.projection.project(query.vector))[:, 0]
+                    for response, lsa in self.top_answers(scores, np.arange(len(scores)), k).items():
+                        candidates.setdefault(response, Candidate(response)).lsa = lsa
+                except Exception as e:
+                    print(f"LSA match error: {e}")
+
+            # 4. NB posteriors of the k most likely answers
+            if len(self.model.classes_):
+                try:
+                    jll = self.model.predict_joint_log_proba(query.vector)
+                    log_proba = log_normalize(jll)[0]
+                    for i in top_indices(jll[0], k):
+                        response = self.model.classes_[i]
+                        candidate = candidates.setdefault(response, Candidate(response))
+                        candidate.probability = float(np.exp(log_proba[i]))
+                except Exception as e:
+                    print(f"Prediction error: {e}")
+
+        predicts = len(query.normalized.split()) >= 3
+        for candidate in candidates.values():
+            if candidate.tier is not None:
+                continue
+            if candidate.similarity is not None and candidate.similarity > self.similarity_threshold:
+                candidate.tier, candidate.score = "similarity", candidate.similarity
+            elif candidate.lsa is not None and candidate.lsa > self.embedding.projection.threshold:
+                candidate.tier, candidate.score = "lsa", candidate.lsa
+            elif predicts and candidate.probability is not None and candidate.probability > PREDICTION_THRESHOLD:
+                candidate.tier, candidate.score = "nb", candidate.probability
+            else:
+                candidate.score = max(candidate.similarity or 0.0, candidate.lsa or 0.0, candidate.probability or 0.0)
+        ranked = sorted(candidates.values(), key=lambda c: (TIER_ORDER[c.tier], -c.score))
+        return ranked[:k]
+
+    def top_answers(self, scores, questions, k):
+        """Best score of each of the k best answers, given scores of the stored questions numbered in questions"""
+        order = top_indices(scores, k)
+        while True:
+            best = {}
+            for position in order:
+                response = self.training_data[int(questions[position])][1]
+                best.setdefault(response, float(scores[position]))
+                if len(best) == k:
+                    break
+            # Questions can share an answer, so look further until k answers are found
+            if len(best) == k or len(order) == len(questions):
+                return best
+            order = top_indices(scores, 4 * len(order))
+
+    def get_responses(self, user_inputs):
+        """Batch form of respond for raw texts; gives the same answer for every input"""
+        cleaned = [normalize_text(text) for text in user_inputs]
+        responses = [None] * len(cleaned)
+
+        # 1. Exact match
+        pending = []
+        for i, text in enumerate(cleaned):
+            index = self.training_data.find(text)
+            if index is not None:
+                responses[i] = self.training_data[index][1]
+            else:
+                pending.append(i)
+
+        if not pending or not self.vectorizer_fitted:
+            return responses
+
+        # One transform for the whole batch, shared by both remaining strategies
+        try:
+            X = self.vectorizer.transform([cleaned[i] for i in pending])
+        except Exception as e:
+            print(f"Prediction error: {e}")
+            return responses
+
+        # 2. Semantic similarity
+        try:
+            similar = self.match_questions(X)
+        except Exception as e:
+            print(f"Similarity check error: {e}")
+            similar = [None] * len(pending)
+
+        # 3. Dense LSA similarity, one matrix product for the rows still open
+        if self.embedding is not None:
+            open_rows = [row for row, similar_answer in enumerate(similar) if not similar_answer]
+            if open_rows:
+                try:
+                    for row, match in zip(open_rows, self.embedding.best_matches(X[open_rows])):
+                        if match is not None:
+                            similar[row] = self.training_data[match[0]][1]
+                except Exception as e:
+                    print(f"LSA match error: {e}")
+
+        # 4. ML prediction for the rest, one joint log-likelihood for all rows
+        rows = []
+        for row, (i, similar_answer) in enumerate(zip(pending, similar)):
+            if similar_answer:
+                responses[i] = similar_answer
+            elif len(cleaned[i].split()) >= 3:
+                rows.append(row)
+        if rows:
+            try:
+                preds, probas = self.model.predict_with_proba(X[rows])
+                for row, pred, proba in zip(rows, preds, probas):
+                    responses[pending[row]] = pred if proba > PREDICTION_THRESHOLD else None
+            except Exception as e:
+                print(f"Prediction error: {e}")
+
+        return responses
+
+
+class MLModel:
+    def __init__(self, training_data=None, model_filename="chatbot_model.cbm", incremental=None,
+                 snapshot_delay=2.0, journal_fsync=False, retrieval=None, lsa=None):
+        # Learn new pairs with partial_fit instead of a full refit. None takes
+        # the mode a saved model was trained in (refit for a new model); a saved
+        # model always keeps its own mode
+        self.incremental = incremental
+        # Optional candidate index for the similarity tier: called as
+        # retrieval(question_matrix, previous_index), e.g. retrieval.InvertedIndex.build
+        self.retrieval = retrieval
+        # Optional dense tier: lsa(question_matrix, previous_index) builds a
+        # lsa_index.DenseIndex, e.g. partial(DenseIndex.build, projection=...)
+        self.lsa = lsa
+        self.model_filename = model_filename
+
+        # Everything queries read lives in one immutable ModelSnapshot; learners
+        # (serialized by self.lock) build the next one and swap it in
+        self.snapshot = ModelSnapshot()
+
+        # Learned pairs go to an append-only journal; full snapshots are written
+        # to disk in the background and include every journal record up to journal_seq
+        self.lock = threading.RLock()
+        self.save_lock = threading.Lock()
+        self.artifact_name = None  # Data file of the artifact last loaded or written here
+        self.journal_seq = 0
+        self.journal = ModelJournal(f"{model_filename}.journal", fsync=journal_fsync)
+        self.snapshots = SnapshotWriter(self.save_model, delay=snapshot_delay)
+
+        legacy_filename = os.path.splitext(model_filename)[0] + ".pkl"
+        if os.path.exists(model_filename):
+            self.load_model()
+        elif legacy_filename != model_filename and os.path.exists(legacy_filename):
+            # Migrate a pickled model to the artifact format
+            self.load_legacy_model(legacy_filename)
+            self.snapshots.schedule()
+        else:
+            self.incremental = bool(incremental)
+            if training_data:
+                self.initial_train(training_data)
+        self.replay_journal()
+
+    # Read-only views of the current snapshot
+    training_data = property(lambda self: self.snapshot.training_data)
+    vectorizer = property(lambda self: self.snapshot.vectorizer)
+    model = property(lambda self: self.snapshot.model)
+    question_matrix = property(lambda self: self.snapshot.question_matrix)
+    vectorizer_fitted = property(lambda self: self.snapshot.vectorizer_fitted)
+    version = property(lambda self: self.snapshot.version)
+    similarity_threshold = property(lambda self: self.snapshot.similarity_threshold)
+
+    def new_vectorizer(self):
+        """Create an unfitted featurizer for the configured learning mode"""
+        # sklearn is only needed to fit a new vocabulary, so import it on demand
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        if self.incremental:
+            return GrowingTfidfVectorizer(
+                lowercase=True,
+                strip_accents='unicode',
+                stop_words='english',
+                ngram_range=(1, 2)
+            )
+        return TfidfVectorizer(
+            lowercase=True,
+            strip_accents='unicode',
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+
+    def new_classifier(self):
+        """Create an unfitted classifier (sparse multinomial NB, see online_learning)"""
+        return IncrementalNB()
+
+    def clean_text(self, text):
+        """Normalize text for consistent matching"""
+        return normalize_text(text)
+
+    def initial_train(self, data):
+        """Initial training with complete dataset"""
+        training_data = PairTable.from_pairs([(self.clean_text(q), a) for q, a in data])
+        questions = [q for q, _ in training_data]
+        responses = [r for _, r in training_data]
+
+        # Fit the vectorizer and model
+        vectorizer = self.new_vectorizer()
+        model = self.new_classifier()
+        question_counts = None
+        if self.incremental:
+            question_counts = vectorizer.partial_fit(questions)
+            X = vectorizer.weight(question_counts)
+        else:
+            X = vectorizer.fit_transform(questions)
+        model.fit(X, responses)
+        question_matrix = question_rows(X)
+        indexes = self.indexes(question_matrix)
+        with self.lock:
+            self.snapshot = self.snapshot.replace(
+                training_data=training_data,
+                vectorizer=vectorizer,
+                model=model,
+                question_matrix=question_matrix,
+                question_counts=question_counts,
+                reweighted_at=len(questions) if self.incremental else 0,
+                vectorizer_fitted=True,
+                **indexes
+            )
+        self.snapshots.schedule()
+
+    def indexes(self, question_matrix, previous=None):
+        """
+        The optional indexes of a question matrix, as ModelSnapshot fields.
+        previous is the snapshot whose matrix this one extends by appending
+        rows, so the indexes can be extended rather than rebuilt.
+        """
+        retriever = embedding = None
+        if question_matrix is not None and self.retrieval is not None:
+            retriever = self.retrieval(question_matrix, previous.retriever if previous is not None else None)
+        if question_matrix is not None and self.lsa is not None:
+            embedding = self.lsa(question_matrix, previous.embedding if previous is not None else None)
+        return {"retriever": retriever, "embedding": embedding}
+
+    def index_questions(self, training_data, vectorizer):
+        """Vectorize every stored question once; returns (question_matrix, question_counts, reweighted_at)"""
+        if not training_data:
+            return None, None, 0
+        questions = [q for q, _ in training_data]
+        if self.incremental:
+            counts = vectorizer.count(questions)
+            return question_rows(vectorizer.weight(counts)), counts, len(questions)
+        return question_rows(vectorizer.transform(questions)), None, 0
+
+    def learn_pairs(self, pairs):
+        """Add already cleaned and checked pairs in one step, publishing a new snapshot (call with self.lock)"""
+        if not pairs:
+            return
+        current = self.snapshot
+        questions = [q for q, _ in pairs]
+        responses = [r for _, r in pairs]
+        training_data = current.training_data.extended(pairs)
+        question_counts = current.question_counts
+        reweighted_at = current.reweighted_at
+
+        if self.incremental:
+            # Grow copies of the vocabulary and NB counts without touching the
+            # corpus; stored rows are appended in place (see append_rows)
+            vectorizer = current.vectorizer.copy() if current.vectorizer is not None else self.new_vectorizer()
+            counts = vectorizer.partial_fit(questions)
+            rows = vectorizer.weight(counts)
+            model = current.model.copy()
+            model.partial_fit(rows, responses)
+            question_counts = append_rows(question_counts, counts)
+
+            # Stored rows keep the IDF they were added with, so re-weight them from
+            # the raw counts each time the corpus doubles (amortized O(1) per pair)
+            if current.question_matrix is None or vectorizer.n_documents >= 2 * reweighted_at:
+                question_matrix = question_rows(vectorizer.weight(question_counts))
+                reweighted_at = vectorizer.n_documents
+                indexes = self.indexes(question_matrix)
+            else:
+                question_matrix = append_question_rows(current.question_matrix, rows)
+                indexes = self.indexes(question_matrix, current)
+        elif not current.vectorizer_fitted:
+            # Nothing reads an unfitted vectorizer, so it can be fitted in place
+            vectorizer = current.vectorizer if current.vectorizer is not None else self.new_vectorizer()
+            X = vectorizer.fit_transform([q for q, _ in training_data])
+            question_matrix = question_rows(X)
+            model = IncrementalNB(alpha=current.model.alpha)
+            model.fit(X, [r for _, r in training_data])
+            indexes = self.indexes(question_matrix)
+        else:
+            vectorizer = current.vectorizer  # Fixed vocabulary; never modified after fitting
+            question_matrix = append_question_rows(current.question_matrix, vectorizer.transform(questions))
+            model = IncrementalNB(alpha=current.model.alpha)
+            model.fit(question_matrix, [r for _, r in training_data])
+            indexes = self.indexes(question_matrix, current)
+
+        self.snapshot = ModelSnapshot(
+            training_data=training_data,
+            vectorizer=vectorizer,
+            model=model,
+            question_matrix=question_matrix,
+            question_counts=question_counts,
+            reweighted_at=reweighted_at,
+            vectorizer_fitted=True,
+            version=current.version + 1,
+            similarity_threshold=current.similarity_threshold,
+            **indexes
+        )
+
+    def replay_journal(self):
+        """Apply pairs learned after the last snapshot was written"""
+        self.journal.advance(self.journal_seq)
+        pairs = [(q, r) for _, q, r in self.journal.entries(after=self.journal_seq)]
+        if pairs:
+            with self.lock:
+                self.learn_pairs(pairs)
+            self.snapshots.schedule()
+
+    def find_similar_question(self, user_input):
+        """Find semantically similar questions using cosine similarity"""
+        return self.snapshot.find_similar_question(user_input)
+
+    def match_questions(self, input_vectors):
+        """Answer of the most similar stored question for each input row, or None below the threshold"""
+        return self.snapshot.match_questions(input_vectors)
+
+    def learning_rows(self, snapshot, questions):
+        """
+        TF-IDF rows of questions about to be learned, in the vocabulary learning
+        them gives: in incremental mode their new words count too, so a question
+        that only adds words to a stored one is not mistaken for it
+        """
+        if self.incremental:
+            return snapshot.vectorizer.learning_rows(questions)
+        return snapshot.vectorizer.transform(questions)
+
+    def update_model(self, question, response):
+        """Add new training example with semantic checking"""
+        question = self.clean_text(question)
+        response = response.strip()
+
+        if not question or not response:
+            return False
+
+        with self.lock:
+            # Check if the same or a similar question exists
+            current = self.snapshot
+            if current.training_data.find(question) is not None:
+                return True
+            if current.training_data and current.vectorizer_fitted and current.question_matrix is not None:
+                vector = self.learning_rows(current, [question])
+                if current.match_questions(vector[:, :current.question_matrix.shape[1]])[0]:
+                    return True
+
+            # Add new pair, then journal it; the snapshot is written later
+            self.learn_pairs([(question, response)])
+            self.journal.append(question, response)
+        self.snapshots.schedule()
+        return True
+
+    def update_many(self, pairs, chunk_size=256, conflicts=None, save=True):
+        """
+        Learn many pairs with one training step and one snapshot.
+
+        Keeps the pairs update_model would keep if they were learned one at a
+        time: a question similar to a stored one, or to an earlier new one that
+        was kept, is skipped. Questions are compared in the model's vocabulary
+        from before the batch (in incremental mode grown by the whole batch at
+        once, so a few answers can differ from one-at-a-time learning). Both
+        checks go through an inverted index (see dedup), so large batches cost
+        about linear time. conflicts, if a list, receives a
+        dedup.DuplicateCluster for each group of near-identical new questions
+        with different answers. The pairs are not journaled; the snapshot
+        written at the end makes them durable (with save=False the caller
+        writes it, e.g. after several batches). Returns the number of pairs added.
+        """
+        with self.lock:
+            current = self.snapshot
+            new = []
+            seen = set()
+            for question, response in pairs:
+                question = self.clean_text(question)
+                response = response.strip()
+                if not question or not response or question in seen:
+                    continue
+                seen.add(question)
+                if current.training_data.find(question) is None:
+                    new.append((question, response))
+
+            questions = [q for q, _ in new]
+            known = np.zeros(len(new), dtype=bool)
+            earlier = later = np.zeros(0, dtype=np.int64)
+            try:
+                if new and current.vectorizer_fitted and current.training_data:
+                    X = self.learning_rows(current, questions)
+                    index = current.retriever
+                    if not isinstance(index, InvertedIndex):
+                        index = InvertedIndex.build(current.question_matrix)
+                    inputs, _, _ = index.all_matches(X[:, :current.question_matrix.shape[1]],
+                                                     current.similarity_threshold, chunk_size)
+                    known[inputs] = True
+                elif len(new) > 1:
+                    X = self.new_vectorizer().fit_transform(questions)
+                if len(new) > 1:
+                    earlier, later, _ = similar_rows(X, current.similarity_threshold, chunk_size)
+            except ValueError as e:
+                # e.g. a first batch of nothing but stop words: no two questions can be compared
+                print(f"Similarity check error: {e}")
+            if conflicts is not None:
+                conflicts.extend(cluster for cluster in clusters(new, earlier, later) if cluster.conflicting)
+            kept = first_of_each(len(new), earlier, later, known)
+            new = [pair for pair, keep in zip(new, kept) if keep]
+
+            self.learn_pairs(new)
+        if new and save:
+            self.save_model()
+        return len(new)
+
+    def parse(self, user_input, nlp_processor=None):
+        """ParsedQuery pinned to the current snapshot, so every tier of one query sees the same model"""
+        return ParsedQuery(user_input, nlp_processor, self.snapshot)
+
+    def pinned(self, query):
+        """The query itself if it was parsed against a snapshot, else a copy parsed against the current one"""
+        if isinstance(query.ml_model, ModelSnapshot):
+            return query
+        return self.parse(query.text, query.nlp_processor)
+
+    def vectorize(self, text):
+        """TF-IDF row (1 x n_features sparse matrix) of already cleaned text"""
+        return self.snapshot.vectorize(text)
+
+    def get_response(self, user_input):
+        """Get response using multiple matching strategies"""
+        return self.respond(self.parse(user_input))
+
+    def respond(self, query, trace=None):
+        """get_response for a ParsedQuery, answered by the snapshot it was parsed against"""
+        query = self.pinned(query)
+        return query.ml_model.respond(query, trace)
+
+    def rank(self, query, k=5):
+        """Ranked Candidates for a ParsedQuery, with the score of every tier (see ModelSnapshot.rank)"""
+        query = self.pinned(query)
+        return query.ml_model.rank(query, k)
+
+    def get_responses(self, user_inputs):
+        """Batch form of get_response; gives the same answer for every input"""
+        return self.snapshot.get_responses(user_inputs)
+
+    def save_model(self):
+        """Write a model artifact atomically and compact the journal"""
+        with self.save_lock:
+            # The snapshot and journal position are taken together; the slow
+            # packing and writing then runs without blocking learners
+            with self.lock:
+                snapshot = self.snapshot
+                journal_seq = self.journal.last_seq
+            # Fold the classifier's correction rows in here, off the learning path
+            merged = snapshot.replace(model=snapshot.model.merged())
+            arrays, meta = self.model_state(merged, journal_seq)
+            write_artifact(self.model_filename, arrays, meta)
+            self.artifact_name = artifact_file(self.model_filename)
+            self.journal_seq = journal_seq
+            self.journal.compact(journal_seq)
+            with self.lock:
+                if self.snapshot is snapshot:
+                    self.snapshot = merged  # Same answers, so the version stays
+
+    def model_state(self, snapshot, journal_seq):
+        """Collect the arrays and metadata stored in a model artifact"""
+        arrays, interned = snapshot.training_data.to_arrays()
+        meta = {
+            'incremental': self.incremental,
+            'fitted': snapshot.vectorizer_fitted,
+            'journal_seq': journal_seq
+        }
+        if not snapshot.vectorizer_fitted:
+            return arrays, meta
+
+        vectorizer = snapshot.vectorizer
+        vocabulary = vectorizer.vocabulary_
+        terms = sorted(vocabulary, key=vocabulary.get)
+        arrays['vocabulary_blob'], arrays['vocabulary_offsets'] = pack_strings(terms)
+        arrays['idf'] = np.asarray(vectorizer.idf_, dtype=np.float64)
+        meta['analyzer'] = self.analyzer_config(vectorizer)
+        arrays.update(csr_arrays('question_matrix', snapshot.question_matrix))
+        meta['question_matrix_shape'] = list(snapshot.question_matrix.shape)
+        if self.incremental:
+            arrays['document_frequency'] = vectorizer.document_frequency
+            arrays.update(csr_arrays('question_counts', snapshot.question_counts))
+            meta['question_counts_shape'] = list(snapshot.question_counts.shape)
+            meta['n_documents'] = vectorizer.n_documents
+            meta['reweighted_at'] = snapshot.reweighted_at
+
+        # Naive Bayes in factored form: float32 log-ratios plus per-class totals
+        model = snapshot.model
+        log_ratio, class_total = model.compiled()
+        arrays.update(csr_arrays('nb_log_ratio', log_ratio))
+        arrays['nb_classes'] = np.array([interned[c] for c in model.classes_], dtype=np.int32)
+        arrays['nb_class_count'] = model.class_count_
+        arrays['nb_class_total'] = class_total
+        meta['nb_shape'] = list(log_ratio.shape)
+        meta['nb_n_features'] = model.n_features_in_
+        meta['nb_alpha'] = model.alpha
+        return arrays, meta
+
+    def analyzer_config(self, vectorizer):
+        """Settings of a fitted vectorizer's analyzer, stored so loading needs no sklearn"""
+        analyzer = getattr(vectorizer, 'analyzer', None)
+        if isinstance(analyzer, TextAnalyzer):
+            return analyzer.config()
+        return TextAnalyzer(
+            lowercase=vectorizer.lowercase,
+            strip_accents=vectorizer.strip_accents,
+            stop_words=vectorizer.get_stop_words(),
+            ngram_range=vectorizer.ngram_range,
+            token_pattern=vectorizer.token_pattern
+        ).config()
+
+    def load_model(self, previous=None):
+        """
+        Map a model artifact; arrays stay in the shared page cache. previous,
+        if given, is a snapshot whose question rows the artifact's may extend
+        (checked), so its indexes are extended rather than rebuilt.
+        """
+        if not is_artifact(self.model_filename):
+            self.load_legacy_model(self.model_filename)
+            self.snapshots.schedule()
+            return
+
+        self.artifact_name = artifact_file(self.model_filename)  # Before reading, so a newer one is not missed
+        arrays, meta = read_artifact(self.model_filename)
+        training_data = PairTable.from_arrays(arrays)
+        self.journal_seq = meta['journal_seq']
+
+        # The stored features only fit the mode they were trained in; switching
+        # would mean retraining and overwriting the file, so keep that mode
+        if self.incremental is not None and meta['incremental'] != self.incremental:
+            mode = "incremental" if meta['incremental'] else "refit"
+            print(f"{self.model_filename} was trained in {mode} mode; learning in that mode")
+        self.incremental = meta['incremental']
+        if not meta['fitted']:
+            self.snapshot = self.snapshot.replace(training_data=training_data)
+            return
+
+        terms = StringTable(arrays['vocabulary_blob'], arrays['vocabulary_offsets'])
+        vocabulary = {term: i for i, term in enumerate(terms)}
+        analyzer = TextAnalyzer(**meta['analyzer']) if 'analyzer' in meta else TextAnalyzer()
+        question_counts = None
+        reweighted_at = 0
+        if self.incremental:
+            vectorizer = GrowingTfidfVectorizer(analyzer=analyzer).restore(
+                vocabulary, arrays['document_frequency'], meta['n_documents']
+            )
+            question_counts = csr_from_arrays('question_counts', arrays, meta['question_counts_shape'])
+            reweighted_at = meta['reweighted_at']
+        else:
+            vectorizer = FrozenTfidfVectorizer(analyzer, vocabulary, arrays['idf'])
+
+        model = IncrementalNB.from_compiled(
+            classes=StringView(training_data.responses, arrays['nb_classes']),
+            class_count=arrays['nb_class_count'],
+            class_total=arrays['nb_class_total'],
+            log_ratio=csr_from_arrays('nb_log_ratio', arrays, meta['nb_shape']),
+            n_features=meta['nb_n_features'],
+            alpha=meta['nb_alpha']
+        )
+        question_matrix = csr_from_arrays('question_matrix', arrays, meta['question_matrix_shape'])
+        if previous is not None and not extends_rows(previous.question_matrix, question_matrix):
+            previous = None
+        self.snapshot = self.snapshot.replace(
+            training_data=training_data,
+            vectorizer=vectorizer,
+            model=model,
+            question_matrix=question_matrix,
+            question_counts=question_counts,
+            reweighted_at=reweighted_at,
+            vectorizer_fitted=True,
+            **self.indexes(question_matrix, previous)
+        )
+
+    def reload_model(self):
+        """
+        Map the artifact again if another process wrote a newer version since
+        it was loaded or saved here (e.g. a prefork worker picking up what the
+        parent learned). The version is bumped, so answers cached for the old
+        model are not served. Returns whether the model changed.
+        """
+        try:
+            if artifact_file(self.model_filename) == self.artifact_name:
+                return False
+        except FileNotFoundError:
+            return False
+        with self.lock:
+            current = self.snapshot
+            self.load_model(previous=current)
+            self.snapshot = self.snapshot.replace(version=current.version + 1)
+        return True
+
+    def load_legacy_model(self, filename):
+        """Load a model pickled by earlier versions (vocabulary, MultinomialNB and pairs)"""
+        with open(filename, "rb") as f:
+            data = pickle.load(f)
+
+        pairs = data['training_data']
+        if self.incremental is None:
+            self.incremental = data.get('incremental', False)
+        if data.get('incremental', False) or self.incremental:
+            self.initial_train(pairs)
+            return
+
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(
+            vocabulary=data['vocabulary'],
+            lowercase=True,
+            strip_accents='unicode',
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        training_data = PairTable.from_pairs(pairs)
+        fitted = data.get('fitted', False)
+
+        # Only the vocabulary is stored, so recover the IDF weights from the
+        # stored questions before building the question index
+        question_matrix = None
+        if fitted and training_data:
+            vectorizer.fit([q for q, _ in training_data])
+            question_matrix = self.index_questions(training_data, vectorizer)[0]
+        self.snapshot = self.snapshot.replace(
+            training_data=training_data,
+            vectorizer=vectorizer,
+            model=IncrementalNB.from_multinomial(data['model']),
+            question_matrix=question_matrix,
+            vectorizer_fitted=fitted,
+            **self.indexes(question_matrix)
+        )
+
+    def close(self):
+        """Write any pending snapshot and release the journal"""
+        self.snapshots.close()
+        self.journal.close()
+
+
+def question_rows(X):
+    """Question vectors as an L2-normalized float32 CSR matrix for scoring"""
+    return l2_normalize(sp.csr_matrix(X, dtype=np.float32))
+
+
+def append_question_rows(question_matrix, rows):
+    """A new index with the vectors of newly learned questions appended"""
+    return append_rows(question_matrix, question_rows(rows))
+
+
+def extends_rows(matrix, extended):
+    """
+    Whether a CSR matrix starts with the rows of another, which may have fewer
+    columns. Entries may be in another order within a row (scipy sorts them in
+    place), so the rows are compared as matrices.
+    """
+    if matrix is None or extended is None or extended.shape[0] < matrix.shape[0]:
+        return False
+    head = extended[:matrix.shape[0]]
+    if not np.array_equal(matrix.indptr, head.indptr):
+        return False
+    return (head[:, :matrix.shape[1]] != matrix).nnz == 0
+
+
+def top_indices(values, k):
+    """Indices of the k largest values, largest first and ties in index order (a prefix of a stable argsort)"""
+    if k < len(values):
+        cutoff = np.partition(values, len(values) - k)[len(values) - k]
+        selected = np.flatnonzero(values >= cutoff)
+    else:
+        selected = np.arange(len(values))
+    return selected[np.argsort(-values[selected], kind='stable')][:k]
+
+
+# Example training data (list of (question, response) tuples)
+training_data = [
+    ("hi", "Hello! How can I help you?"),
+    ("hello", "Hi there! How can I assist you today?"),
+    ("what courses are available", "We offer a variety of programs in IT, Business, and Arts."),
+    ("what programs do you offer", "We offer programs in IT, Business, Arts, and Sciences."),
+    ("how to apply", "You can apply through our website under the admissions section."),
+    ("where can I apply", "You can apply via our online portal. Visit the admissions page."),
+    ("what are the admission requirements", "You need to have a high school diploma and a good academic record."),
+    ("what is the fee for the course",
+     "The fee depends on the program. Please check the course details for more information."),
+    ("how long does the course take", "Most courses are 3 to 4 years long, depending on the program."),
+    ("what is the deadline for applications",
+     "The application deadline is typically in June. Please refer to the admissions page for exact dates."),
+    ("can I apply online", "Yes, applications are fully online through our website."),
+    ("is there an entrance exam", "Some programs may require an entrance exam. Please check the program details."),
+    (
+    "how do I contact support", "You can contact support via email at support@example.com or by calling our helpline."),
+    ("what is the program schedule", "The program schedule is flexible, with both part-time and full-time options."),
+    ("can I get a scholarship",
+     "Yes, scholarships are available based on merit. Please visit the scholarships page for more details."),
+    ("do you offer online courses", "Yes, we offer a range of online courses. Visit our website for more information."),
+    ("how can I get my transcript", "You can request your transcript through the student portal."),
+    ("is there a student discount",
+     "Yes, there are discounts available for students. You can check for discounts on the fee page."),
+    ("what is the job placement rate",
+     "Our job placement rate is very high, with many students securing jobs within six months of graduation."),
+    ("can I defer my admission",
+     "Yes, deferring your admission is possible. Please contact the admissions office for details."),
+    ("do you offer internships",
+     "Yes, we offer internships as part of our programs. Check the internship page for more details."),
+    ("where are you located", "Our campus is located in the city center at 123 Main Street."),
+    ("can I visit the campus", "Yes, we offer campus tours. Please contact the admissions office to schedule a visit."),
+    ("is there a student club", "Yes, we have several student clubs ranging from academic to recreational interests."),
+    ("can I change my major",
+     "Yes, changing your major is possible within the first year. Speak with an academic advisor for guidance."),
+    ("do you offer evening classes",
+     "Yes, we offer evening classes for most programs. Please refer to the course schedule for availability."),
+    ("are there work-study opportunities", "Yes, we offer work-study programs for eligible students."),
+    ("how do I withdraw from a course",
+     "To withdraw from a course, please visit the student portal or contact your academic advisor."),
+    ("what is the grading system", "Our grading system is based on a 4.0 scale. An A is worth 4 points."),
+    ("is there a deadline for dropping a course",
+     "Yes, there is a deadline for course drops. Please refer to the academic calendar for dates."),
+    (
+    "how do I apply for a scholarship", "You can apply for a scholarship through the scholarship page on our website."),
+    ("is there a fee for applying", "No, there is no application fee for most programs."),
+    ("what is the admission process",
+     "The admission process includes submitting an online application, academic transcripts, and meeting program requirements."),
+    ("when will I receive my admission decision",
+     "Admission decisions are typically made within 6-8 weeks after the application deadline."),
+    ("can I apply for multiple programs",
+     "Yes, you can apply for multiple programs, but each program has its own requirements."),
+    ("is there an alumni network",
+     "Yes, we have an alumni network that provides career support and networking opportunities."),
+    ("do you offer part-time programs", "Yes, we offer part-time programs for working professionals."),
+    ("how can I get a student ID",
+     "You will receive a student ID during your orientation session after you're admitted."),
+    ("where can I find course catalogs", "You can find course catalogs on the programs page on our website."),
+    ("can I change my class schedule", "Yes, schedule changes are possible within the first week of classes."),
+    ("do you offer a counseling service",
+     "Yes, we provide student counseling services for academic and personal support."),
+    ("is there a dress code", "There is no strict dress code, but we ask students to dress appropriately for class."),
+    ("what is the campus environment like",
+     "Our campus is very inclusive, with a vibrant student life and beautiful green spaces."),
+    ("can I get a part-time job while studying",
+     "Yes, many students work part-time while studying. Check with the career services office for opportunities."),
+    ("how can I request a letter of recommendation",
+     "You can request a letter of recommendation from your professors or academic advisors."),
+    ("do you offer career counseling", "Yes, our career services offer counseling and job placement assistance."),
+    ("is the campus accessible for disabled students",
+     "Yes, our campus is fully accessible with ramps, elevators, and other facilities for disabled students."),
+    ("do you offer language courses", "Yes, we offer language courses including English, Spanish, and French."),
+    ("how do I check my grades", "You can check your grades on the student portal."),
+    ("how do I reset my password",
+     "You can reset your password by clicking the 'Forgot Password' link on the login page."),
+]
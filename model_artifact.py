@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import re
+import struct
+import scipy.sparse as sp
+import numpy as np
+
+MAGIC = b"CBMODEL\0"
+POINTER_MAGIC = b"CBMLINK\0"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+def is_artifact(path):
+    """Check whether a file is in the model artifact format (as opposed to a legacy pickle)"""
+    with open(artifact_file(path), "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def artifact_file(path):
+    """The file holding an artifact's data: the version named by a pointer file at path, or path itself"""
+    with open(path, "rb") as f:
+        if f.read(len(POINTER_MAGIC)) != POINTER_MAGIC:
+            return path
+        name = f.read().decode("utf-8")
+    return os.path.join(os.path.dirname(path), name)
+
+
+def artifact_versions(path):
+    """(number, filename) of every versioned data file written for path"""
+    directory, base = os.path.split(os.path.abspath(path))
+    pattern = re.compile(re.escape(base) + r"\.(\d+)$")
+    versions = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            versions.append((int(match.group(1)), os.path.join(os.path.dirname(path), name)))
+    return sorted(versions)
+
+
+def remove_artifact(path):
+    """Delete an artifact with all its data files"""
+    for filename in [path] + [filename for _, filename in artifact_versions(path)]:
+        if os.path.exists(filename):
+            os.remove(filename)
+
+
+def _aligned(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_artifact(path, arrays, meta):
+    """
+    Write named numpy arrays and a JSON-able meta dict to a single file.
+
+    Layout: magic, format version, header length, JSON header, then every array
+    as raw little-endian data aligned to 64 bytes. The data goes to a new
+    versioned file (path.1, path.2, ...) and path becomes a small pointer file
+    naming it, replaced atomically, so readers never observe a partial file.
+    The old data file is never overwritten or renamed while it may still be
+    memory-mapped (which Windows refuses); it is deleted once that succeeds.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    entries = {}
+    for name, array in arrays.items():
+        entries[name] = {
+            "dtype": array.dtype.newbyteorder("<").str,
+            "shape": list(array.shape),
+            "nbytes": int(array.nbytes)
+        }
+
+    # Offsets depend on the header size, so settle the header first
+    prefix = len(MAGIC) + 8
+    header = {"format_version": FORMAT_VERSION, "meta": meta, "arrays": entries}
+    while True:
+        header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+        offset = _aligned(prefix + len(header_bytes))
+        changed = False
+        for name in arrays:
+            if entries[name].get("offset") != offset:
+                entries[name]["offset"] = offset
+                changed = True
+            offset = _aligned(offset + entries[name]["nbytes"])
+        if not changed:
+            break
+
+    versions = artifact_versions(path)
+    target = f"{path}.{versions[-1][0] + 1 if versions else 1}"
+    with open(target, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<II", FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.write(b"\0" * (entries[name]["offset"] - f.tell()))
+            f.write(array.astype(entries[name]["dtype"], copy=False).tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(POINTER_MAGIC)
+        f.write(os.path.basename(target).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+    # Older versions still mapped by a reader cannot be deleted on Windows; a later write retries
+    for _, filename in versions:
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+
+
+def read_artifact(path):
+    """
+    Map an artifact file read-only.
+
+    Returns (arrays, meta). Arrays are np.memmap views into the file, so every
+    process that loads the same file shares one copy in the page cache.
+    """
+    for attempt in range(3):
+        try:
+            return _read_artifact(artifact_file(path))
+        except FileNotFoundError:
+            # A writer deleted the version the pointer named just before it was opened
+            if attempt == 2 or not os.path.exists(path):
+                raise
+
+
+def _read_artifact(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a model artifact")
+        version, header_length = struct.unpack("<II", f.read(8))
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported model artifact version {version}")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    arrays = {}
+    for name, entry in header["arrays"].items():
+        shape = tuple(entry["shape"])
+        if entry["nbytes"] == 0:
+            arrays[name] = np.zeros(shape, dtype=entry["dtype"])
+        else:
+            arrays[name] = np.memmap(path, dtype=entry["dtype"], mode="r", offset=entry["offset"], shape=shape)
+    return arrays, header["meta"]
+
+
+def pack_strings(strings):
+    """Pack strings into a UTF-8 blob and an offsets array (len(strings) + 1 entries)"""
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return blob, offsets
+
+
+def question_hash(text):
+    """Stable 64-bit hash used for exact question lookup across processes"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class StringTable:
+    """Read-only sequence of strings decoded on access from a packed blob"""
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        return cls(*pack_strings(strings))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class StringView:
+    """Sequence of strings from a StringTable selected by an array of ids"""
+
+    def __init__(self, table, ids):
+        self.table = table
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return self.table[int(self.ids[index])]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class PairTable:
+    """
+    List-like table of (question, response) pairs.
+
+    Pairs loaded from an artifact stay in the shared string tables (responses
+    interned, questions looked up through a sorted hash array); pairs learned
+    afterwards live in an ordinary in-memory list until the next snapshot.
+    Tables made by extended() share that list, which only ever grows, and
+    each sees just the pairs that existed when it was made.
+    """
+
+    def __init__(self, questions=None, responses=None, response_ids=None, question_hashes=None, hash_order=None):
+        self.questions = questions if questions is not None else StringTable.from_strings([])
+        self.responses = responses if responses is not None else StringTable.from_strings([])
+        self.response_ids = response_ids if response_ids is not None else np.zeros(0, dtype=np.int32)
+        self.question_hashes = question_hashes if question_hashes is not None else np.zeros(0, dtype=np.uint64)
+        self.hash_order = hash_order if hash_order is not None else np.zeros(0, dtype=np.int64)
+        self.appended = []
+        self.appended_index = {}
+        self.appended_count = 0
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        table = cls()
+        table.extend(pairs)
+        return table
+
+    def __len__(self):
+        return len(self.questions) + self.appended_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        base = len(self.questions)
+        if index < base:
+            return self.questions[index], self.responses[int(self.response_ids[index])]
+        if index - base >= self.appended_count:
+            raise IndexError("PairTable index out of range")
+        return self.appended[index - base]
+
+    def __iter__(self):
+        for i in range(len(self.questions)):
+            yield self[i]
+        for i in range(self.appended_count):
+            yield self.appended[i]
+
+    def append(self, pair):
+        if self.appended_count != len(self.appended):
+            raise ValueError("Only the newest table sharing these pairs can grow")
+        self.appended_index.setdefault(pair[0], len(self))
+        self.appended.append(pair)
+        self.appended_count += 1
+
+    def extend(self, pairs):
+        for pair in pairs:
+            self.append(pair)
+
+    def extended(self, pairs):
+        """A new table with pairs added; this one is left unchanged and shares the stored pairs"""
+        table = PairTable(self.questions, self.responses, self.response_ids, self.question_hashes, self.hash_order)
+        if self.appended_count == len(self.appended):
+            table.appended = self.appended
+            table.appended_index = self.appended_index
+            table.appended_count = self.appended_count
+        else:
+            # A newer table was made from this one and dropped (e.g. learning failed)
+            table.extend(self.appended[:self.appended_count])
+        table.extend(pairs)
+        return table
+
+    def find(self, question):
+        """Index of the first pair with exactly this question, or None"""
+        if len(self.question_hashes):
+            key = np.uint64(question_hash(question))
+            position = int(np.searchsorted(self.question_hashes, key))
+            while position < len(self.question_hashes) and self.question_hashes[position] == key:
+                index = int(self.hash_order[position])
+                if self.questions[index] == question:
+                    return index
+                position += 1
+        index = self.appended_index.get(question)
+        if index is not None and index >= len(self):
+            return None
+        return index
+
+    def to_arrays(self):
+        """Pack all pairs into the arrays stored in a model artifact"""
+        questions = []
+        response_ids = []
+        interned = {}
+        for question, response in self:
+            questions.append(question)
+            response_ids.append(interned.setdefault(response, len(interned)))
+
+        hashes = np.array([question_hash(q) for q in questions], dtype=np.uint64)
+        order = np.argsort(hashes, kind="stable")
+        questions_blob, questions_offsets = pack_strings(questions)
+        responses_blob, responses_offsets = pack_strings(list(interned))
+        return {
+            "questions_blob": questions_blob,
+            "questions_offsets": questions_offsets,
+            "responses_blob": responses_blob,
+            "responses_offsets": responses_offsets,
+            "response_ids": np.asarray(response_ids, dtype=np.int32),
+            "question_hashes": hashes[order],
+            "question_hash_order": order.astype(np.int64)
+        }, interned
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(
+            questions=StringTable(arrays["questions_blob"], arrays["questions_offsets"]),
+            responses=StringTable(arrays["responses_blob"], arrays["responses_offsets"]),
+            response_ids=arrays["response_ids"],
+            question_hashes=arrays["question_hashes"],
+            hash_order=arrays["question_hash_order"]
+        )
+
+
+def csr_arrays(prefix, matrix):
+    """Split a CSR matrix into artifact arrays, using one index dtype for indices and indptr"""
+    index_dtype = np.int32 if matrix.nnz < 2 ** 31 and matrix.shape[1] < 2 ** 31 else np.int64
+    return {
+        f"{prefix}_data": np.asarray(matrix.data, dtype=np.float32),
+        f"{prefix}_indices": np.asarray(matrix.indices, dtype=index_dtype),
+        f"{prefix}_indptr": np.asarray(matrix.indptr, dtype=index_dtype)
+    }
+
+
+def csr_from_arrays(prefix, arrays, shape):
+    """Rebuild a CSR matrix over artifact arrays without copying them"""
+    return sp.csr_matrix(
+        (arrays[f"{prefix}_data"], arrays[f"{prefix}_indices"], arrays[f"{prefix}_indptr"]),
+        shape=tuple(shape),
+        copy=False
+    )
@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+
+
+class ModelJournal:
+    """
+    Append-only log of learned (question, response) pairs.
+
+    Each record is one JSON line carrying a sequence number. A snapshot of the
+    model remembers the last sequence number it contains, so on startup only
+    the records after it need to be replayed, and compaction can drop the rest.
+    """
+
+    def __init__(self, path, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.last_seq = 0
+        self._file = None
+        for seq, _, _ in self.entries():
+            self.last_seq = max(self.last_seq, seq)
+
+    def entries(self, after=0):
+        """Yield (seq, question, response) for every intact record after the given sequence number"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn line left by a crash mid-append
+                if record['seq'] > after:
+                    yield record['seq'], record['q'], record['r']
+
+    def advance(self, seq):
+        """Make sure new records are numbered after an already-snapshotted sequence number"""
+        with self.lock:
+            self.last_seq = max(self.last_seq, seq)
+
+    def _handle(self):
+        if self._file is None:
+            torn = False
+            if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    torn = f.read(1) != b'\n'
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if torn:
+                # Terminate a torn last line so the next record starts cleanly
+                self._file.write('\n')
+        return self._file
+
+    def append(self, question, response):
+        """Record one learned pair and return its sequence number"""
+        with self.lock:
+            self.last_seq += 1
+            record = json.dumps({'seq': self.last_seq, 'q': question, 'r': response}, ensure_ascii=False)
+            f = self._handle()
+            f.write(record + '\n')
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            return self.last_seq
+
+    def compact(self, upto):
+        """Drop records already contained in a snapshot (sequence number <= upto)"""
+        with self.lock:
+            remaining = list(self.entries(after=upto))
+            self.close_handle()
+            tmp = f"{self.path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                for seq, question, response in remaining:
+                    f.write(json.dumps({'seq': seq, 'q': question, 'r': response}, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    def close_handle(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        with self.lock:
+            self.close_handle()
+
+
+class SnapshotWriter:
+    """
+    Background thread that coalesces snapshot requests.
+
+    A snapshot is written once no new request has arrived for `delay` seconds,
+    or at the latest `max_delay` seconds after the first pending request.
+    """
+
+    def __init__(self, write, delay=2.0, max_delay=30.0):
+        self.write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._pending_since = None
+        self._last_request = None
+        self._closed = False
+        self._thread = None
+
+    def schedule(self):
+        """Ask for a snapshot; returns immediately"""
+        with self._condition:
+            now = time.monotonic()
+            if self._pending_since is None:
+                self._pending_since = now
+            self._last_request = now
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending_since is None and not self._closed:
+                    self._condition.wait()
+                if self._pending_since is None:
+                    return
+
+                # Debounce: wait for a quiet period, bounded by max_delay
+                while not self._closed:
+                    due = min(self._last_request + self.delay, self._pending_since + self.max_delay)
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                self._pending_since = None
+
+            try:
+                self.write()
+            except Exception as e:
+                print(f"Snapshot error: {e}")
+
+    def flush(self):
+        """Write a pending snapshot now, in the calling thread"""
+        with self._condition:
+            pending = self._pending_since is not None
+            self._pending_since = None
+        if pending:
+            self.write()
+
+    def close(self):
+        """Write any pending snapshot and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        self.flush()
@@ -1,63 +1,105 @@
-import nltk
-import re
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer
-
-# Ensure punkt is downloaded
-nltk.download('punkt', quiet=True)
-
-class NLPProcessor:
-    def __init__(self, db_manager=None):
-        self.stemmer = PorterStemmer()
-        self.db_manager = db_manager
-
-    def preprocess(self, text):
-        """Preprocess text by lowercasing, removing punctuation, and stemming"""
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
-        tokens = word_tokenize(text)
-        return [self.stemmer.stem(word) for word in tokens]
-
-    def classify_intent(self, processed_text):
-        """More precise intent classification"""
-        # Check for greeting patterns first
-        greeting_words = ["hi", "hello", "hey", "greet"]
-        if any(word in processed_text for word in greeting_words):
-            return "greeting"
-
-        # Check for "how are you" separately
-        if all(word in processed_text for word in ["how", "are", "you"]):
-            return "how_are_you"
-
-
-
-        # Rest of your intent matching...
-        intent_keywords = {
-            "course_info": ["cours", "program", "subject", "field", "study", "degree"],
-            "admission_info": ["admiss", "appli", "enrol", "register", "apply", "application"],
-            "career_guidance": ["career", "job", "intern", "employ", "work", "placement"],
-            "scholarship_info": ["scholar", "fund", "aid", "grant", "bursari", "scholarship"],
-            "general_info": ["locat", "visit", "contact", "email", "address", "time", "campus"],
-            "greeting": ["hi", "hello", "hey", "greetings"],
-            "goodbye": ["bye", "goodbye", "see you", "later"],
-            "how_are_you": ["how", "are", "you"],
-            "thank_you": ["thank", "thanks"],
-            "sorry": ["sorry", "apologize", "pardon"],
-            "help": ["help", "assist", "support", "need help"],
-            "contact_info": ["contact", "reach", "get in touch", "speak to"],
-            "phone_number": ["phone", "number", "call", "telephone"],
-            "name": ["name", "who are you", "what is your name"]
-        }
-
-        for intent, keywords in intent_keywords.items():
-            if any(keyword in processed_text for keyword in keywords):
-                return intent
-        return "unknown"
-
-    def get_response_from_db(self, intent):
-        """Get response from database or return default if not found"""
-        if self.db_manager:
-            response = self.db_manager.get_response_for_intent(intent)
-            if response:
-                return response
+import re
+from functools import lru_cache
+
+from intent_matcher import IntentMatcher
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+
+# Once punctuation is gone, the only NLTK word_tokenize rules that can still
+# change a whitespace-separated token are these contraction splits (all after
+# the third character); the rest need quotes, periods or other punctuation
+CONTRACTION = re.compile(r'(?i)(can)(not)|(gim)(me)|(gon)(na)|(got)(ta)|(lem)(me)|(wan)(na)')
+
+STEM_CACHE_SIZE = 65536
+
+
+def split_words(text):
+    """Tokenize punctuation-free text exactly like NLTK's word_tokenize(text, preserve_line=True)"""
+    tokens = []
+    for token in text.split():
+        if len(token) in (5, 6) and CONTRACTION.fullmatch(token):
+            tokens.append(token[:3])
+            tokens.append(token[3:])
+        else:
+            tokens.append(token)
+    return tokens
+
+
+class NLPProcessor:
+    def __init__(self, db_manager=None, fast=True, intent_matcher=None):
+        self.db_manager = db_manager
+        self.fast = fast  # Regex tokenizer and memoized stems; same tokens as the NLTK path
+        self.intent_matcher = intent_matcher or IntentMatcher()  # Compiled intent rules
+        self._stemmer = None
+        self._stem = None
+        self._word_tokenize = None
+
+    @property
+    def stemmer(self):
+        """PorterStemmer, created on first use so that importing this module stays cheap"""
+        if self._stemmer is None:
+            from nltk.stem import PorterStemmer
+            self._stemmer = PorterStemmer()
+        return self._stemmer
+
+    def stem(self, word):
+        """Porter stem of a word, memoized in a bounded LRU cache"""
+        if self._stem is None:
+            self._stem = lru_cache(maxsize=STEM_CACHE_SIZE)(self.stemmer.stem)
+        return self._stem(word)
+
+    def tokenize(self, text):
+        """Word-tokenize text that has already had its punctuation removed"""
+        if self.fast:
+            return split_words(text)
+        if self._word_tokenize is None:
+            from nltk.tokenize import word_tokenize
+            self._word_tokenize = word_tokenize
+        # preserve_line skips punkt sentence splitting: without punctuation there is
+        # only one sentence, so no tokenizer resource (or download) is needed
+        return self._word_tokenize(text, preserve_line=True)
+
+    def warm_up(self):
+        """Import NLTK and build the stemmer ahead of the first query"""
+        self.preprocess("warm up")
+
+    def preprocess(self, text):
+        """Preprocess text by lowercasing, removing punctuation, and stemming"""
+        text = text.lower()
+        text = PUNCTUATION.sub('', text)  # Remove punctuation
+        return self.stem_tokens(self.tokenize(text))
+
+    def stem_tokens(self, tokens):
+        """Stem every token (memoized on the fast path)"""
+        if self.fast:
+            return [self.stem(word) for word in tokens]
+        return [self.stemmer.stem(word) for word in tokens]
+
+    def preprocess_many(self, texts):
+        """Preprocess a batch of texts, stemming each distinct word only once"""
+        if self.fast:
+            return [self.preprocess(text) for text in texts]
+
+        stems = {}
+        processed = []
+        for text in texts:
+            text = PUNCTUATION.sub('', text.lower())
+            tokens = self.tokenize(text)
+            for word in tokens:
+                if word not in stems:
+                    stems[word] = self.stemmer.stem(word)
+            processed.append([stems[word] for word in tokens])
+        return processed
+
+    def classify_intent(self, processed_text):
+        """More precise intent classification"""
+        # One pass over the tokens; rules are checked in priority order (see intent_matcher.DEFAULT_RULES)
+        return self.intent_matcher.match(processed_text)
+
+    def get_response_from_db(self, intent):
+        """Get response from database or return default if not found"""
+        if self.db_manager:
+            response = self.db_manager.get_response_for_intent(intent)
+            if response:
+                return response
         return "Sorry, I don't have information on that topic."
\ No newline at end of file
@@ -0,0 +1,714 @@
+import re
+import unicodedata
+from collections.abc import Mapping
+import scipy.sparse as sp
+import numpy as np
+
+# Same default as sklearn's CountVectorizer
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+# IncrementalNB folds its correction rows into the compiled ones once there
+# are more than this many (or a sixteenth of the classes, if that is more)
+MERGE_ROWS = 1024
+
+
+def pad_columns(X, n_columns):
+    """Widen a CSR matrix to n_columns without copying its data"""
+    X = sp.csr_matrix(X)
+    if X.shape[1] >= n_columns:
+        return X
+    return sp.csr_matrix((X.data, X.indices, X.indptr), shape=(X.shape[0], n_columns))
+
+
+def pad_rows(X, n_rows):
+    """Append empty rows to a CSR matrix without copying its data"""
+    X = sp.csr_matrix(X)
+    if X.shape[0] >= n_rows:
+        return X
+    indptr = np.concatenate([X.indptr, np.full(n_rows - X.shape[0], X.indptr[-1], dtype=X.indptr.dtype)])
+    return sp.csr_matrix((X.data, X.indices, indptr), shape=(n_rows, X.shape[1]))
+
+
+def fit_columns(X, n_columns):
+    """Pad or truncate a CSR matrix to n_columns"""
+    X = sp.csr_matrix(X)
+    if X.shape[1] > n_columns:
+        return X[:, :n_columns]
+    return pad_columns(X, n_columns)
+
+
+class RowBuffer:
+    """
+    CSR rows with spare capacity at the end, so rows can be appended in
+    amortized O(new rows) instead of copying the matrix each time.
+
+    append_rows() returns CSR views of a prefix of the buffer. Rows are only
+    ever written past the end of the newest view, so earlier views never
+    change and stay usable by readers, like the pairs of PairTable.extended.
+    Each row can carry an integer label.
+    """
+
+    def __init__(self, dtype, n_rows=16, nnz=64):
+        self.data = np.empty(nnz, dtype=dtype)
+        self.indices = np.empty(nnz, dtype=np.int32)
+        self.indptr = np.zeros(n_rows + 1, dtype=np.int32)
+        self.labels = np.zeros(n_rows, dtype=np.int64)
+        self.rows = 0
+        self.nnz = 0
+        self.width = 0
+
+    def owns(self, matrix):
+        """Whether matrix is the newest view of this buffer, so rows can be written after it"""
+        return getattr(matrix, 'row_buffer', None) is self and matrix.shape[0] == self.rows
+
+    def write(self, rows, labels=None):
+        """Append canonical CSR rows (and their labels)"""
+        n_rows, nnz = rows.shape[0], rows.nnz
+        if self.rows + n_rows >= len(self.labels):
+            size = max(self.rows + n_rows, 2 * len(self.labels))
+            self.indptr = np.concatenate([self.indptr[:self.rows + 1], np.zeros(size - self.rows, np.int32)])
+            self.labels = np.concatenate([self.labels[:self.rows], np.zeros(size - self.rows, np.int64)])
+        if self.nnz + nnz > len(self.data):
+            size = max(self.nnz + nnz, 2 * len(self.data))
+            self.data = np.concatenate([self.data[:self.nnz], np.empty(size - self.nnz, self.data.dtype)])
+            self.indices = np.concatenate([self.indices[:self.nnz], np.empty(size - self.nnz, np.int32)])
+        self.data[self.nnz:self.nnz + nnz] = rows.data
+        self.indices[self.nnz:self.nnz + nnz] = rows.indices
+        self.indptr[self.rows + 1:self.rows + n_rows + 1] = self.nnz + rows.indptr[1:]
+        if labels is not None:
+            self.labels[self.rows:self.rows + n_rows] = labels
+        self.rows += n_rows
+        self.nnz += nnz
+        self.width = max(self.width, rows.shape[1])
+
+    def view(self):
+        matrix = sp.csr_matrix(
+            (self.data[:self.nnz], self.indices[:self.nnz], self.indptr[:self.rows + 1]),
+            shape=(self.rows, self.width), copy=False
+        )
+        matrix.has_canonical_format = True
+        matrix.row_buffer = self
+        return matrix
+
+
+def append_rows(matrix, rows, labels=None):
+    """
+    A CSR matrix (or None) with rows appended, as a view of a RowBuffer.
+
+    Amortized O(new rows) when matrix is the newest view of its buffer, as
+    when each learning step extends the one before; otherwise (e.g. a matrix
+    from an artifact) it is copied once into a new buffer. Labels of the rows
+    of the result are in result.row_buffer.labels[:result.shape[0]].
+    """
+    rows = sp.csr_matrix(rows).sorted_indices()
+    buffer = getattr(matrix, 'row_buffer', None)
+    if matrix is None or buffer is None or not buffer.owns(matrix):
+        dtype = matrix.dtype if matrix is not None else rows.dtype
+        existing = (matrix.shape[0], matrix.nnz) if matrix is not None else (0, 0)
+        buffer = RowBuffer(dtype, 2 * (existing[0] + rows.shape[0]), 2 * (existing[1] + rows.nnz) + 1)
+        if matrix is not None:
+            previous = getattr(matrix, 'row_buffer', None)
+            buffer.write(sp.csr_matrix(matrix).sorted_indices(),
+                         previous.labels[:matrix.shape[0]] if previous is not None else None)
+    buffer.write(sp.csr_matrix(rows, dtype=buffer.data.dtype), labels)
+    return buffer.view()
+
+
+class ListPrefix:
+    """The first n items of a list that only ever grows, so copies can share it"""
+
+    def __init__(self, items, n):
+        self.items = items
+        self.n = n
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if not -self.n <= i < self.n:
+            raise IndexError(i)
+        return self.items[i % self.n]
+
+    def __iter__(self):
+        return iter(self.items[:self.n])
+
+
+class VocabularyView(Mapping):
+    """
+    Read-only term -> column mapping of the first n columns of a vocabulary
+    that only ever grows (a dict plus the list of its terms in column order)
+    """
+
+    def __init__(self, columns, terms, n):
+        self.columns = columns
+        self.terms = terms
+        self.n = n
+
+    def __getitem__(self, term):
+        column = self.columns[term]
+        if column >= self.n:
+            raise KeyError(term)
+        return column
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.terms[:self.n])
+
+
+def l2_normalize(X):
+    """Scale every row of a CSR matrix to unit length (rows of zeros stay zero)"""
+    X = sp.csr_matrix(X, copy=True)
+    norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    X.data /= np.repeat(norms, np.diff(X.indptr)).astype(X.dtype)
+    return X
+
+
+def log_normalize(jll):
+    """Log posteriors from joint log-likelihood rows (a stable log-softmax)"""
+    top = jll.max(axis=1, keepdims=True)
+    return jll - (top + np.log(np.exp(jll - top).sum(axis=1, keepdims=True)))
+
+
+def strip_accents_unicode(text):
+    """Remove accents the same way as sklearn's strip_accents='unicode'"""
+    try:
+        text.encode("ASCII", errors="strict")
+        return text
+    except UnicodeEncodeError:
+        normalized = unicodedata.normalize("NFKD", text)
+        return "".join([c for c in normalized if not unicodedata.combining(c)])
+
+
+class TextAnalyzer:
+    """
+    Word n-gram analyzer equivalent to sklearn's TfidfVectorizer(...).build_analyzer().
+
+    Keeping our own copy lets a loaded model featurize queries without
+    importing sklearn: the stop-word list is stored in the model artifact.
+    """
+
+    def __init__(self, lowercase=True, strip_accents='unicode', stop_words='english', ngram_range=(1, 2),
+                 token_pattern=TOKEN_PATTERN):
+        if stop_words == 'english':
+            from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+            stop_words = ENGLISH_STOP_WORDS
+        self.lowercase = lowercase
+        self.strip_accents = strip_accents
+        self.stop_words = frozenset(stop_words or ())
+        self.ngram_range = tuple(ngram_range)
+        self.token_pattern = token_pattern
+        self._findall = re.compile(token_pattern).findall
+
+    def config(self):
+        """JSON-able settings, enough to rebuild the analyzer without sklearn"""
+        return {
+            'lowercase': self.lowercase,
+            'strip_accents': self.strip_accents,
+            'stop_words': sorted(self.stop_words),
+            'ngram_range': list(self.ngram_range),
+            'token_pattern': self.token_pattern
+        }
+
+    def __call__(self, text):
+        if self.lowercase:
+            text = text.lower()
+        if self.strip_accents == 'unicode':
+            text = strip_accents_unicode(text)
+        tokens = [t for t in self._findall(text) if t not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                terms.append(" ".join(tokens[i:i + n]))
+        return terms
+
+
+class TfidfFeatures:
+    """Shared counting and weighting for the TF-IDF featurizers below"""
+
+    analyzer = None
+    vocabulary_ = None
+
+    @property
+    def idf_(self):
+        raise NotImplementedError
+
+    @property
+    def n_terms(self):
+        return len(self.vocabulary_)
+
+    def idf_at(self, columns):
+        """IDF weights of some columns"""
+        return self.idf_[columns]
+
+    def terms(self):
+        """The vocabulary dict and how many of its columns this featurizer uses"""
+        return self.vocabulary_, len(self.vocabulary_)
+
+    def count(self, texts, grow=False, new_terms=None):
+        """
+        Return raw term counts as CSR, optionally adding unseen terms to the
+        vocabulary. new_terms, if a dict, receives unseen terms instead (with
+        the columns they would get), leaving the vocabulary unchanged.
+        """
+        vocabulary, size = self.terms()
+        added = []
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = {}
+            for term in self.analyzer(text):
+                column = vocabulary.get(term)
+                if column is None or column >= size:
+                    if new_terms is not None:
+                        column = new_terms.setdefault(term, size + len(new_terms))
+                    elif not grow:
+                        continue
+                    else:
+                        column = size
+                        vocabulary[term] = column
+                        added.append(term)
+                        size += 1
+                counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts)
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        if added:
+            self.grown(added)
+
+        return sp.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(texts), size + (len(new_terms) if new_terms is not None else 0))
+        )
+
+    def grown(self, terms):
+        """Called after count(grow=True) added terms to the vocabulary dict"""
+
+    def weight(self, counts):
+        """Turn raw counts into L2-normalized TF-IDF rows using the current IDF"""
+        X = pad_columns(counts, self.n_terms).astype(np.float64, copy=True)
+        X.data *= self.idf_at(X.indices)
+        return l2_normalize(X)
+
+    def transform(self, texts):
+        return self.weight(self.count(texts))
+
+
+class FrozenTfidfVectorizer(TfidfFeatures):
+    """Transform-only TF-IDF featurizer rebuilt from a stored vocabulary and IDF vector"""
+
+    def __init__(self, analyzer, vocabulary, idf):
+        self.analyzer = analyzer
+        self.vocabulary_ = vocabulary
+        self._idf = idf
+
+    @property
+    def idf_(self):
+        return self._idf
+
+
+class GrowingTfidfVectorizer(TfidfFeatures):
+    """
+    TF-IDF featurizer whose vocabulary grows as new questions are learned.
+
+    Uses the same analyzer settings as the TfidfVectorizer in MLModel, but keeps
+    document frequencies so that partial_fit can add documents (and new terms)
+    without refitting on the whole corpus. Columns are assigned in order of
+    first appearance, so existing columns never move. Copies share the
+    vocabulary, which only ever grows; each uses its first n_terms columns
+    (terms past those are unseen to it).
+    """
+
+    def __init__(self, lowercase=True, strip_accents='unicode', stop_words='english', ngram_range=(1, 2),
+                 analyzer=None):
+        self.analyzer = analyzer or TextAnalyzer(
+            lowercase=lowercase,
+            strip_accents=strip_accents,
+            stop_words=stop_words,
+            ngram_range=ngram_range
+        )
+        self._vocabulary = {}
+        self._terms = []  # Terms of the shared vocabulary in column order
+        self._n_terms = 0
+        self.n_documents = 0
+        self._document_frequency = np.zeros(16, dtype=np.int64)
+        self._idf = None
+
+    @property
+    def n_terms(self):
+        return self._n_terms
+
+    @property
+    def vocabulary_(self):
+        return VocabularyView(self._vocabulary, self._terms, self._n_terms)
+
+    def terms(self):
+        return self._vocabulary, self._n_terms
+
+    def grown(self, terms):
+        self._terms.extend(terms)
+        self._n_terms += len(terms)
+
+    @property
+    def document_frequency(self):
+        return self._document_frequency[:self._n_terms]
+
+    @property
+    def idf_(self):
+        """Smoothed IDF weights, computed the same way as sklearn's TfidfTransformer"""
+        if self._idf is None or len(self._idf) != self._n_terms:
+            self._idf = self.idf_at(np.arange(self._n_terms))
+        return self._idf
+
+    def idf_at(self, columns):
+        """IDF of some columns only, so weighting a few rows costs nothing per vocabulary term"""
+        return np.log((1 + self.n_documents) / (1 + self._document_frequency[columns])) + 1
+
+    def restore(self, vocabulary, document_frequency, n_documents):
+        """Restore fitted statistics, e.g. from a model artifact"""
+        self._vocabulary = vocabulary
+        self._terms = sorted(vocabulary, key=vocabulary.get)
+        self._n_terms = len(vocabulary)
+        self._document_frequency = np.array(document_frequency, dtype=np.int64)
+        self.n_documents = n_documents
+        self._idf = None
+        return self
+
+    def copy(self):
+        """An independent copy that can learn while this one keeps serving queries"""
+        clone = GrowingTfidfVectorizer(analyzer=self.analyzer)
+        clone._vocabulary = self._vocabulary
+        clone._terms = self._terms
+        clone._n_terms = self._n_terms
+        clone.n_documents = self.n_documents
+        clone._document_frequency = self._document_frequency.copy()
+        return clone
+
+    def partial_fit(self, texts):
+        """Add documents to the statistics and return their raw counts"""
+        if len(self._terms) != self._n_terms:
+            # A newer copy grew the shared vocabulary; grow a private one instead
+            self._terms = self._terms[:self._n_terms]
+            self._vocabulary = {term: i for i, term in enumerate(self._terms)}
+        counts = self.count(texts, grow=True)
+        size = self._n_terms
+        if size > len(self._document_frequency):
+            grown = np.zeros(max(size, 2 * len(self._document_frequency)), dtype=np.int64)
+            grown[:len(self._document_frequency)] = self._document_frequency
+            self._document_frequency = grown
+        np.add.at(self._document_frequency, counts.indices, 1)
+        self.n_documents += len(texts)
+        self._idf = None
+        return counts
+
+    def partial_fit_transform(self, texts):
+        return self.weight(self.partial_fit(texts))
+
+    def learning_rows(self, texts):
+        """
+        The rows partial_fit_transform would return for texts, without
+        learning them: unseen terms get the columns they would be given.
+        """
+        new_terms = {}
+        X = self.count(texts, new_terms=new_terms)
+        # Each row holds a column once, so the batch adds its count of rows to the column's df
+        columns, inverse, document_frequency = np.unique(X.indices, return_inverse=True, return_counts=True)
+        known = columns < self._n_terms
+        document_frequency[known] += self._document_frequency[columns[known]]
+        X.data *= np.log((1 + self.n_documents + len(texts)) / (1 + document_frequency[inverse])) + 1
+        return l2_normalize(X)
+
+    def fit(self, texts):
+        self.fit_transform(texts)
+        return self
+
+    def fit_transform(self, texts):
+        self._vocabulary = {}
+        self._terms = []
+        self._n_terms = 0
+        self.n_documents = 0
+        self._document_frequency = np.zeros(16, dtype=np.int64)
+        self._idf = None
+        return self.partial_fit_transform(texts)
+
+
+class IncrementalNB:
+    """
+    Multinomial naive Bayes with partial_fit that accepts unseen classes and features.
+
+    Produces the same posteriors as sklearn's MultinomialNB(alpha) fitted on the
+    same rows, but keeps the per-class feature counts sparse. The joint
+    log-likelihood is evaluated in factored form:
+
+        jll[c] = s*log(alpha) + x . log1p(fc[c] / alpha) - s*log(total[c] + alpha*V) + prior[c]
+
+    where s is the row sum of x, so only non-zero feature counts are ever stored.
+
+    The log1p(fc / alpha) rows are compiled once. partial_fit does not touch
+    them: for each changed count it appends a correction
+    log1p(new / alpha) - log1p(old / alpha) to a row of its class, so learning
+    costs O(new rows). merged() folds the corrections back in; MLModel does
+    that when it writes a snapshot, and partial_fit once they outgrow
+    MERGE_ROWS rows or a sixteenth of the classes.
+    """
+
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+        self._reset()
+
+    def _reset(self):
+        self._classes = []  # Shared by copies; only ever grows
+        self._class_index = {}
+        self._n_classes = 0
+        self.class_count_ = np.zeros(0, dtype=np.float64)
+        self.n_features_in_ = 0
+        self._log_ratio = sp.csr_matrix((0, 0), dtype=np.float64)
+        self._class_total = np.zeros(0, dtype=np.float64)
+        self._corrections = None  # RowBuffer view; each row is labelled with its class
+        self._counts = {}  # (class, column) -> feature count, for counts changed since the last merge
+
+    @classmethod
+    def from_multinomial(cls, nb):
+        """Convert a fitted sklearn MultinomialNB (e.g. from a legacy pickle)"""
+        return cls.from_counts(nb.classes_, nb.class_count_, nb.feature_count_, alpha=nb.alpha)
+
+    @classmethod
+    def from_counts(cls, classes, class_count, feature_count, alpha=1.0):
+        """Build a model from its sufficient statistics, e.g. summed over chunks of a corpus"""
+        model = cls(alpha=alpha)
+        model._classes = list(classes)
+        model._class_index = {label: i for i, label in enumerate(model._classes)}
+        model._n_classes = len(model._classes)
+        model.class_count_ = np.asarray(class_count, dtype=np.float64)
+        model._compile(sp.csr_matrix(feature_count, dtype=np.float64, copy=True))
+        return model
+
+    @classmethod
+    def from_compiled(cls, classes, class_count, class_total, log_ratio, n_features, alpha=1.0):
+        """
+        Rebuild a model from its stored log-ratios without recomputing them.
+
+        The arrays may be read-only memory maps (with sorted indices); feature
+        counts are only recovered, as alpha * expm1(log_ratio), for the
+        classes the model learns again.
+        """
+        model = cls(alpha=alpha)
+        model._classes = classes  # Any sequence; copied into a list only if the model learns again
+        model._class_index = None
+        model._n_classes = len(classes)
+        model.class_count_ = np.asarray(class_count, dtype=np.float64)
+        model._log_ratio = log_ratio
+        model._class_total = np.asarray(class_total, dtype=np.float64)
+        model.n_features_in_ = n_features
+        return model
+
+    def copy(self):
+        """
+        An independent copy that can learn while this one keeps serving queries.
+
+        partial_fit replaces the count arrays rather than writing into them and
+        only appends to the class list and correction rows, so nothing is copied.
+        """
+        clone = IncrementalNB(alpha=self.alpha)
+        clone._classes = self._classes
+        clone._class_index = self._class_index
+        clone._n_classes = self._n_classes
+        clone.class_count_ = self.class_count_
+        clone.n_features_in_ = self.n_features_in_
+        clone._log_ratio = self._log_ratio
+        clone._class_total = self._class_total
+        clone._corrections = self._corrections
+        # The changed counts belong to the newest correction rows (see _own_corrections)
+        clone._counts = self._counts if self._corrections is not None else {}
+        return clone
+
+    @property
+    def classes_(self):
+        if len(self._classes) == self._n_classes:
+            return self._classes
+        return ListPrefix(self._classes, self._n_classes)
+
+    @property
+    def feature_count_(self):
+        counts = sp.csr_matrix(self.compiled()[0], dtype=np.float64, copy=True)
+        counts.data = self.alpha * np.expm1(counts.data)
+        return counts
+
+    @property
+    def class_total_(self):
+        return self._class_total
+
+    def _compile(self, feature_count):
+        """Compile the log-ratio rows from feature counts (CSR, owned by the model)"""
+        feature_count.sum_duplicates()
+        log_ratio = feature_count.copy()
+        log_ratio.data = np.log1p(log_ratio.data / self.alpha)
+        self._log_ratio = log_ratio
+        self._class_total = np.asarray(feature_count.sum(axis=1), dtype=np.float64).ravel()
+        self.n_features_in_ = feature_count.shape[1]
+        self._corrections = None
+        self._counts = {}
+
+    def _label_ids(self, y):
+        """Class indices of labels, adding unseen classes"""
+        if self._class_index is None or len(self._classes) != self._n_classes:
+            # Loaded from an artifact, or a newer copy added classes to the shared list
+            self._classes = list(self.classes_)
+            self._class_index = {label: i for i, label in enumerate(self._classes)}
+        labels = np.empty(len(y), dtype=np.int64)
+        for i, label in enumerate(y):
+            index = self._class_index.get(label)
+            if index is None:
+                index = len(self._classes)
+                self._class_index[label] = index
+                self._classes.append(label)
+            labels[i] = index
+        self._n_classes = len(self._classes)
+        return labels
+
+    def fit(self, X, y):
+        self._reset()
+        X = sp.csr_matrix(X, dtype=np.float64)
+        labels = self._label_ids(y)
+        membership = sp.csr_matrix(
+            (np.ones(len(labels)), labels, np.arange(len(labels) + 1)),
+            shape=(len(labels), self._n_classes)
+        )
+        self.class_count_ = np.bincount(labels, minlength=self._n_classes).astype(np.float64)
+        self._compile((membership.T @ X).tocsr())
+        return self
+
+    def _own_corrections(self):
+        """Merge first if a newer copy appended correction rows (e.g. learning failed)"""
+        if self._corrections is not None and not self._corrections.row_buffer.owns(self._corrections):
+            self._merge()
+
+    def _count(self, label, column):
+        """Current feature count of one class and column"""
+        count = self._counts.get((label, column))
+        if count is not None:
+            return count
+        log_ratio = self._log_ratio
+        if label >= log_ratio.shape[0] or column >= log_ratio.shape[1]:
+            return 0.0
+        start, end = log_ratio.indptr[label], log_ratio.indptr[label + 1]
+        position = start + int(np.searchsorted(log_ratio.indices[start:end], column))
+        if position < end and log_ratio.indices[position] == column:
+            return self.alpha * float(np.expm1(log_ratio.data[position]))
+        return 0.0
+
+    def partial_fit(self, X, y):
+        X = sp.csr_matrix(X, dtype=np.float64)
+        labels = self._label_ids(y)
+        self._own_corrections()
+        n_classes = self._n_classes
+        n_features = max(self.n_features_in_, X.shape[1])
+
+        # Summed counts of the classes in this batch, one row per class
+        touched, rows = np.unique(labels, return_inverse=True)
+        membership = sp.csr_matrix(
+            (np.ones(len(rows)), rows, np.arange(len(rows) + 1)),
+            shape=(len(rows), len(touched))
+        )
+        delta = (membership.T @ X).tocsr()
+        delta.sum_duplicates()
+        changed = list(zip(np.repeat(touched, np.diff(delta.indptr)).tolist(), delta.indices.tolist()))
+        old = np.array([self._count(label, column) for label, column in changed], dtype=np.float64)
+        new = old + delta.data
+        corrections = sp.csr_matrix(
+            (np.log1p(new / self.alpha) - np.log1p(old / self.alpha), delta.indices, delta.indptr),
+            shape=(len(touched), n_features)
+        )
+
+        class_count = np.zeros(n_classes, dtype=np.float64)
+        class_count[:len(self.class_count_)] = self.class_count_
+        class_count += np.bincount(labels, minlength=n_classes)
+        class_total = np.zeros(n_classes, dtype=np.float64)
+        class_total[:len(self._class_total)] = self._class_total
+        class_total[touched] += np.asarray(delta.sum(axis=1)).ravel()
+
+        self._corrections = append_rows(self._corrections, corrections, touched)
+        self._counts.update(zip(changed, new.tolist()))
+        self.class_count_ = class_count
+        self._class_total = class_total
+        self.n_features_in_ = n_features
+        if self._corrections.shape[0] > max(MERGE_ROWS, n_classes // 16):
+            self._merge()
+        return self
+
+    def _merge(self):
+        """Fold the correction rows into the compiled ones"""
+        corrections = self._corrections
+        labels = corrections.row_buffer.labels[:corrections.shape[0]]
+        n_classes, n_features = self._n_classes, self.n_features_in_
+        membership = sp.csr_matrix(
+            (np.ones(len(labels)), (labels, np.arange(len(labels)))),
+            shape=(n_classes, len(labels))
+        )
+        log_ratio = pad_rows(pad_columns(self._log_ratio, n_features), n_classes).astype(np.float64)
+        log_ratio = (log_ratio + membership @ pad_columns(corrections, n_features)).tocsr()
+        log_ratio.sum_duplicates()
+        self._log_ratio = log_ratio
+        self._corrections = None
+        self._counts = {}
+
+    def merged(self):
+        """This model, or an equivalent copy with the correction rows folded in"""
+        if self._corrections is None:
+            return self
+        model = self.copy()
+        model._merge()
+        return model
+
+    def compiled(self):
+        """Return (log_ratio, class_total), the arrays used for scoring, corrections folded in"""
+        model = self.merged()
+        return model._log_ratio, model._class_total
+
+    def predict_joint_log_proba(self, X):
+        log_ratio = self._log_ratio
+        X = sp.csr_matrix(X, dtype=log_ratio.dtype)
+        X = fit_columns(X, self.n_features_in_)  # Terms never seen in training carry no evidence
+
+        jll = np.zeros((X.shape[0], self._n_classes))
+        jll[:, :log_ratio.shape[0]] = (fit_columns(X, log_ratio.shape[1]) @ log_ratio.T).toarray()
+        if self._corrections is not None:
+            corrections = self._corrections
+            labels = corrections.row_buffer.labels[:corrections.shape[0]]
+            scores = (fit_columns(X, corrections.shape[1]) @ corrections.T).toarray()
+            np.add.at(jll.T, labels, scores.T)
+
+        row_sums = np.asarray(X.sum(axis=1))
+        class_log_prior = np.log(self.class_count_) - np.log(self.class_count_.sum())
+        class_norm = np.log(self._class_total + self.alpha * self.n_features_in_)
+        return (
+            jll
+            + row_sums * np.log(self.alpha)
+            - row_sums * class_norm
+            + class_log_prior
+        )
+
+    def predict_log_proba(self, X):
+        return log_normalize(self.predict_joint_log_proba(X))
+
+    def predict_proba(self, X):
+        return np.exp(self.predict_log_proba(X))
+
+    def predict(self, X):
+        jll = self.predict_joint_log_proba(X)
+        classes = self.classes_
+        return [classes[i] for i in np.argmax(jll, axis=1)]
+
+    def predict_with_proba(self, X):
+        """predict and the largest predict_proba value of each row, from one joint log-likelihood"""
+        jll = self.predict_joint_log_proba(X)
+        classes = self.classes_
+        labels = [classes[i] for i in np.argmax(jll, axis=1)]
+        return labels, np.exp(log_normalize(jll).max(axis=1))
@@ -0,0 +1,47 @@
+from functools import cached_property
+
+from response_cache import normalize_text
+
+
+class ParsedQuery:
+    """
+    One user message, parsed once and shared by every tier of the pipeline.
+
+    The normalized text (MLModel.clean_text form) is computed up front; tokens,
+    stems and the TF-IDF vector are computed on first use and then reused, so a
+    tier that is never reached costs nothing. Instances are read-only.
+    ml_model may be an MLModel or, as from MLModel.parse, the ModelSnapshot
+    the query is answered from.
+    """
+
+    def __init__(self, text, nlp_processor=None, ml_model=None):
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "normalized", normalize_text(text))
+        object.__setattr__(self, "nlp_processor", nlp_processor)
+        object.__setattr__(self, "ml_model", ml_model)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ParsedQuery is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("ParsedQuery is immutable")
+
+    def __repr__(self):
+        return f"ParsedQuery({self.text!r})"
+
+    @cached_property
+    def tokens(self):
+        """Words of the normalized text, split like NLPProcessor.preprocess splits them"""
+        return tuple(self.nlp_processor.tokenize(self.normalized))
+
+    @cached_property
+    def stems(self):
+        """Stemmed tokens; the same list NLPProcessor.preprocess returns for the original text"""
+        return tuple(self.nlp_processor.stem_tokens(self.tokens))
+
+    @cached_property
+    def vector(self):
+        """TF-IDF row of the normalized text, or None while the model has no fitted vectorizer"""
+        if self.ml_model is None or not self.ml_model.vectorizer_fitted:
+            return None
+        return self.ml_model.vectorize(self.normalized)
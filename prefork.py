@@ -0,0 +1,201 @@
+import asyncio
+import gc
+import os
+import signal
+import socket
+import threading
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+
+from server import ChatServer
+
+
+class LearnerClient:
+    """Stands in for MLModel in a worker: learned pairs are sent to the parent, which owns the model"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.lock = threading.Lock()  # Executor threads share one pipe
+
+    def update_model(self, question, response):
+        with self.lock:
+            self.conn.send((question, response))
+            return self.conn.recv()
+
+
+class PreforkServer:
+    """
+    Parent process of a prefork ChatServer pool.
+
+    The parent binds the listening socket, loads the model and knowledge base
+    once and forks the workers, which accept on the shared socket. Workers only
+    read the model: its arrays are memory-mapped from the artifact and
+    everything else is shared copy-on-write, so each extra worker costs little
+    memory. Learning is forwarded to the parent over a pipe. The parent's
+    snapshots write new versions of the artifact, which each worker maps in
+    place (checking every reload_interval seconds), so their sessions and
+    response caches survive learning. On SIGHUP the parent reloads from disk,
+    forks a new generation of workers and the old one drains and exits.
+    """
+
+    def __init__(self, build, workers, host="127.0.0.1", port=8080, setup_worker=None,
+                 reload_interval=1.0, **server_options):
+        self.build = build  # Returns (chatbot, ml_model) without a database connection
+        self.setup_worker = setup_worker  # Called with the chatbot in each worker, e.g. to open database connections
+        self.workers = workers
+        self.host = host
+        self.port = port
+        self.reload_interval = reload_interval
+        self.server_options = server_options
+        self.sock = None
+        self.chatbot = None
+        self.ml_model = None
+        self.generation = 0
+        self.children = {}  # pid -> (generation, parent end of the learn pipe)
+        self.reload_requested = False
+        self.stopping = False
+
+    def load(self):
+        """(Re)load the shared state and freeze it so the GC never touches the shared pages"""
+        if self.ml_model is not None:
+            self.ml_model.close()
+        gc.unfreeze()
+        self.chatbot, self.ml_model = self.build()
+        self.chatbot.nlp_processor.warm_up()  # Import NLTK once, before forking
+        gc.collect()
+        gc.freeze()
+
+    def spawn(self):
+        parent_end, child_end = Pipe()
+        pid = os.fork()
+        if pid == 0:
+            parent_end.close()
+            for _, conn in self.children.values():
+                conn.close()
+            code = 1
+            try:
+                self.run_worker(child_end)
+                code = 0
+            except Exception as e:
+                print(f"Worker error: {e}")
+            finally:
+                os._exit(code)  # Never run the parent's cleanup (snapshots, journal) in a worker
+        child_end.close()
+        self.children[pid] = (self.generation, parent_end)
+
+    def run_worker(self, conn):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent handles Ctrl-C for the pool
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        # A parent thread (learning, snapshots) may have held these at the fork
+        self.ml_model.lock = threading.RLock()
+        self.ml_model.save_lock = threading.Lock()
+        if self.setup_worker is not None:
+            self.setup_worker(self.chatbot)  # Database connections must not be shared across a fork
+
+        stop = threading.Event()
+        watcher = threading.Thread(target=self.watch_model, args=(stop,), daemon=True)
+        watcher.start()
+        server = ChatServer(self.chatbot, LearnerClient(conn), sock=self.sock, **self.server_options)
+        try:
+            asyncio.run(server.serve(stop_signals=(signal.SIGTERM,)))
+        finally:
+            stop.set()
+            server.close()
+
+    def watch_model(self, stop):
+        """Map each new version of the artifact the parent writes"""
+        while not stop.wait(self.reload_interval):
+            try:
+                self.ml_model.reload_model()
+            except Exception as e:
+                print(f"Model reload error: {e}")
+
+    def roll(self):
+        """Fork a new generation of workers, then tell the old one to drain and exit"""
+        old = [pid for pid, (generation, _) in self.children.items() if generation == self.generation]
+        self.generation += 1
+        for _ in range(self.workers):
+            self.spawn()
+        for pid in old:
+            self.terminate(pid)
+
+    def terminate(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def reap(self):
+        """Collect exited workers and replace any of the current generation that died"""
+        while self.children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            generation, conn = self.children.pop(pid, (None, None))
+            if conn is not None:
+                conn.close()
+            if generation == self.generation and not self.stopping:
+                print(f"Worker {pid} exited unexpectedly (status {status}); restarting it")
+                self.spawn()
+
+    def serve_learning(self, timeout):
+        """Apply learn requests forwarded by workers"""
+        for conn in wait([conn for _, conn in self.children.values()], timeout=timeout):
+            try:
+                question, response = conn.recv()
+            except (EOFError, OSError):
+                continue  # Worker exited; reap() handles it
+            try:
+                learned = self.ml_model.update_model(question, response)
+            except Exception as e:
+                print(f"Learning error: {e}")
+                learned = False
+            try:
+                conn.send(learned)
+            except OSError:
+                pass
+
+    def request_stop(self, signum, frame):
+        self.stopping = True
+
+    def request_reload(self, signum, frame):
+        self.reload_requested = True
+
+    def run(self):
+        self.sock = socket.create_server((self.host, self.port), backlog=1024)
+        self.sock.setblocking(False)
+        self.port = self.sock.getsockname()[1]
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+        signal.signal(signal.SIGHUP, self.request_reload)
+
+        self.load()
+        self.roll()
+        print(f"Serving on http://{self.host}:{self.port} with {self.workers} workers (parent pid {os.getpid()})")
+
+        try:
+            while not self.stopping:
+                self.serve_learning(timeout=0.2)
+                self.reap()
+                if self.reload_requested:
+                    # The model files changed on disk (e.g. a new artifact was trained offline)
+                    self.reload_requested = False
+                    self.load()
+                    self.roll()
+        finally:
+            self.stopping = True
+            for pid in list(self.children):
+                self.terminate(pid)
+            for pid in list(self.children):
+                try:
+                    os.waitpid(pid, 0)
+                except ChildProcessError:
+                    pass
+                self.children.pop(pid)[1].close()
+            self.sock.close()
+            self.ml_model.close()
@@ -0,0 +1,69 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()  # Default for get() when None is a valid cached value
+
+
+def normalize_text(text):
+    """Normalize text for consistent matching (lowercase, no punctuation, single spaces)"""
+    text = text.lower().strip()
+    text = re.sub(r'[^\w\s]', '', text)
+    return ' '.join(text.split())
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a time-to-live, keyed on normalized input.
+
+    Entries can be tagged with a version (e.g. the ML model's version); a
+    lookup with a different version is a miss, so bumping the version
+    invalidates exactly the entries that depended on the old one.
+    """
+
+    def __init__(self, max_size=4096, ttl=600.0, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (expires_at, version, value)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version=None, default=None):
+        """Return the cached value for key, or default if missing, expired or from another version"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, entry_version, value = entry
+                if entry_version == version and expires_at > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, version=None):
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, version, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.entries),
+                "max_size": self.max_size
+            }
@@ -0,0 +1,149 @@
+import re
+import threading
+import time
+
+_IDENTIFIER = re.compile(r'^\w+$')
+
+
+class ResponseIndex:
+    """
+    In-memory copy of a question -> response table, kept fresh by polling.
+
+    The whole table is bulk-loaded once, then only rows whose updated_at is at
+    or after the newest one already seen are fetched on each poll; a full
+    reload every full_reload_interval also picks up deleted rows. A table
+    without the updated_at column is only ever fully reloaded. Every load
+    builds a new dict and swaps it in with one assignment, so lookups read a
+    consistent snapshot and never wait on the database.
+
+    Keys are matched case-insensitively and ignoring trailing spaces, as
+    MySQL's default (PAD SPACE) collation compares them; leading whitespace
+    still counts.
+    """
+
+    def __init__(self, database_manager, table="chatbot_responses", key_column="question",
+                 value_column="response", updated_column="updated_at", poll_interval=30.0,
+                 full_reload_interval=3600.0):
+        for name in (table, key_column, value_column, updated_column):
+            if name is not None and not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid SQL identifier: {name!r}")
+        self.database_manager = database_manager
+        self.table = table
+        self.key_column = key_column
+        self.value_column = value_column
+        self.updated_column = updated_column  # None (or a table without it) disables incremental refresh
+        self.poll_interval = poll_interval
+        self.full_reload_interval = full_reload_interval
+        self.snapshot = {}
+        self.loaded = False
+        self.watermark = None  # Newest updated_at in the snapshot
+        self.loaded_at = 0.0
+        self.failing = False  # A failed read was reported and none has succeeded since
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def normalize(question):
+        return question.rstrip(" ").lower()
+
+    def lookup(self, question):
+        """Response for a question from the current snapshot, or None"""
+        return self.snapshot.get(self.normalize(question))
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def _columns(self):
+        columns = [self.key_column, self.value_column]
+        if self.updated_column:
+            columns.append(self.updated_column)
+        return ", ".join(columns)
+
+    def _checked(self, rows):
+        """rows, reporting a failed read (None) once until a read succeeds again"""
+        if rows is None:
+            if not self.failing:
+                print(f"Response index could not read {self.table}; retrying every {self.poll_interval:g}s")
+                self.failing = True
+        else:
+            self.failing = False
+        return rows
+
+    def load(self):
+        """Bulk-load the whole table and swap it in; returns False if the database could not be read"""
+        rows = self.database_manager.query_all(f"SELECT {self._columns()} FROM {self.table}")
+        if rows is None and self.updated_column:
+            rows = self.database_manager.query_all(f"SELECT {self.key_column}, {self.value_column} FROM {self.table}")
+            if rows is not None:
+                print(f"Response index: {self.table} has no {self.updated_column} column; "
+                      f"reloading it in full every poll")
+                self.updated_column = None
+        if self._checked(rows) is None:
+            return False
+
+        snapshot = {}
+        watermark = None
+        for row in rows:
+            if row[0] is None:
+                continue
+            snapshot.setdefault(self.normalize(row[0]), row[1])  # First row wins, like query_db's fetchone
+            if self.updated_column and row[2] is not None and (watermark is None or row[2] > watermark):
+                watermark = row[2]
+        self.snapshot = snapshot
+        self.watermark = watermark
+        self.loaded = True
+        self.loaded_at = time.monotonic()
+        return True
+
+    def refresh(self):
+        """Apply rows changed since the last load; falls back to a full load when needed"""
+        if (not self.loaded or not self.updated_column or self.watermark is None
+                or time.monotonic() - self.loaded_at >= self.full_reload_interval):
+            return self.load()
+
+        # >= rather than > so rows written in the same second as the watermark are not missed
+        rows = self._checked(self.database_manager.query_all(
+            f"SELECT {self._columns()} FROM {self.table} WHERE {self.updated_column} >= %s",
+            (self.watermark,)
+        ))
+        if rows is None:
+            return False
+
+        changes = {}
+        watermark = self.watermark
+        for row in rows:
+            if row[0] is None:
+                continue
+            key = self.normalize(row[0])
+            if self.snapshot.get(key) != row[1]:
+                changes[key] = row[1]
+            if row[2] is not None and row[2] > watermark:
+                watermark = row[2]
+        if changes:
+            snapshot = dict(self.snapshot)
+            snapshot.update(changes)
+            self.snapshot = snapshot
+        self.watermark = watermark
+        return True
+
+    def start(self):
+        """Load and keep refreshing in a background thread; check loaded before relying on lookups"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="response-index", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Response index refresh error: {e}")
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
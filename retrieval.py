@@ -0,0 +1,161 @@
+import numpy as np
+import scipy.sparse as sp
+
+# Slack for float32 rounding when comparing score bounds with the threshold
+BOUND_SLACK = 1e-5
+
+
+class InvertedIndex:
+    """
+    Term -> posting list index over the question matrix, for the similarity tier.
+
+    best_match finds the most similar question above a threshold without
+    scoring every question. Query terms are split MaxScore-style: the terms
+    with the smallest upper bounds (query weight times the term's largest
+    stored weight) that together cannot reach the threshold are
+    non-essential, so only questions sharing an essential term can match.
+    Those candidates get a partial score from the essential postings; the
+    ones whose partial score plus the non-essential bound still clears the
+    threshold are rescored exactly against the question matrix.
+
+    Without max_postings the result is exactly that of a full scan. With it,
+    each posting list keeps only its max_postings highest-weight entries, so
+    very common terms cost less, at the price of missing some matches
+    (measured by benchmarks/retrieval_bench.py).
+
+    Rows appended after the index was built are scored exactly until they
+    reach a sixteenth of the indexed rows, when build() re-indexes everything.
+    """
+
+    def __init__(self, question_matrix, postings, max_weight, max_postings=None):
+        self.question_matrix = question_matrix
+        self.postings = postings  # CSC (indexed rows x terms), possibly truncated
+        self.max_weight = max_weight  # Largest weight of each term over all indexed rows
+        self.max_postings = max_postings
+        self.indexed_rows = postings.shape[0]
+
+    @classmethod
+    def build(cls, question_matrix, previous=None, max_postings=None):
+        """
+        Index a question matrix. previous, if given, is the index of a matrix
+        this one extends by appending rows; its postings are reused while the
+        unindexed tail stays small.
+        """
+        if previous is not None and previous.max_postings == max_postings:
+            tail = question_matrix.shape[0] - previous.indexed_rows
+            if 0 <= tail <= max(1024, previous.indexed_rows // 16):
+                return cls(question_matrix, previous.postings, previous.max_weight, max_postings)
+
+        postings = sp.csc_matrix(question_matrix)
+        n_terms = postings.shape[1]
+        lengths = np.diff(postings.indptr)
+        columns = np.repeat(np.arange(n_terms), lengths)
+        # Entries grouped by term, highest weight first
+        order = np.lexsort((-postings.data, columns))
+        data = postings.data[order]
+        rows = postings.indices[order]
+        max_weight = np.zeros(n_terms, dtype=np.float64)
+        nonempty = lengths > 0
+        max_weight[nonempty] = data[postings.indptr[:-1][nonempty]]
+
+        indptr = postings.indptr
+        if max_postings is not None:
+            ranks = np.arange(len(data)) - np.repeat(postings.indptr[:-1], lengths)
+            keep = ranks < max_postings
+            data, rows = data[keep], rows[keep]
+            indptr = np.zeros(n_terms + 1, dtype=postings.indptr.dtype)
+            np.cumsum(np.minimum(lengths, max_postings), out=indptr[1:])
+        postings = sp.csc_matrix((data, rows, indptr), shape=question_matrix.shape)
+        return cls(question_matrix, postings, max_weight, max_postings)
+
+    def best_match(self, vector, threshold):
+        """(row, score) of the most similar question scoring above threshold, or None; ties go to the lower row"""
+        vector = sp.csr_matrix(vector, dtype=self.question_matrix.dtype)
+        best_row, best_score = None, threshold
+
+        # Terms learned after indexing only occur in the tail
+        terms, weights = vector.indices, vector.data.astype(np.float64)
+        indexed = terms < len(self.max_weight)
+        terms, weights = terms[indexed], weights[indexed]
+        bounds = weights * self.max_weight[terms]
+        order = np.argsort(bounds, kind='stable')
+        skipped = int(np.searchsorted(np.cumsum(bounds[order]), threshold - BOUND_SLACK, side='right'))
+        essential = order[skipped:]
+        slack = float(bounds[order[:skipped]].sum())
+
+        if len(essential):
+            starts = self.postings.indptr[terms[essential]]
+            ends = self.postings.indptr[terms[essential] + 1]
+            lengths = ends - starts
+            positions = np.repeat(ends - np.cumsum(lengths), lengths) + np.arange(lengths.sum())
+            candidates, inverse = np.unique(self.postings.indices[positions], return_inverse=True)
+            contributions = self.postings.data[positions] * np.repeat(weights[essential], lengths)
+            partial = np.bincount(inverse, weights=contributions)
+            candidates = candidates[partial + slack > threshold - BOUND_SLACK]
+            if len(candidates):
+                scores = (self.question_matrix[candidates] @ vector.T).toarray().ravel()
+                best = int(np.argmax(scores))
+                if scores[best] > best_score:
+                    best_row, best_score = int(candidates[best]), float(scores[best])
+
+        if self.indexed_rows < self.question_matrix.shape[0]:
+            scores = (self.question_matrix[self.indexed_rows:] @ vector.T).toarray().ravel()
+            best = int(np.argmax(scores))
+            if scores[best] > best_score:
+                best_row, best_score = self.indexed_rows + best, float(scores[best])
+
+        if best_row is None:
+            return None
+        return best_row, best_score
+
+    def all_matches(self, X, threshold, chunk_size=256):
+        """
+        Every (input row, question row, score) scoring above threshold, for all
+        rows of X at once: the MaxScore split, the candidate partial scores
+        and the exact rescoring each run as sparse matrix operations over a
+        chunk of rows. Returns three arrays.
+        """
+        X = sp.csr_matrix(X, dtype=self.question_matrix.dtype)
+        found_inputs, found_rows, found_scores = [], [], []
+        for start in range(0, X.shape[0], chunk_size):
+            chunk = X[start:start + chunk_size]
+            entry_rows = np.repeat(np.arange(chunk.shape[0]), np.diff(chunk.indptr))
+            indexed = chunk.indices < len(self.max_weight)
+            bounds = np.zeros(chunk.nnz, dtype=np.float64)
+            bounds[indexed] = chunk.data[indexed] * self.max_weight[chunk.indices[indexed]]
+
+            # Per row: smallest bounds first, non-essential while their running sum stays below threshold
+            order = np.lexsort((bounds, entry_rows))
+            running = np.cumsum(bounds[order])
+            row_starts = np.concatenate([[0.0], running])[chunk.indptr[:-1]]
+            skipped = running - row_starts[entry_rows[order]] <= threshold - BOUND_SLACK
+            essential = np.ones(chunk.nnz, dtype=bool)
+            essential[order[skipped]] = False
+            slack = np.bincount(entry_rows[~essential], weights=bounds[~essential], minlength=chunk.shape[0])
+            essential &= indexed
+
+            indptr = np.zeros(chunk.shape[0] + 1, dtype=np.int64)
+            np.cumsum(np.bincount(entry_rows[essential], minlength=chunk.shape[0]), out=indptr[1:])
+            pruned = sp.csr_matrix((chunk.data[essential], chunk.indices[essential], indptr),
+                                   shape=(chunk.shape[0], self.postings.shape[1]))
+            partial = (pruned @ self.postings.T).tocoo()
+            keep = partial.data + slack[partial.row] > threshold - BOUND_SLACK
+            inputs, rows = partial.row[keep], partial.col[keep]
+            if len(inputs):
+                scores = np.asarray(chunk[inputs].multiply(self.question_matrix[rows]).sum(axis=1)).ravel()
+                hits = scores > threshold
+                found_inputs.append(inputs[hits] + start)
+                found_rows.append(rows[hits])
+                found_scores.append(scores[hits])
+
+            if self.indexed_rows < self.question_matrix.shape[0]:
+                tail = (chunk @ self.question_matrix[self.indexed_rows:].T).tocoo()
+                hits = tail.data > threshold
+                found_inputs.append(tail.row[hits] + start)
+                found_rows.append(tail.col[hits] + self.indexed_rows)
+                found_scores.append(tail.data[hits])
+
+        if not found_inputs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return (np.concatenate(found_inputs).astype(np.int64), np.concatenate(found_rows).astype(np.int64),
+                np.concatenate(found_scores))
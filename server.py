@@ -0,0 +1,390 @@
+import argparse
+import asyncio
+import json
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+
+from session_store import MemorySessionStore
+
+MAX_HEADER_LINES = 100
+MAX_BODY_BYTES = 64 * 1024
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON body"""
+
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+
+class ChatServer:
+    """
+    Minimal HTTP/1.1 JSON front end for the chatbot, built on asyncio streams.
+
+    Endpoints:
+        POST /chat   {"message": "..."} or {"messages": [...]}
+                     {"message": "...", "session_id": "..." or null} runs the learning dialog
+                     for that session and returns its session_id
+        POST /learn  {"question": "...", "response": "..."}
+        GET  /health
+        GET  /metrics  (Prometheus text format, when the chatbot has metrics)
+
+    Connections are kept alive between requests. Scoring runs in a thread pool
+    so the event loop only parses and writes; at most max_concurrency queries
+    are processed at once and the rest wait, up to request_timeout.
+    """
+
+    def __init__(self, chatbot, ml_model=None, host="127.0.0.1", port=8080, max_concurrency=4,
+                 request_timeout=10.0, keep_alive_timeout=15.0, sock=None, session_store=None):
+        self.chatbot = chatbot
+        self.ml_model = ml_model
+        self.session_store = session_store if session_store is not None else MemorySessionStore()
+        self.host = host
+        self.port = port
+        self.max_concurrency = max_concurrency
+        self.request_timeout = request_timeout
+        self.keep_alive_timeout = keep_alive_timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="chat-worker")
+        self.semaphore = None  # Created on the server's event loop
+        self.server = None
+        self.sock = sock  # Already-bound listening socket, e.g. shared by prefork workers
+        self.connections = set()  # Tasks serving a connection
+        self.idle = set()  # Connection tasks waiting for the next keep-alive request
+        self.closing = False
+
+        self.routes = {
+            ("POST", "/chat"): self.handle_chat,
+            ("POST", "/learn"): self.handle_learn,
+            ("GET", "/health"): self.handle_health,
+            ("GET", "/metrics"): self.handle_metrics
+        }
+
+    async def start(self):
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.sock is not None:
+            self.server = await asyncio.start_server(self.handle_connection, sock=self.sock)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]  # Resolves port 0 to the bound port
+        return self.server
+
+    async def serve(self, stop_signals=(signal.SIGINT, signal.SIGTERM), announce=False):
+        """Serve until one of stop_signals arrives, then shut down gracefully"""
+        await self.start()
+        if announce:
+            print(f"Serving on http://{self.host}:{self.port}")
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in stop_signals:
+            loop.add_signal_handler(signum, stop.set)
+        await stop.wait()
+        await self.shutdown()
+
+    async def shutdown(self):
+        """Stop accepting, let in-flight requests finish (up to request_timeout) and drop idle connections"""
+        self.closing = True
+        self.server.close()
+        for task in list(self.idle):
+            task.cancel()
+        if self.connections:
+            await asyncio.wait(list(self.connections), timeout=self.request_timeout)
+        for task in list(self.connections):
+            task.cancel()
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.executor.shutdown(wait=True)
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            keep_alive = True
+            while keep_alive and not self.closing:
+                # Idle keep-alive connections are dropped after keep_alive_timeout
+                self.idle.add(task)
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                finally:
+                    self.idle.discard(task)
+                if not request_line:
+                    break
+
+                try:
+                    method, path, version, headers, body = await asyncio.wait_for(
+                        self.read_request(request_line, reader), self.request_timeout
+                    )
+                except asyncio.TimeoutError:
+                    await self.write_response(writer, HTTPStatus.REQUEST_TIMEOUT, {"error": "Request timed out"}, False)
+                    break
+                except HTTPError as e:
+                    await self.write_response(writer, e.status, {"error": str(e)}, False)
+                    break
+
+                connection = headers.get("connection", "").lower()
+                if version == "HTTP/1.0":
+                    keep_alive = connection == "keep-alive"
+                else:
+                    keep_alive = connection != "close"
+
+                status, payload = await self.dispatch(method, path, body)
+                await self.write_response(writer, status, payload, keep_alive and not self.closing)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away
+        except Exception as e:
+            print(f"Server error: {e}")
+        finally:
+            self.connections.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, request_line, reader):
+        """Parse one request after its request line; returns (method, path, version, headers, body)"""
+        try:
+            method, path, version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        if version not in ("HTTP/1.0", "HTTP/1.1"):
+            raise HTTPError(HTTPStatus.HTTP_VERSION_NOT_SUPPORTED)
+
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], version, headers, body
+
+    async def dispatch(self, method, path, body):
+        """Route a request and return (status, JSON payload)"""
+        handler = self.routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self.routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed"}
+            return HTTPStatus.NOT_FOUND, {"error": "Not found"}
+
+        try:
+            data = json.loads(body.decode("utf-8")) if body else {}
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Invalid JSON body"}
+        if not isinstance(data, dict):
+            return HTTPStatus.BAD_REQUEST, {"error": "Expected a JSON object"}
+
+        try:
+            return HTTPStatus.OK, await handler(data)
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except asyncio.TimeoutError:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "Timed out waiting for the chatbot"}
+        except Exception as e:
+            print(f"Request error: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal error"}
+
+    async def run_blocking(self, function, *args):
+        """
+        Run CPU-bound work in the executor, within the concurrency limit and
+        request timeout. A timeout only stops the wait: the work itself cannot
+        be cancelled, so it keeps its slot until it actually finishes.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.request_timeout
+        await asyncio.wait_for(self.semaphore.acquire(), self.request_timeout)
+        try:
+            future = loop.run_in_executor(self.executor, function, *args)
+        except BaseException:
+            self.semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self.semaphore.release())
+        return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+
+    async def handle_chat(self, data):
+        if "messages" in data:
+            messages = data["messages"]
+            if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "'messages' must be a list of strings")
+            return {"responses": await self.run_blocking(self.chatbot.process_queries, messages)}
+
+        message = data.get("message")
+        if not isinstance(message, str) or not message.strip():
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'message' must be a non-empty string")
+        if "session_id" in data:
+            session_id = data["session_id"]
+            if session_id is not None and (not isinstance(session_id, str) or len(session_id) > 64):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "'session_id' must be a string of at most 64 characters")
+            return await self.run_blocking(self.converse, session_id, message)
+        return {"response": await self.run_blocking(self.chatbot.process_query, message)}
+
+    def converse(self, session_id, message):
+        """One dialog turn; an unknown or expired session_id starts a new session"""
+        session = self.session_store.get(session_id) if session_id else None
+        if session is None:
+            session = self.session_store.create()
+        response = self.chatbot.converse(session, message, self.ml_model, kind="session")
+        self.session_store.save(session)
+        return {"response": response, "session_id": session.session_id}
+
+    async def handle_learn(self, data):
+        if self.ml_model is None:
+            raise HTTPError(HTTPStatus.NOT_IMPLEMENTED, "Learning needs an ML model")
+        question, response = data.get("question"), data.get("response")
+        if not isinstance(question, str) or not isinstance(response, str):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'question' and 'response' must be strings")
+        try:
+            return {"learned": await self.run_blocking(self.ml_model.update_model, question, response)}
+        except asyncio.TimeoutError:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE,
+                            "Timed out waiting for the chatbot; the pair may still have been learned")
+
+    async def handle_health(self, data):
+        health = {"status": "ok"}
+        if getattr(self.chatbot, "response_cache", None) is not None:
+            health["cache"] = self.chatbot.response_cache.stats()
+        health["sessions"] = self.session_store.stats()
+        return health
+
+    async def handle_metrics(self, data):
+        if getattr(self.chatbot, "metrics", None) is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Metrics are disabled")
+        return self.chatbot.metrics.export()
+
+    async def write_response(self, writer, status, payload, keep_alive):
+        """Send a JSON payload, or a str as plain text (the metrics export)"""
+        if isinstance(payload, str):
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+def build_chatbot(metrics=False, request_log=None, retrieval=None, lsa_file=None, lsa_int8=False):
+    """Create the chatbot pipeline and its ML model, without a database connection"""
+    from inference_engine import Chatbot
+    from knowledge_base import KnowledgeBase
+    from metrics import Metrics
+    from ml_model import MLModel, training_data
+    from nlp_processor import NLPProcessor
+    from response_cache import ResponseCache
+
+    lsa = None
+    if lsa_file:
+        from lsa_index import DenseIndex, LsaProjection
+        projection = LsaProjection.load(lsa_file)
+        lsa = partial(DenseIndex.build, projection=projection, quantize=lsa_int8)
+    ml_model = MLModel(training_data=training_data, retrieval=retrieval, lsa=lsa)
+    if lsa_file and ml_model.vectorizer_fitted:
+        projection.check(ml_model.vectorizer)
+    chatbot = Chatbot(KnowledgeBase(), NLPProcessor(), ml_model, response_cache=ResponseCache(),
+                      metrics=Metrics(request_log) if metrics or request_log else None)
+    return chatbot, ml_model
+
+
+def connect_database(chatbot):
+    """Give a chatbot its own database pool and a background-refreshed response index"""
+    from database_manager import DatabaseManager
+    from response_index import ResponseIndex
+
+    db_manager = DatabaseManager()
+    chatbot.knowledge_base.database_manager = db_manager
+    chatbot.knowledge_base.response_index = ResponseIndex(db_manager).start()
+    chatbot.nlp_processor.db_manager = db_manager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Education Counseling Chatbot over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrency", type=int, default=4, help="queries processed at once")
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-request timeout in seconds")
+    parser.add_argument("--keep-alive", type=float, default=15.0, help="idle keep-alive timeout in seconds")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="prefork this many worker processes sharing one model (default: serve in-process)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-stage latencies and serve them at /metrics (per worker process)")
+    parser.add_argument("--request-log", help="append one JSON line per request to this file (implies --metrics)")
+    parser.add_argument("--max-sessions", type=int, default=200000, help="dialog sessions kept in memory")
+    parser.add_argument("--session-timeout", type=float, default=1800.0, help="idle seconds before a session expires")
+    parser.add_argument("--session-redis",
+                        help="keep dialog sessions in Redis at this URL (needed for sessions with --workers)")
+    parser.add_argument("--inverted-index", action="store_true",
+                        help="find similar questions through an inverted index instead of scoring every question")
+    parser.add_argument("--max-postings", type=int,
+                        help="with --inverted-index, keep only this many entries per term (faster, may miss matches)")
+    parser.add_argument("--lsa", help="add a dense LSA tier with this projection (fitted by lsa_index.py)")
+    parser.add_argument("--lsa-int8", action="store_true", help="store the LSA vectors as int8 (4x less memory)")
+    args = parser.parse_args()
+    retrieval = None
+    if args.inverted_index:
+        from retrieval import InvertedIndex
+        retrieval = partial(InvertedIndex.build, max_postings=args.max_postings)
+    build = partial(build_chatbot, args.metrics, args.request_log, retrieval, args.lsa, args.lsa_int8)
+
+    if args.session_redis:
+        import redis
+        from session_store import RedisSessionStore
+        session_store = RedisSessionStore(redis.Redis.from_url(args.session_redis), idle_timeout=args.session_timeout)
+    else:
+        # With --workers each process has its own sessions, so a dialog only
+        # continues while the client keeps its connection to the same worker
+        session_store = MemorySessionStore(args.max_sessions, args.session_timeout)
+
+    server_options = {
+        "max_concurrency": args.max_concurrency,
+        "request_timeout": args.timeout,
+        "keep_alive_timeout": args.keep_alive,
+        "session_store": session_store
+    }
+    if args.workers > 0:
+        from prefork import PreforkServer
+        PreforkServer(build, args.workers, host=args.host, port=args.port,
+                      setup_worker=connect_database, **server_options).run()
+        return
+
+    chatbot, ml_model = build()
+    chatbot.nlp_processor.warm_up()  # Load NLTK now rather than during the first request
+    connect_database(chatbot)
+    server = ChatServer(chatbot, ml_model, host=args.host, port=args.port, **server_options)
+    try:
+        asyncio.run(server.serve(announce=True))
+    finally:
+        server.close()
+        ml_model.close()
+        if chatbot.metrics is not None:
+            chatbot.metrics.close()
+
+
+if __name__ == "__main__":
+    main()
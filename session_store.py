@@ -0,0 +1,140 @@
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+
+class Session:
+    """Conversation state of one user: whether the bot asked to be taught, and for which question"""
+
+    __slots__ = ("session_id", "awaiting_learning", "last_question", "last_seen")
+
+    def __init__(self, session_id, awaiting_learning=False, last_question="", last_seen=0.0):
+        self.session_id = session_id
+        self.awaiting_learning = awaiting_learning
+        self.last_question = last_question
+        self.last_seen = last_seen
+
+
+def new_session_id():
+    return secrets.token_urlsafe(16)
+
+
+class MemorySessionStore:
+    """
+    In-process sessions, kept in least-recently-used order.
+
+    A session idle for more than idle_timeout seconds is gone; beyond
+    max_sessions the least recently used one is dropped, so memory stays
+    bounded (about 275 bytes per session, see benchmarks/session_bench.py).
+    Expired sessions at the old end are swept on every create(), which is
+    cheap because the order is also the order of last use.
+    """
+
+    def __init__(self, max_sessions=200000, idle_timeout=1800.0, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()  # session id -> Session, least recently used first
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self):
+        now = self.clock()
+        session = Session(new_session_id(), last_seen=now)
+        with self.lock:
+            self._sweep(now)
+            self.sessions[session.session_id] = session
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+                self.evicted += 1
+        return session
+
+    def get(self, session_id):
+        """The live session with this id, or None if it never existed or has expired"""
+        now = self.clock()
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            if now - session.last_seen > self.idle_timeout:
+                del self.sessions[session_id]
+                self.expired += 1
+                return None
+            session.last_seen = now
+            self.sessions.move_to_end(session_id)
+            return session
+
+    def save(self, session):
+        """Record a change to a session (in memory the object is already shared; this only touches it)"""
+        with self.lock:
+            if session.session_id in self.sessions:
+                session.last_seen = self.clock()
+                self.sessions.move_to_end(session.session_id)
+
+    def delete(self, session_id):
+        with self.lock:
+            self.sessions.pop(session_id, None)
+
+    def _sweep(self, now):
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session.last_seen <= self.idle_timeout:
+                return
+            self.sessions.popitem(last=False)
+            self.expired += 1
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "sessions": len(self.sessions),
+                "max_sessions": self.max_sessions,
+                "expired": self.expired,
+                "evicted": self.evicted
+            }
+
+
+class RedisSessionStore:
+    """
+    Sessions in an external key-value store shared by every server process.
+
+    client is any object with the redis-py getex/set/delete methods (e.g.
+    redis.Redis(...)); each session is one key that the store itself
+    expires after idle_timeout seconds, refreshed by every read and write.
+    The value is a flag character followed by the pending question, a few
+    dozen bytes per session.
+    """
+
+    def __init__(self, client, prefix="chatbot:session:", idle_timeout=1800.0):
+        self.client = client
+        self.prefix = prefix
+        self.idle_timeout = idle_timeout
+        self.ttl = max(1, int(idle_timeout))
+
+    def create(self):
+        session = Session(new_session_id(), last_seen=time.time())
+        self.save(session)
+        return session
+
+    def get(self, session_id):
+        # Reading counts as activity, like in memory: refresh the expiry in the same round trip
+        value = self.client.getex(self.prefix + session_id, ex=self.ttl)
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            value = value.decode("utf-8")
+        return Session(session_id, value[:1] == "1", value[1:], time.time())
+
+    def save(self, session):
+        value = ("1" if session.awaiting_learning else "0") + session.last_question
+        self.client.set(self.prefix + session.session_id, value, ex=self.ttl)
+
+    def delete(self, session_id):
+        self.client.delete(self.prefix + session_id)
+
+    def stats(self):
+        return {"backend": "redis", "prefix": self.prefix}
@@ -0,0 +1,54 @@
+from bulk_io import import_pairs, read_pairs, write_pairs
+from database_manager import DatabaseManager, SQLiteBackend
+from ml_model import MLModel
+from test_ml_model import TOPIC_PAIRS
+
+PAIRS = [
+    ("What is the fee, roughly?", 'About "$50", paid online.'),
+    ("Multi-line\nquestion", "Answer with a trailing comma,"),
+    ("Café hours?", "Ouvert à 8h."),
+]
+
+
+def test_pairs_round_trip_in_both_formats(tmp_path):
+    for name in ("pairs.csv", "pairs.jsonl"):
+        path = str(tmp_path / name)
+        assert write_pairs(iter(PAIRS), path) == len(PAIRS)
+        stats = {}
+        assert list(read_pairs(path, stats=stats)) == PAIRS
+        assert stats == {"read": 3, "skipped": 0}
+
+
+def test_malformed_rows_are_skipped_and_counted(tmp_path):
+    path = tmp_path / "pairs.jsonl"
+    path.write_text('{"question": "q1", "response": "r1"}\nnot json\n\n{"question": "q2"}\n'
+                    '{"question": " ", "response": "r"}\n{"question": "q3", "response": "r3"}\n', encoding="utf-8")
+    stats = {}
+    assert list(read_pairs(str(path), stats=stats)) == [("q1", "r1"), ("q3", "r3")]
+    assert stats == {"read": 2, "skipped": 4}
+
+
+def test_import_learns_in_chunks_with_one_snapshot(tmp_path):
+    corpus = str(tmp_path / "pairs.csv")
+    write_pairs(iter(TOPIC_PAIRS), corpus)
+    db_manager = DatabaseManager(backend=SQLiteBackend())
+    db_manager.update_db("CREATE TABLE chatbot_responses (question TEXT, response TEXT)")
+
+    base = [("hi", "Hello!")]
+    chunked = MLModel(training_data=base, model_filename=str(tmp_path / "chunked.cbm"), snapshot_delay=3600.0)
+    whole = MLModel(training_data=base, model_filename=str(tmp_path / "whole.cbm"), snapshot_delay=3600.0)
+    saves = []
+    save_model = chunked.save_model
+    chunked.save_model = lambda: saves.append(save_model())
+    try:
+        stats = import_pairs(corpus, db_manager, chunked, batch_size=4, model_batch_size=8)
+        assert stats["inserted"] == len(TOPIC_PAIRS) and stats["failed_batches"] == 0
+        assert db_manager.query_db("SELECT COUNT(*) FROM chatbot_responses") == len(TOPIC_PAIRS)
+        assert len(saves) == 1
+        whole.update_many(TOPIC_PAIRS)
+        assert stats["learned"] == len(whole.training_data) - len(base)
+        assert list(chunked.training_data) == list(whole.training_data)
+    finally:
+        chunked.close()
+        whole.close()
+        db_manager.close()
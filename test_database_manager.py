@@ -0,0 +1,37 @@
+import sqlite3
+
+import pytest
+
+from database_manager import DatabaseManager, SQLiteBackend
+
+
+class CountingBackend(SQLiteBackend):
+    def __init__(self):
+        super().__init__()
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        return super().connect()
+
+
+def test_bad_query_is_not_retried():
+    backend = CountingBackend()
+    db_manager = DatabaseManager(backend=backend)
+    db_manager.execute("CREATE TABLE t (a TEXT)", commit=True)
+    with pytest.raises(sqlite3.ProgrammingError):
+        db_manager.execute("INSERT INTO t VALUES (%s)", ("one", "two"), commit=True)
+    assert backend.connects == 1
+    db_manager.close()
+
+
+def test_closed_connection_is_retried_on_a_new_one():
+    backend = CountingBackend()
+    db_manager = DatabaseManager(backend=backend)
+    db_manager.execute("CREATE TABLE t (a TEXT)", commit=True)
+    conn, _ = db_manager.pool.idle[0]
+    conn.close()
+    db_manager.execute("INSERT INTO t VALUES (%s)", ("one",), commit=True)
+    assert backend.connects == 2
+    assert db_manager.query_all("SELECT a FROM t") == [("one",)]
+    db_manager.close()
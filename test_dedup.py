@@ -0,0 +1,62 @@
+import numpy as np
+
+from dedup import clusters, first_of_each, similar_rows, tfidf_rows
+from ml_model import MLModel
+from test_ml_model import TOPIC_PAIRS
+from test_retrieval import random_rows
+
+
+def test_similar_rows_matches_brute_force():
+    question_matrix = random_rows(1500, 200, 5)
+    earlier, later, scores = similar_rows(question_matrix, 0.7, chunk_size=100)
+    product = (question_matrix @ question_matrix.T).tocoo()
+    above = (product.data > 0.7) & (product.row < product.col)
+    assert sorted(zip(earlier.tolist(), later.tolist())) == \
+        sorted(zip(product.row[above].tolist(), product.col[above].tolist()))
+    expected = question_matrix[earlier].multiply(question_matrix[later]).sum(axis=1)
+    assert np.allclose(scores, np.asarray(expected).ravel())
+
+
+def test_first_of_each_keeps_what_one_at_a_time_would():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        count = int(rng.integers(1, 12))
+        pairs = {tuple(sorted(rng.choice(count, 2, replace=False))) for _ in range(int(rng.integers(0, 15)))} \
+            if count > 1 else set()
+        earlier = np.array([a for a, _ in pairs], dtype=np.int64)
+        later = np.array([b for _, b in pairs], dtype=np.int64)
+        kept = []
+        for row in range(count):
+            if not any((row, other) in pairs or (other, row) in pairs for other in kept):
+                kept.append(row)
+        assert list(np.flatnonzero(first_of_each(count, earlier, later))) == kept
+
+
+def test_clusters_report_conflicting_answers():
+    pairs = [("fee for the course", "50"), ("the course fee", "60"), ("library hours", "8 to 5"),
+             ("hours of the library", "8 to 5"), ("parking", "Lot B")]
+    earlier, later, _ = similar_rows(tfidf_rows([q for q, _ in pairs]), 0.5)
+    found = clusters(pairs, earlier, later)
+    assert sorted(sorted(cluster.rows.tolist()) for cluster in found) == [[0, 1], [2, 3]]
+    assert [cluster.conflicting for cluster in sorted(found, key=lambda c: c.rows[0])] == [True, False]
+
+
+def test_update_many_keeps_what_update_model_would(tmp_path):
+    base = TOPIC_PAIRS[::2]
+    # Known questions reworded, new ones, and near-duplicates within the batch
+    batch = [(q.replace("question", "a question"), a) for q, a in TOPIC_PAIRS[::3]] + TOPIC_PAIRS[1::2] + \
+        [(q + " today", "Ask at the front desk.") for q, _ in TOPIC_PAIRS[1::4]]
+    for incremental in (False, True):
+        batched = MLModel(training_data=base, model_filename=str(tmp_path / f"many{incremental}.cbm"),
+                          incremental=incremental, snapshot_delay=3600.0)
+        single = MLModel(training_data=base, model_filename=str(tmp_path / f"single{incremental}.cbm"),
+                         incremental=incremental, snapshot_delay=3600.0)
+        try:
+            batched.update_many(batch, chunk_size=7)
+            for question, response in batch:
+                single.update_model(question, response)
+            assert list(batched.training_data) == list(single.training_data)
+            assert len(base) < len(batched.training_data) < len(base) + len(batch)
+        finally:
+            batched.close()
+            single.close()
@@ -0,0 +1,23 @@
+import random
+
+from inference_engine import Chatbot
+from knowledge_base import KnowledgeBase
+from ml_model import MLModel
+from nlp_processor import NLPProcessor
+from response_cache import ResponseCache
+from test_ml_model import TIER_QUERIES, TOPIC_PAIRS
+
+QUERIES = TIER_QUERIES + ["hello", "thank you so much", "what courses do you offer", "hello", "vehicle garage permit"]
+
+
+def test_process_queries_matches_process_query(tmp_path):
+    ml_model = MLModel(training_data=TOPIC_PAIRS, model_filename=str(tmp_path / "model.cbm"))
+    try:
+        for response_cache in (None, ResponseCache()):
+            chatbot = Chatbot(KnowledgeBase(), NLPProcessor(), ml_model, response_cache=response_cache)
+            random.seed(0)  # Static responses are drawn at random, in input order
+            expected = [chatbot.process_query(query) for query in QUERIES]
+            random.seed(0)
+            assert chatbot.process_queries(QUERIES) == expected
+    finally:
+        ml_model.close()
@@ -0,0 +1,54 @@
+import random
+
+from intent_matcher import DEFAULT_RULES, IntentMatcher, PhraseMatcher
+
+
+def contains_phrase(tokens, phrase):
+    return any(tuple(tokens[i:i + len(phrase)]) == phrase for i in range(len(tokens) - len(phrase) + 1))
+
+
+def scan_rules(rules, tokens):
+    """The old classify_intent loop over the rules in order, with phrases matched as consecutive tokens"""
+    for rule in rules:
+        if any(contains_phrase(tokens, tuple(keyword.split())) for keyword in rule.get("any", [])):
+            return rule["intent"]
+        if rule.get("all") and all(word in tokens for word in rule["all"]):
+            return rule["intent"]
+    return "unknown"
+
+
+def random_token_lists(rules, count, seed):
+    rng = random.Random(seed)
+    vocabulary = sorted({token for rule in rules for keyword in rule.get("any", []) + rule.get("all", [])
+                         for token in keyword.split()})
+    vocabulary += ["the", "a", "what", "is", "of", "zebra"]
+    return [[rng.choice(vocabulary) for _ in range(rng.randint(0, 8))] for _ in range(count)]
+
+
+def test_matches_rule_scan_on_random_tokens():
+    matcher = IntentMatcher()
+    for tokens in random_token_lists(DEFAULT_RULES, 20000, 0):
+        assert matcher.match(tokens) == scan_rules(DEFAULT_RULES, tokens), tokens
+
+
+def test_phrases_and_priority():
+    matcher = IntentMatcher()
+    assert matcher.match("i want to get in touch".split()) == "contact_info"
+    assert matcher.match("see you".split()) == "goodbye"
+    assert matcher.match("you see".split()) == "how_are_you"  # "you" alone, a later rule than the phrase
+    assert matcher.match("how are you hello".split()) == "greeting"  # Earlier rule wins over word order
+    assert matcher.match([]) == "unknown"
+
+
+def test_phrase_matcher_finds_every_occurrence():
+    rng = random.Random(1)
+    alphabet = ["a", "b", "c"]
+    phrases = list({tuple(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(30)})
+    matcher = PhraseMatcher((phrase, i) for i, phrase in enumerate(phrases))
+    for _ in range(500):
+        tokens = [rng.choice(alphabet) for _ in range(rng.randint(0, 12))]
+        state = 0
+        for end, token in enumerate(tokens, 1):
+            state, found = matcher.step(state, token)
+            expected = [i for i, phrase in enumerate(phrases) if tuple(tokens[max(end - len(phrase), 0):end]) == phrase]
+            assert sorted(found) == expected
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from lsa_index import DenseIndex, LsaProjection
+from test_retrieval import random_rows
+
+
+class Vocabulary:
+    def __init__(self, n_terms, offset=0):
+        self.vocabulary_ = {f"term{i + offset}": i for i in range(n_terms)}
+
+
+def fitted(rows=3000, terms=400, dimensions=32):
+    question_matrix = random_rows(rows, terms, 0)
+    responses = [f"answer {i % 300}" for i in range(rows)]
+    projection, _ = LsaProjection.fit(question_matrix, responses, Vocabulary(terms), dimensions)
+    return question_matrix, projection
+
+
+def top_k(scores, k):
+    return np.argsort(-scores, axis=0, kind='stable')[:k].T
+
+
+def test_int8_keeps_top_k_recall():
+    question_matrix, projection = fitted()
+    queries = projection.project(random_rows(200, 400, 1))
+    exact = DenseIndex.build(question_matrix, projection=projection).scores(queries)
+    quantized = DenseIndex.build(question_matrix, projection=projection, quantize=True)
+    assert np.abs(quantized.scores(queries) - exact).max() < 0.02
+    # Random rows have many near-ties, so a row found by int8 counts if its
+    # exact score is within rounding of the exact k-th best
+    kth = np.sort(exact, axis=0)[-10]
+    found = top_k(quantized.scores(queries), 10)
+    recall = np.mean([exact[rows, column] >= kth[column] - 0.01 for column, rows in enumerate(found)])
+    assert recall >= 0.99
+    assert quantized.nbytes() < DenseIndex.build(question_matrix, projection=projection).nbytes() / 3
+
+
+def test_appended_rows_score_like_a_full_build():
+    question_matrix, projection = fitted()
+    for quantize in (False, True):
+        previous = DenseIndex.build(question_matrix[:2900], projection=projection, quantize=quantize)
+        grown = DenseIndex.build(question_matrix, previous=previous, projection=projection, quantize=quantize)
+        assert len(grown.tail) == 100 and grown.rows == 3000
+        queries = projection.project(question_matrix[2900:])
+        assert [match[0] for match in grown.best_matches(question_matrix[2900:], 0.0)] == \
+            list(np.argmax(grown.scores(queries), axis=0))
+        assert np.allclose(grown.scores(queries)[2900:], queries @ queries.T, atol=1e-5)
+
+
+def test_saved_projection_checks_the_vocabulary(tmp_path):
+    _, projection = fitted()
+    path = str(tmp_path / "model.lsa")
+    projection.save(path)
+    loaded = LsaProjection.load(path)
+    assert np.array_equal(loaded.components, projection.components)
+    loaded.check(Vocabulary(450))  # Terms learned after fitting are fine
+    with pytest.raises(ValueError):
+        loaded.check(Vocabulary(400, offset=1))
@@ -0,0 +1,66 @@
+import json
+import re
+
+from metrics import Metrics
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_]\w*="[^"\\\n]*",?)*\})? (\S+)$')
+
+
+def parse_exposition(text):
+    """{family: {"type": ..., "samples": [(name, labels, value)]}}, checking the text format as it goes"""
+    assert text.endswith("\n")
+    families = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("# HELP "):
+            current = line.split()[2]
+            assert current not in families, f"{current} exported twice"
+            families[current] = {"type": None, "samples": []}
+        elif line.startswith("# TYPE "):
+            _, _, name, kind = line.split()
+            assert name == current and kind in ("counter", "gauge", "histogram")
+            families[name]["type"] = kind
+        else:
+            match = SAMPLE.match(line)
+            assert match, line
+            name, labels, value = match.group(1), match.group(2) or "", float(match.group(3))
+            assert name == current or name.startswith(current + "_"), line
+            families[current]["samples"].append((name, labels, value))
+    return families
+
+
+def test_export_is_well_formed_prometheus_text():
+    metrics = Metrics()
+    metrics.gauge("chatbot_model_pairs", "Pairs", lambda: 42)
+    metrics.gauge("chatbot_missing", "Not available", lambda: None)
+    for seconds in (0.0002, 0.003, 0.003, 7.0):
+        trace = metrics.trace("chat")
+        trace.stages["similarity"] = seconds
+        trace.hit("exact")
+        metrics.record(trace, seconds, {})
+
+    families = parse_exposition(metrics.export())
+    assert families["chatbot_model_pairs"]["samples"] == [("chatbot_model_pairs", "", 42.0)]
+    assert "chatbot_missing" not in families
+    assert families["chatbot_tier_hits_total"]["samples"] == \
+        [("chatbot_tier_hits_total", '{kind="chat",tier="exact"}', 4.0)]
+
+    samples = families["chatbot_stage_seconds"]["samples"]
+    buckets = [value for name, _, value in samples if name.endswith("_bucket")]
+    assert buckets == sorted(buckets)  # Cumulative
+    assert buckets[-1] == 4.0 and '+Inf' in [labels for name, labels, _ in samples if name.endswith("_bucket")][-1]
+    assert [value for name, _, value in samples if name.endswith("_count")] == [4.0]
+    assert abs(sum(value for name, _, value in samples if name.endswith("_sum")) - 7.0062) < 1e-9
+
+
+def test_request_log_writes_one_json_line_per_request(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    metrics = Metrics(request_log=str(path))
+    trace = metrics.trace("chat")
+    trace.mark("parse")
+    trace.hit("nb")
+    trace.finish(intent="unknown")
+    metrics.close()
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    assert entry["kind"] == "chat" and entry["tiers"] == {"nb": 1} and entry["intent"] == "unknown"
+    assert set(entry["stages_ms"]) == {"parse"}
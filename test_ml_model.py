@@ -0,0 +1,131 @@
+from itertools import combinations
+
+from model_artifact import read_artifact
+from ml_model import MLModel, training_data
+from retrieval import InvertedIndex
+
+TOPICS = {
+    "Parking permits are sold at the security office.": ["parking", "car", "permit", "garage", "vehicle"],
+    "The library opens at eight every morning.": ["library", "books", "study", "reading", "borrow"],
+    "Tuition is paid through the student portal.": ["tuition", "fees", "payment", "invoice", "portal"]
+}
+TOPIC_PAIRS = [(f"question about {a} and {b}", answer)
+               for answer, words in TOPICS.items() for a, b in combinations(words, 2)]
+# Exact, similarity, naive Bayes and no answer, in that order of tiers
+TIER_QUERIES = [
+    "question about parking and car", "Question about parking, and car!",
+    "where do i buy a parking permit for my car", "books to borrow from the library",
+    "vehicle garage permit", "invoice fees portal", "hi", "nothing matches zebra giraffe", ""
+]
+
+
+class TierTrace:
+    """Records the tier that answered, like metrics.RequestTrace"""
+
+    def __init__(self):
+        self.tier = None
+
+    def mark(self, stage):
+        pass
+
+    def hit(self, tier):
+        self.tier = tier
+
+
+def test_incremental_update_model_learns_question_with_new_words(tmp_path):
+    ml_model = MLModel(training_data=training_data, model_filename=str(tmp_path / "model.cbm"), incremental=True)
+    try:
+        question = "what courses are available for xylophone harpsichord bagpipe repair"
+        answer = "Instrument repair is taught in the music workshop."
+        assert ml_model.update_model(question, answer)
+        assert len(ml_model.training_data) == len(training_data) + 1
+        assert ml_model.get_response(question) == answer
+    finally:
+        ml_model.close()
+
+
+def test_update_model_skips_similar_question(tmp_path):
+    for incremental in (False, True):
+        ml_model = MLModel(training_data=training_data, model_filename=str(tmp_path / f"{incremental}.cbm"),
+                           incremental=incremental)
+        try:
+            assert ml_model.update_model("which courses are available", "Something else entirely.")
+            assert len(ml_model.training_data) == len(training_data)
+        finally:
+            ml_model.close()
+
+
+def test_saved_model_keeps_its_learning_mode(tmp_path):
+    filename = str(tmp_path / "model.cbm")
+    MLModel(training_data=training_data, model_filename=filename, incremental=True).close()
+    for incremental in (None, False):
+        ml_model = MLModel(model_filename=filename, incremental=incremental)
+        ml_model.close()
+        assert ml_model.incremental
+        assert read_artifact(filename)[1]["incremental"]
+
+
+def test_get_responses_matches_get_response(tmp_path):
+    for incremental in (False, True):
+        for retrieval in (None, InvertedIndex.build):
+            ml_model = MLModel(training_data=TOPIC_PAIRS, model_filename=str(tmp_path / f"{incremental}.cbm"),
+                               incremental=incremental, retrieval=retrieval)
+            try:
+                tiers = set()
+                for query in TIER_QUERIES:
+                    trace = TierTrace()
+                    ml_model.respond(ml_model.parse(query), trace)
+                    tiers.add(trace.tier)
+                assert tiers == {"exact", "similarity", "nb", None}
+                expected = [ml_model.get_response(query) for query in TIER_QUERIES]
+                assert ml_model.get_responses(TIER_QUERIES) == expected
+            finally:
+                ml_model.close()
+            for filename in tmp_path.iterdir():
+                filename.unlink()
+
+
+def test_learning_reuses_the_compiled_classifier_until_a_save(tmp_path):
+    ml_model = MLModel(training_data=TOPIC_PAIRS[::2], model_filename=str(tmp_path / "model.cbm"), incremental=True,
+                       snapshot_delay=3600.0)
+    try:
+        compiled = ml_model.snapshot.model._log_ratio
+        for question, answer in TOPIC_PAIRS[1::2]:
+            assert ml_model.update_model(question, answer)
+            assert ml_model.snapshot.model._log_ratio is compiled
+        assert ml_model.snapshot.model._corrections is not None
+        version = ml_model.version
+        expected = [ml_model.get_response(query) for query in TIER_QUERIES]
+
+        ml_model.save_model()
+        assert ml_model.snapshot.model._corrections is None
+        assert ml_model.version == version
+        assert [ml_model.get_response(query) for query in TIER_QUERIES] == expected
+    finally:
+        ml_model.close()
+
+
+def test_reload_model_maps_a_version_saved_elsewhere(tmp_path):
+    filename = str(tmp_path / "model.cbm")
+    learner = MLModel(training_data=TOPIC_PAIRS, model_filename=filename, incremental=True, snapshot_delay=3600.0)
+    learner.save_model()
+    reader = MLModel(model_filename=filename, snapshot_delay=3600.0, retrieval=InvertedIndex.build)
+    try:
+        assert not reader.reload_model()
+        question = "where is the xylophone repair workshop"
+        answer = "Instrument repair is taught in the music workshop."
+        assert learner.update_model(question, answer)
+        learner.save_model()
+        retriever = reader.snapshot.retriever
+        version = reader.version
+
+        assert reader.reload_model()
+        assert reader.version == version + 1
+        assert reader.get_response(question) == answer
+        assert reader.snapshot.retriever.postings is retriever.postings  # Rows were only appended
+        assert [reader.get_response(query) for query in TIER_QUERIES] == \
+            [learner.get_response(query) for query in TIER_QUERIES]
+        assert not reader.reload_model()
+    finally:
+        reader.close()
+        learner.close()
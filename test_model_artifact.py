@@ -0,0 +1,23 @@
+import os
+
+import numpy as np
+
+from model_artifact import read_artifact, write_artifact
+
+
+def test_write_leaves_mapped_version_in_place(tmp_path):
+    path = str(tmp_path / "model.cbm")
+    write_artifact(path, {"values": np.arange(4)}, {"generation": 1})
+    old, meta = read_artifact(path)
+    old_file = old["values"].filename
+
+    write_artifact(path, {"values": np.arange(4) * 10}, {"generation": 2})
+    new, meta = read_artifact(path)
+    assert meta["generation"] == 2
+    assert list(new["values"]) == [0, 10, 20, 30]
+    assert new["values"].filename != old_file
+    assert list(old["values"]) == [0, 1, 2, 3]
+
+    del old, new
+    write_artifact(path, {"values": np.arange(4)}, {"generation": 3})
+    assert sorted(os.listdir(tmp_path)) == ["model.cbm", "model.cbm.3"]
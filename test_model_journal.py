@@ -0,0 +1,47 @@
+from ml_model import MLModel, training_data
+from model_journal import ModelJournal
+
+
+def test_torn_line_is_skipped_and_terminated(tmp_path):
+    path = str(tmp_path / "model.journal")
+    journal = ModelJournal(path)
+    journal.append("first question", "first answer")
+    journal.append("second question", "second answer")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 3, "q": "torn qu')  # Crash in the middle of an append
+
+    journal = ModelJournal(path)
+    assert journal.last_seq == 2
+    assert journal.append("third question", "third answer") == 3
+    journal.close()
+    assert [q for _, q, _ in ModelJournal(path).entries()] == ["first question", "second question", "third question"]
+
+
+def test_compact_keeps_records_after_snapshot(tmp_path):
+    journal = ModelJournal(str(tmp_path / "model.journal"))
+    for i in range(5):
+        journal.append(f"question {i}", f"answer {i}")
+    journal.compact(3)
+    assert [seq for seq, _, _ in journal.entries()] == [4, 5]
+    assert journal.append("question 5", "answer 5") == 6
+    journal.close()
+
+
+def test_model_replays_journal_after_torn_line(tmp_path):
+    filename = str(tmp_path / "model.cbm")
+    MLModel(training_data=training_data, model_filename=filename).close()
+
+    journal = ModelJournal(f"{filename}.journal")
+    journal.append("where can students park their bicycles", "Bicycle racks are next to the library.")
+    journal.close()
+    with open(f"{filename}.journal", "a", encoding="utf-8") as f:
+        f.write('{"seq": 2, "q": "how do i')
+
+    ml_model = MLModel(model_filename=filename)
+    try:
+        assert len(ml_model.training_data) == len(training_data) + 1
+        assert ml_model.get_response("where can students park their bicycles") == \
+            "Bicycle racks are next to the library."
+    finally:
+        ml_model.close()
@@ -0,0 +1,38 @@
+from nltk.tokenize import word_tokenize
+
+from nlp_processor import PUNCTUATION, NLPProcessor, split_words
+
+TRICKY = [
+    "Don't you know what's the fee?",
+    "I can't, won't and shouldn't've gone",
+    "cannot Cannot CANNOT cannots",
+    "gimme lemme gonna gotta wanna Gimme",
+    "gimmee wannabe gonnas got ta",
+    '"Quoted" text and \'single quotes\' and ``ticks\'\'',
+    "Wait... what... really...",
+    "Ends with a period.",
+    "Two sentences. Second one ends here.",
+    "U.S.A. and e.g. and etc.",
+    "email me at a.b@example.com, thanks!",
+    "It costs $5.00 (or 5%)... right?",
+    "tabs\tand\nnewlines  and   spaces",
+    "snake_case_word and under_score_",
+    "Café naïve résumé",
+    "  leading and trailing  ",
+    "",
+    "...",
+    "'",
+]
+
+
+def test_split_words_matches_nltk_after_punctuation_removal():
+    for text in TRICKY:
+        text = PUNCTUATION.sub('', text.lower())
+        assert split_words(text) == word_tokenize(text, preserve_line=True), text
+
+
+def test_fast_preprocess_matches_nltk_path():
+    fast, reference = NLPProcessor(fast=True), NLPProcessor(fast=False)
+    for text in TRICKY:
+        assert fast.preprocess(text) == reference.preprocess(text), text
+    assert fast.preprocess_many(TRICKY) == reference.preprocess_many(TRICKY)
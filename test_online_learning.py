@@ -0,0 +1,104 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.naive_bayes import MultinomialNB
+
+from online_learning import GrowingTfidfVectorizer, IncrementalNB, append_rows, pad_columns
+
+
+def random_counts(rows, columns, seed):
+    rng = np.random.default_rng(seed)
+    X = sp.random(rows, columns, density=0.1, format='csr', random_state=seed)
+    X.data = rng.integers(1, 4, size=X.nnz).astype(np.float64)
+    y = [f"class {i}" for i in rng.integers(0, 5, size=rows)]
+    return X, y
+
+
+def test_fit_matches_multinomial_nb():
+    X, y = random_counts(200, 50, 0)
+    expected = MultinomialNB(alpha=0.5).fit(X, y)
+    model = IncrementalNB(alpha=0.5).fit(X, y)
+    order = [model.classes_.index(c) for c in expected.classes_]
+    assert np.allclose(model.predict_proba(X)[:, order], expected.predict_proba(X))
+    assert model.predict(X) == list(expected.predict(X))
+
+
+def test_partial_fit_with_new_classes_and_features_matches_full_fit():
+    X, y = random_counts(300, 60, 1)
+    model = IncrementalNB()
+    chunks = []
+    # Each chunk is only as wide as the vocabulary so far, as with GrowingTfidfVectorizer
+    for start, columns in ((0, 20), (100, 40), (200, 60)):
+        chunk = X[start:start + 100, :columns]
+        model.partial_fit(chunk, y[start:start + 100])
+        chunks.append(pad_columns(chunk, X.shape[1]))
+    X = sp.vstack(chunks, format='csr')
+    expected = MultinomialNB().fit(X, y)
+    order = [model.classes_.index(c) for c in expected.classes_]
+    assert np.allclose(model.predict_proba(X)[:, order], expected.predict_proba(X))
+
+
+def test_compiled_model_learns_again():
+    X, y = random_counts(200, 50, 2)
+    model = IncrementalNB().fit(X[:100], y[:100])
+    log_ratio, class_total = model.compiled()
+    restored = IncrementalNB.from_compiled(list(model.classes_), model.class_count_, class_total, log_ratio,
+                                           model.n_features_in_)
+    restored.partial_fit(X[100:], y[100:])
+    model.partial_fit(X[100:], y[100:])
+    assert np.allclose(restored.predict_proba(X), model.predict_proba(X))
+
+
+def test_learning_one_row_at_a_time_leaves_copies_unchanged():
+    X, y = random_counts(300, 60, 3)
+    model = IncrementalNB().fit(X[:100], y[:100])
+    first = model
+    before = first.predict_proba(X)
+    rows = [X[:100]]
+    for i in range(100, 300):
+        rows.append(pad_columns(X[i:i + 1, :40 + i // 10], X.shape[1]))  # Vocabulary growing as it learns
+        model = model.copy()
+        model.partial_fit(X[i:i + 1, :40 + i // 10], y[i:i + 1])
+    assert np.array_equal(first.predict_proba(X), before)
+    X = sp.vstack(rows, format='csr')
+
+    expected = MultinomialNB().fit(X, y)
+    order = [list(model.classes_).index(c) for c in expected.classes_]
+    assert np.allclose(model.predict_proba(X)[:, order], expected.predict_proba(X))
+    assert np.allclose(model.merged().predict_proba(X), model.predict_proba(X))
+    log_ratio, _ = model.compiled()
+    assert np.allclose(log_ratio.toarray(), np.log1p(expected.feature_count_[np.argsort(order)]))
+
+
+def test_model_learns_again_from_a_dropped_copy():
+    X, y = random_counts(200, 50, 4)
+    model = IncrementalNB().fit(X[:100], y[:100])
+    model.partial_fit(X[100:150], y[100:150])
+    model.copy().partial_fit(X[150:200], ["dropped"] * 50)  # e.g. learning failed after this
+    model = model.copy().partial_fit(X[150:200], y[150:200])
+    assert "dropped" not in list(model.classes_)
+    expected = MultinomialNB().fit(X, y)
+    order = [list(model.classes_).index(c) for c in expected.classes_]
+    assert np.allclose(model.predict_proba(X)[:, order], expected.predict_proba(X))
+
+
+def test_appended_rows_leave_earlier_views_unchanged():
+    X, _ = random_counts(40, 30, 5)
+    views = [append_rows(None, X[:1])]
+    for i in range(1, 40):
+        views.append(append_rows(views[-1], X[i:i + 1]))
+    stale = append_rows(views[9], X[30:])  # Copied, since views[10] was made from views[9]
+    for i, view in enumerate(views):
+        assert np.array_equal(view.toarray(), X[:i + 1].toarray())
+    assert np.array_equal(stale.toarray(), sp.vstack([X[:10], X[30:]]).toarray())
+
+
+def test_vectorizer_copies_share_the_vocabulary():
+    vectorizer = GrowingTfidfVectorizer()
+    vectorizer.fit(["what are the tuition fees", "when does the library open"])
+    learner = vectorizer.copy()
+    preview = learner.learning_rows(["library fees for new students"])
+    rows = learner.partial_fit_transform(["library fees for new students"])
+    assert np.allclose(preview.toarray(), rows.toarray())
+    assert "students" in learner.vocabulary_ and "students" not in vectorizer.vocabulary_
+    assert vectorizer.transform(["new students"]).nnz == 0
+    assert vectorizer.transform(["library fees"]).shape[1] == vectorizer.n_terms
@@ -0,0 +1,43 @@
+from response_cache import MISSING, ResponseCache, normalize_text
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = ResponseCache(ttl=10.0, clock=clock)
+    cache.put("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache.entries) == 0
+
+
+def test_other_version_is_a_miss():
+    cache = ResponseCache()
+    cache.put("q", None, version=1)  # None is a cached answer, told apart from a miss by MISSING
+    assert cache.get("q", 1, MISSING) is None
+    assert cache.get("q", 2, MISSING) is MISSING
+    assert cache.get("q", 1, MISSING) is MISSING  # The stale entry was dropped
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_normalize_text():
+    assert normalize_text("  What's   the FEE?! ") == "whats the fee"
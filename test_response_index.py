@@ -0,0 +1,59 @@
+from database_manager import DatabaseManager, SQLiteBackend
+from knowledge_base import KnowledgeBase
+from response_index import ResponseIndex
+
+
+def make_table(rows):
+    db_manager = DatabaseManager(backend=SQLiteBackend())
+    db_manager.update_db("CREATE TABLE chatbot_responses (question TEXT, response TEXT, updated_at TEXT)")
+    for row in rows:
+        db_manager.update_db("INSERT INTO chatbot_responses VALUES (%s, %s, %s)", row)
+    return db_manager
+
+
+def test_lookup_ignores_case_and_trailing_spaces_only():
+    db_manager = make_table([("What is the fee?", "The fee is $50.", "2024-01-01 10:00:00")])
+    index = ResponseIndex(db_manager)
+    assert index.load()
+    assert index.lookup("what is the FEE?  ") == "The fee is $50."
+    assert index.lookup(" what is the fee?") is None
+    db_manager.close()
+
+
+def test_refresh_picks_up_rows_changed_since_the_last_load():
+    db_manager = make_table([("a", "old a", "2024-01-01 10:00:00"), ("b", "old b", "2024-01-01 10:00:00")])
+    index = ResponseIndex(db_manager)
+    assert index.load()
+    db_manager.update_db("UPDATE chatbot_responses SET response = %s, updated_at = %s WHERE question = %s",
+                         ("new a", "2024-01-02 09:00:00", "a"))
+    db_manager.update_db("INSERT INTO chatbot_responses VALUES (%s, %s, %s)", ("c", "new c", "2024-01-02 09:00:00"))
+    db_manager.update_db("DELETE FROM chatbot_responses WHERE question = %s", ("b",))
+    assert index.refresh()
+    assert (index.lookup("a"), index.lookup("c")) == ("new a", "new c")
+    assert index.lookup("b") == "old b"  # Deletions wait for the next full reload
+    assert index.watermark == "2024-01-02 09:00:00"
+
+    index.full_reload_interval = 0.0
+    assert index.refresh()
+    assert index.lookup("b") is None
+    db_manager.close()
+
+
+def test_table_without_updated_at_is_reloaded_in_full():
+    db_manager = DatabaseManager(backend=SQLiteBackend())
+    db_manager.update_db("CREATE TABLE chatbot_responses (question TEXT, response TEXT)")
+    db_manager.update_db("INSERT INTO chatbot_responses VALUES (%s, %s)", ("a", "answer a"))
+    index = ResponseIndex(db_manager)
+    assert index.refresh()
+    assert index.updated_column is None and index.lookup("a") == "answer a"
+    db_manager.update_db("DELETE FROM chatbot_responses")
+    assert index.refresh()
+    assert index.lookup("a") is None
+    db_manager.close()
+
+
+def test_database_answers_until_the_first_load():
+    db_manager = make_table([("a", "answer a", "2024-01-01 10:00:00")])
+    knowledge_base = KnowledgeBase(db_manager, ResponseIndex(db_manager))
+    assert knowledge_base.fetch_dynamic_data("a") == "answer a"
+    db_manager.close()
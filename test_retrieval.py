@@ -0,0 +1,56 @@
+import numpy as np
+import scipy.sparse as sp
+
+from online_learning import l2_normalize
+from retrieval import InvertedIndex
+
+
+def random_rows(rows, columns, seed):
+    # Few terms per row from a skewed vocabulary, so many rows share terms
+    rng = np.random.default_rng(seed)
+    indptr = np.arange(0, 4 * rows + 1, 4)
+    indices = (rng.zipf(1.5, size=4 * rows) - 1) % columns
+    matrix = sp.csr_matrix((rng.random(4 * rows) + 0.1, indices, indptr), shape=(rows, columns))
+    matrix.sum_duplicates()
+    return l2_normalize(sp.csr_matrix(matrix, dtype=np.float32))
+
+
+def brute_force(question_matrix, vector, threshold):
+    scores = (question_matrix @ vector.T).toarray().ravel()
+    best = int(np.argmax(scores))
+    return (best, float(scores[best])) if scores[best] > threshold else None
+
+
+def test_best_match_matches_brute_force():
+    question_matrix = random_rows(2000, 300, 0)
+    queries = random_rows(200, 300, 1)
+    index = InvertedIndex.build(question_matrix)
+    for threshold in (0.3, 0.7):
+        for i in range(queries.shape[0]):
+            found = index.best_match(queries[i], threshold)
+            expected = brute_force(question_matrix, queries[i], threshold)
+            if expected is None:
+                assert found is None
+            else:
+                assert found is not None and np.isclose(found[1], expected[1], atol=1e-5)
+
+
+def test_best_match_covers_rows_appended_after_build():
+    question_matrix = random_rows(2000, 300, 2)
+    index = InvertedIndex.build(question_matrix[:1900])
+    index = InvertedIndex.build(question_matrix, previous=index)
+    assert index.indexed_rows == 1900
+    for i in range(1900, 2000):
+        found = index.best_match(question_matrix[i], 0.7)
+        assert found is not None and np.isclose(found[1], brute_force(question_matrix, question_matrix[i], 0.7)[1])
+
+
+def test_all_matches_matches_brute_force():
+    question_matrix = random_rows(1000, 200, 3)
+    queries = random_rows(300, 200, 4)
+    inputs, rows, scores = InvertedIndex.build(question_matrix).all_matches(queries, 0.6, chunk_size=64)
+    expected = (queries @ question_matrix.T).tocoo()
+    above = expected.data > 0.6
+    assert sorted(zip(inputs.tolist(), rows.tolist())) == \
+        sorted(zip(expected.row[above].tolist(), expected.col[above].tolist()))
+    assert np.allclose(scores, np.asarray((queries[inputs].multiply(question_matrix[rows])).sum(axis=1)).ravel())
@@ -0,0 +1,218 @@
+"""
+Offline training: stream a corpus of pairs into a ready-to-serve model artifact.
+
+    python train.py corpus.jsonl --output chatbot_model.cbm --workers 8
+    python server.py            # serves chatbot_model.cbm
+
+Whatever opens the artifact learns in the mode it was trained in (--incremental
+or not), so it is never retrained just because it was opened.
+
+The file (CSV or JSONL, see bulk_io) is read in chunks, and a pool of
+processes turns each chunk into term counts in parallel, which is where
+training spends its time. The parent merges the chunk vocabularies, and once
+the whole corpus is counted it weights the rows with the final IDF and adds
+up the naive Bayes statistics block by block.
+
+Only a few chunks are in flight at a time, so the raw corpus and its term
+lists are never held whole. Training is not out-of-core, though: the parent
+keeps every pair and the whole count matrix until the artifact is written,
+and the weighted question matrix and classifier are built beside them, so
+peak memory grows linearly with the corpus. Expect about four times the
+size of the resulting artifact (measured: 190 MB for 100k pairs, 570 MB for
+400k pairs); larger corpora need a machine with that much memory. The model
+is the one MLModel would train on the same pairs in memory: same
+vocabulary, weights and classifier.
+Near-duplicates are kept as they are; clean the corpus with dedup.py first
+if needed.
+"""
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+
+from bulk_io import batched, read_pairs
+from ml_model import MLModel, ModelSnapshot, question_rows
+from model_artifact import PairTable, remove_artifact
+from online_learning import FrozenTfidfVectorizer, GrowingTfidfVectorizer, IncrementalNB, TextAnalyzer, pad_columns
+from response_cache import normalize_text
+
+# State of each worker process, set once by init_worker
+_analyzer = None
+
+
+def init_worker(analyzer):
+    global _analyzer
+    _analyzer = analyzer
+
+
+def count_chunk(pairs):
+    """
+    A chunk's cleaned pairs with the raw term counts of its questions; columns
+    are numbered by the chunk's own terms, returned in order of first occurrence
+    """
+    pairs = [(normalize_text(q), r) for q, r in pairs]
+    features = GrowingTfidfVectorizer(analyzer=_analyzer)
+    counts = features.count([q for q, _ in pairs], grow=True)
+    return pairs, list(features.vocabulary_), counts
+
+
+def ordered_map(executor, function, chunks, window):
+    """Results of function over chunks in order, with at most window chunks submitted at a time"""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(function, chunk))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class ClassSums:
+    """Per-answer feature sums added up chunk by chunk, folded into one matrix whenever they double"""
+
+    def __init__(self, n_classes, n_features):
+        self.n_classes = n_classes
+        self.n_features = n_features
+        self.folded = sp.coo_matrix((0, n_features), dtype=np.float64)
+        self.parts = []
+        self.pending = 0
+
+    def add(self, rows, columns, data):
+        """Add (answer, term, sum) entries"""
+        self.parts.append((rows, columns, data))
+        self.pending += len(data)
+        if self.pending > max(self.folded.nnz, 1 << 20):
+            self.fold()
+
+    def fold(self):
+        """The sums so far as one CSR matrix (answers x terms)"""
+        rows = [self.folded.row] + [part[0] for part in self.parts]
+        columns = [self.folded.col] + [part[1] for part in self.parts]
+        data = [self.folded.data] + [part[2] for part in self.parts]
+        folded = sp.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(columns))),
+            shape=(self.n_classes, self.n_features)
+        )
+        self.folded = folded.tocoo()
+        self.parts = []
+        self.pending = 0
+        return folded
+
+
+def train(path, fmt=None, incremental=False, workers=None, chunk_size=5000):
+    """Count a corpus file in parallel and fit the model on it; returns (ModelSnapshot, stats)"""
+    workers = workers or os.cpu_count() or 1
+    analyzer = TextAnalyzer()
+    stats = {}
+
+    training_data = PairTable()
+    terms = {}  # Term -> column, in order of first occurrence
+    classes = {}
+    labels = []
+    chunk_counts = []
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(analyzer,)) as executor:
+        chunks = batched(read_pairs(path, fmt, stats), chunk_size)
+        for pairs, chunk_terms, counts in ordered_map(executor, count_chunk, chunks, 2 * workers):
+            training_data.extend(pairs)
+            labels.extend(classes.setdefault(r, len(classes)) for _, r in pairs)
+            columns = np.array([terms.setdefault(term, len(terms)) for term in chunk_terms], dtype=np.int32)
+            chunk_counts.append(sp.csr_matrix((counts.data, columns[counts.indices], counts.indptr),
+                                              shape=(counts.shape[0], len(terms))))
+    if not terms:
+        raise ValueError(f"{path} has no questions with terms to learn from")
+
+    counts = sp.vstack([pad_columns(chunk, len(terms)) for chunk in chunk_counts], format='csr')
+    del chunk_counts
+    n_documents = counts.shape[0]
+    document_frequency = np.bincount(counts.indices, minlength=len(terms))
+    if incremental:
+        # Columns in order of first occurrence, like GrowingTfidfVectorizer
+        vectorizer = GrowingTfidfVectorizer(analyzer=analyzer).restore(terms, document_frequency, n_documents)
+    else:
+        # Columns in term order, like TfidfVectorizer
+        order = sorted(terms)
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[[terms[term] for term in order]] = np.arange(len(order), dtype=np.int32)
+        counts.indices = rank[counts.indices]
+        counts.has_sorted_indices = False
+        document_frequency = document_frequency[np.argsort(rank)]
+        vocabulary = {term: column for column, term in enumerate(order)}
+        del order, terms
+        idf = np.log((1 + n_documents) / (1 + document_frequency)) + 1
+        vectorizer = FrozenTfidfVectorizer(analyzer, vocabulary, idf)
+
+    # Weight and sum per answer block by block, so only one block of float rows exists at a time
+    labels = np.asarray(labels, dtype=np.int64)
+    sums = ClassSums(len(classes), counts.shape[1])
+    rows = []
+    for start in range(0, n_documents, chunk_size):
+        X = vectorizer.weight(counts[start:start + chunk_size])
+        rows.append(question_rows(X))
+        block = labels[start:start + chunk_size]
+        membership = sp.csr_matrix(
+            (np.ones(len(block)), block, np.arange(len(block) + 1)), shape=(len(block), len(classes))
+        )
+        answer_sums = (membership.T @ X).tocoo()
+        sums.add(answer_sums.row, answer_sums.col, answer_sums.data)
+
+    model = IncrementalNB.from_counts(list(classes), np.bincount(labels, minlength=len(classes)), sums.fold())
+    snapshot = ModelSnapshot(
+        training_data=training_data,
+        vectorizer=vectorizer,
+        model=model,
+        question_matrix=sp.vstack(rows, format='csr'),
+        question_counts=counts if incremental else None,
+        reweighted_at=n_documents if incremental else 0,
+        vectorizer_fitted=True
+    )
+    stats["terms"] = counts.shape[1]
+    stats["answers"] = len(classes)
+    return snapshot, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="pairs file (CSV or JSONL)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--output", default="chatbot_model.cbm", help="model artifact to write")
+    parser.add_argument("--incremental", action="store_true", help="train a model that learns with partial_fit")
+    parser.add_argument("--workers", type=int, help="featurizing processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="pairs per chunk handed to a worker")
+    parser.add_argument("--force", action="store_true", help="replace an existing model and its journal")
+    args = parser.parse_args()
+
+    journal = f"{args.output}.journal"
+    if os.path.exists(args.output) or os.path.exists(journal):
+        if not args.force:
+            print(f"{args.output} already exists; pass --force to replace it")
+            return
+        # Pairs journaled for the old model must not be replayed onto the new one
+        remove_artifact(args.output)
+        if os.path.exists(journal):
+            os.remove(journal)
+
+    start = time.perf_counter()
+    try:
+        snapshot, stats = train(args.path, args.format, args.incremental, args.workers, args.chunk_size)
+    except ValueError as e:
+        print(f"Training error: {e}")
+        return
+    trained = time.perf_counter() - start
+
+    ml_model = MLModel(model_filename=args.output, incremental=args.incremental)
+    try:
+        with ml_model.lock:
+            ml_model.snapshot = snapshot
+        ml_model.save_model()
+    finally:
+        ml_model.close()
+    print(f"Trained on {stats['read']} pairs (skipped {stats['skipped']}): {stats['terms']} terms, "
+          f"{stats['answers']} answers in {trained:.1f}s -> {args.output} "
+          f"({time.perf_counter() - start - trained:.1f}s to write)")
+
+
+if __name__ == "__main__":
+    main()